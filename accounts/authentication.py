@@ -0,0 +1,108 @@
+"""
+JWT authentication backed by signed claims instead of a per-request user query.
+
+Access tokens carry the user's id, role, active flag and token version
+(see `UserTokenObtainPairSerializer`). On each request only the current token
+version and active flag are checked, from a short-TTL shared cache, and
+`request.user` is built from the claims. Bumping `User.token_version` (done on
+deactivation and role changes) revokes every outstanding token.
+
+Views may read `id`, `role` and `is_active` from `request.user` for free.
+Any other field costs a query on first access; load what you need explicitly
+instead of reading several of them.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, router
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from accounts.models import User
+
+TOKEN_VERSION_CLAIM = 'tv'
+
+# Claims copied onto the token at issue time, mapped to User fields. Changing
+# any of them revokes the user's tokens (see `accounts.signals`), so only add
+# fields that rarely change.
+USER_CLAIMS = {
+    'role': 'role',
+    'is_active': 'is_active',
+    TOKEN_VERSION_CLAIM: 'token_version',
+}
+
+
+def _state_key(user_id):
+    return f'accounts:token_state:{user_id}'
+
+
+def get_token_state(user_id):
+    """
+    Current `{'token_version', 'is_active'}` of a user, or None if it does
+    not exist. Cached for `TOKEN_STATE_CACHE_TIMEOUT` seconds.
+    """
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        # Always from the primary: a lagging replica could resurrect revoked tokens
+        state = User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).values(
+            'token_version', 'is_active'
+        ).first()
+        if state is None:
+            return None
+        cache.set(key, state, settings.TOKEN_STATE_CACHE_TIMEOUT)
+    return state
+
+
+def clear_token_state(user_id):
+    cache.delete(_state_key(user_id))
+
+
+def add_user_claims(token, user):
+    for claim, field in USER_CLAIMS.items():
+        token[claim] = getattr(user, field)
+    return token
+
+
+def token_user_id(validated_token):
+    """The token's user id as a primary key value (simplejwt issues it as a string)."""
+    try:
+        return User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+    except ValidationError:
+        raise InvalidToken(_('Token contained no recognizable user identification'))
+
+
+def check_token_version(validated_token):
+    """Raise AuthenticationFailed unless the token's user and version are current."""
+    state = get_token_state(token_user_id(validated_token))
+    if state is None:
+        raise AuthenticationFailed(_('User not found'), code='user_not_found')
+    if not state['is_active']:
+        raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+    if state['token_version'] != validated_token[TOKEN_VERSION_CLAIM]:
+        raise AuthenticationFailed(_('Token has been revoked'), code='token_revoked')
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Builds `request.user` from token claims. Fields that are not claims are
+    deferred and load lazily on first access. The claims may be stale, so
+    reload the user before saving it (`save()` writes every loaded field).
+    Tokens issued without a version claim fall back to the database lookup.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+        if TOKEN_VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        check_token_version(validated_token)
+
+        claims = {field: validated_token[claim] for claim, field in USER_CLAIMS.items()}
+        claims['id'] = token_user_id(validated_token)
+        # from_db expects values in concrete field order
+        fields = [f.attname for f in User._meta.concrete_fields if f.attname in claims]
+        return User.from_db(router.db_for_read(User), fields, [claims[name] for name in fields])
@@ -0,0 +1,167 @@
+"""
+Profile picture processing.
+
+Uploads are normalized after the saving transaction commits, on a small
+background thread pool: EXIF orientation is applied, the image is downscaled
+and re-encoded, and square thumbnails are written next to it. Every file is
+named after the content hash of the normalized image
+(`profile_pictures/<hash>.webp`, `profile_pictures/<hash>_<size>.webp`), so
+names never change for the same content and can be cached forever.
+
+Until processing finishes the original upload is served.
+"""
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+
+from accounts.models import User
+
+logger = logging.getLogger(__name__)
+
+PROFILE_PICTURE_DIR = 'profile_pictures'
+
+_executor = None
+
+
+def processed_name(digest, size=None):
+    suffix = f'_{size}' if size else ''
+    extension = settings.PROFILE_PICTURE_FORMAT.lower()
+    return f'{PROFILE_PICTURE_DIR}/{digest}{suffix}.{extension}'
+
+
+def is_processed(name, digest):
+    return bool(digest) and name == processed_name(digest)
+
+
+def _encode(image):
+    buffer = BytesIO()
+    image.save(buffer, format=settings.PROFILE_PICTURE_FORMAT, quality=settings.PROFILE_PICTURE_QUALITY)
+    return buffer.getvalue()
+
+
+def _store(name, data):
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(data))
+
+
+def delete_processed(digest):
+    """Remove a processed picture and its thumbnails unless a user still points at them."""
+    if not digest or User.objects.filter(profile_picture_hash=digest).exists():
+        return
+    default_storage.delete(processed_name(digest))
+    for label in settings.PROFILE_PICTURE_THUMBNAILS:
+        default_storage.delete(processed_name(digest, label))
+
+
+def process_profile_picture(user_id):
+    """
+    Normalize a user's uploaded picture and write its thumbnails.
+    Returns True if the user now points at a processed picture.
+    """
+    # Imported here so Pillow stays out of worker boot
+    from PIL import Image, ImageOps, UnidentifiedImageError
+
+    user = User.objects.filter(pk=user_id).only('id', 'profile_picture', 'profile_picture_hash').first()
+    if user is None or not user.profile_picture:
+        return False
+    source_name = user.profile_picture.name
+    previous_digest = user.profile_picture_hash
+    if is_processed(source_name, previous_digest):
+        return True
+
+    try:
+        with user.profile_picture.open('rb') as handle:
+            image = ImageOps.exif_transpose(Image.open(handle))
+            image.load()
+    except (OSError, UnidentifiedImageError):
+        logger.warning("Cannot process profile picture %s of user %s", source_name, user_id)
+        return False
+
+    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    image.thumbnail((settings.PROFILE_PICTURE_MAX_SIZE, settings.PROFILE_PICTURE_MAX_SIZE))
+    data = _encode(image)
+    digest = hashlib.sha256(data).hexdigest()[:32]
+
+    _store(processed_name(digest), data)
+    for label, size in settings.PROFILE_PICTURE_THUMBNAILS.items():
+        _store(processed_name(digest, label), _encode(ImageOps.fit(image, (size, size))))
+
+    # Only switch over if no newer upload replaced the picture meanwhile
+    updated = User.objects.filter(pk=user_id, profile_picture=source_name).update(
+        profile_picture=processed_name(digest),
+        profile_picture_hash=digest,
+    )
+    if updated:
+        # update() skips post_save; payloads showing the picture change too
+        from .signals import invalidate_profile
+        invalidate_profile(user_id)
+        if source_name != processed_name(digest):
+            default_storage.delete(source_name)
+        # Identical content is shared between users, so only drop it when unused
+        if previous_digest != digest:
+            delete_processed(previous_digest)
+    return bool(updated)
+
+
+def _process_in_background(user_id):
+    try:
+        process_profile_picture(user_id)
+    except Exception:
+        logger.exception("Profile picture processing failed for user %s", user_id)
+    finally:
+        connection.close()
+
+
+def schedule_processing(user_id):
+    """Process the user's picture once the current transaction commits."""
+    global _executor
+    if not settings.PROFILE_PICTURE_ASYNC:
+        transaction.on_commit(lambda: process_profile_picture(user_id))
+        return
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PROFILE_PICTURE_WORKERS,
+            thread_name_prefix='profile-pictures',
+        )
+    transaction.on_commit(lambda: _executor.submit(_process_in_background, user_id))
+
+
+def site_prefix(context=None):
+    """
+    Scheme and host of the current request, computed once per serializer
+    context instead of calling build_absolute_uri for every row.
+    """
+    if context is None:
+        return ''
+    prefix = context.get('_site_prefix')
+    if prefix is None:
+        request = context.get('request')
+        prefix = request.build_absolute_uri('/')[:-1] if request else ''
+        context['_site_prefix'] = prefix
+    return prefix
+
+
+def picture_url(name, digest, size=None, context=None):
+    """
+    URL of a stored picture, or of its `size` thumbnail once processed.
+    Unprocessed uploads are served as-is.
+    """
+    if not name:
+        return None
+    if size and is_processed(name, digest):
+        name = processed_name(digest, size)
+    url = default_storage.url(name)
+    # Filesystem storage returns site-relative URLs; remote backends absolute ones
+    if url.startswith('/') and not url.startswith('//'):
+        url = site_prefix(context) + url
+    return url
+
+
+def profile_picture_url(user, size=None, context=None):
+    return picture_url(user.profile_picture.name, user.profile_picture_hash, size, context)
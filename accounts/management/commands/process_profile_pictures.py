@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from accounts.avatars import is_processed, process_profile_picture
+from accounts.models import User
+
+
+class Command(BaseCommand):
+    help = "Normalize existing profile pictures and generate their thumbnails."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='Only process this user ID (repeatable).')
+
+    def handle(self, *args, **options):
+        users = User.objects.exclude(profile_picture='').exclude(profile_picture__isnull=True)
+        if options['users']:
+            users = users.filter(id__in=options['users'])
+
+        processed = failed = 0
+        for user_id, name, digest in users.values_list('id', 'profile_picture', 'profile_picture_hash').iterator():
+            if is_processed(name, digest):
+                continue
+            if process_profile_picture(user_id):
+                processed += 1
+            else:
+                failed += 1
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} profile pictures ({failed} failed)."))
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+from config.postgres import RunPostgresSQL
+
+SEARCH_COLUMNS = ['full_name', 'email', 'username']
+
+
+class Migration(migrations.Migration):
+    """
+    PostgreSQL-only indexes for the typeahead user search.
+    Django compiles istartswith/icontains to UPPER(col::text) LIKE ..., so the
+    indexes are built on that exact expression: text_pattern_ops for prefix
+    matches and pg_trgm GIN for substring matches.
+    """
+
+    dependencies = [
+        ('accounts', '0005_alter_user_username'),
+    ]
+
+    operations = [
+        RunPostgresSQL(
+            sql="CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ] + [
+        RunPostgresSQL(
+            sql=[
+                f"CREATE INDEX IF NOT EXISTS user_{column}_prefix_idx ON accounts_user "
+                f"(UPPER({column}::text) text_pattern_ops)",
+                f"CREATE INDEX IF NOT EXISTS user_{column}_trgm_idx ON accounts_user "
+                f"USING gin (UPPER({column}::text) gin_trgm_ops)",
+            ],
+            reverse_sql=[
+                f"DROP INDEX IF EXISTS user_{column}_prefix_idx",
+                f"DROP INDEX IF EXISTS user_{column}_trgm_idx",
+            ],
+        )
+        for column in SEARCH_COLUMNS
+    ]
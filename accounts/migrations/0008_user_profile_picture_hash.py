@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_user_token_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_picture_hash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+    ]
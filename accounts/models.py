@@ -12,7 +12,11 @@ class User(AbstractUser):
     role = models.CharField(max_length=50,choices=UserRole.choices)
     designation = models.CharField(max_length=50,choices=UserDesignation.choices,null=True,blank=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/',null=True,blank=True)
+    # Content hash of the processed picture; empty until an upload is processed
+    profile_picture_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
     created_at = models.DateTimeField(default=timezone.now)
+    # Embedded in issued JWTs; bumped to revoke every outstanding token
+    token_version = models.PositiveIntegerField(default=0, editable=False)
     objects = UserManager()
 
     def __str__(self):
@@ -0,0 +1,43 @@
+"""
+Typeahead user search.
+
+Prefix matches on full_name, email and username come first; on PostgreSQL
+they are served by UPPER(...) text_pattern_ops indexes, and substring matches
+backed by pg_trgm GIN indexes fill any remaining slots. Other databases run
+the prefix query only, bounded by the result limit.
+"""
+from django.db.models import Q
+
+from accounts.models import User
+from config.postgres import is_postgres
+
+SEARCH_FIELDS = ('full_name', 'email', 'username')
+RESULT_FIELDS = (
+    'id', 'full_name', 'email', 'username', 'role', 'designation',
+    'profile_picture', 'profile_picture_hash',
+)
+TRIGRAM_MIN_LENGTH = 3
+
+
+def _match(term, lookup):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__{lookup}': term})
+    return condition
+
+
+def search_users(term, limit):
+    """Return at most `limit` active users matching `term`, best matches first."""
+    term = term.strip()
+    if not term:
+        return []
+
+    base = User.objects.filter(is_active=True).only(*RESULT_FIELDS).order_by('full_name', 'id')
+    results = list(base.filter(_match(term, 'istartswith'))[:limit])
+
+    if len(results) < limit and len(term) >= TRIGRAM_MIN_LENGTH and is_postgres(base):
+        seen = [user.id for user in results]
+        results.extend(
+            base.filter(_match(term, 'icontains')).exclude(id__in=seen)[:limit - len(results)]
+        )
+    return results
@@ -1,11 +1,90 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
 from accounts.models import User
+from accounts.authentication import TOKEN_VERSION_CLAIM, add_user_claims, check_token_version
+from accounts.avatars import profile_picture_url
 from accounts.utils import generate_random_password, send_credentials_email
 
+USER_DIRECTORY_FIELDS = [
+    'id', 'email', 'username', 'full_name', 'role', 'designation',
+    'profile_picture', 'is_active', 'created_at',
+]
+# Columns to load for USER_DIRECTORY_FIELDS (thumbnail URLs need the hash)
+USER_DIRECTORY_COLUMNS = USER_DIRECTORY_FIELDS + ['profile_picture_hash']
+
+
+class ProfilePictureURLField(serializers.Field):
+    """
+    Read-only URL of a user's picture (`size` picks a thumbnail). The media
+    prefix is resolved once per response rather than per row.
+    """
+    def __init__(self, size=None, **kwargs):
+        kwargs.setdefault('source', '*')
+        kwargs['read_only'] = True
+        self.size = size
+        super().__init__(**kwargs)
+
+    def to_representation(self, user):
+        return profile_picture_url(user, self.size, self.context)
+
+
 class UserSerializer(serializers.ModelSerializer):
+    """
+    Full user representation (including groups and permissions).
+    Querysets feeding it should prefetch `groups` and `user_permissions`.
+    """
+    class Meta:
+        model = User
+        exclude = ['password', 'token_version', 'profile_picture_hash']
+
+
+class UserDirectorySerializer(serializers.ModelSerializer):
+    """
+    Compact, M2M-free user representation for the user directory and /user.
+    Pair it with `.only(*USER_DIRECTORY_COLUMNS)` so a listing is one query.
+    """
+    profile_picture = ProfilePictureURLField()
+    avatar = ProfilePictureURLField(size='sm')
+
+    class Meta:
+        model = User
+        fields = USER_DIRECTORY_FIELDS + ['avatar']
+        read_only_fields = fields
+
+class UserTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Embed identity claims so authenticated requests need no user query."""
+    @classmethod
+    def get_token(cls, user):
+        return add_user_claims(super().get_token(user), user)
+
+
+class UserTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refuse to refresh tokens revoked by a token version bump."""
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        if TOKEN_VERSION_CLAIM in refresh:
+            check_token_version(refresh)
+        return super().validate(attrs)
+
+
+class UserSearchResultSerializer(serializers.ModelSerializer):
+    """Minimal payload for typeahead results."""
+    avatar = ProfilePictureURLField(size='sm')
+
     class Meta:
         model = User
-        fields = '__all__'
+        fields = ['id', 'full_name', 'email', 'username', 'role', 'designation', 'avatar']
+        read_only_fields = fields
+
+
+class UserSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, trim_whitespace=True)
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_limit(self, value):
+        from django.conf import settings
+        return min(value, settings.USER_SEARCH_MAX_RESULTS)
+
 
 class CreateUserSerializer(serializers.ModelSerializer):
     class Meta:
@@ -0,0 +1,68 @@
+from django.db.models import F, Q
+from django.db.models.signals import post_save, pre_save
+from django.dispatch import receiver
+
+from config.etags import invalidate
+from .authentication import USER_CLAIMS, clear_token_state
+from .avatars import is_processed, schedule_processing
+from .models import User
+
+# Changes that must invalidate tokens carrying the old values
+REVOKING_FIELDS = set(USER_CLAIMS.values()) - {'token_version'}
+
+
+@receiver(pre_save, sender=User)
+def detect_token_revocation(sender, instance, update_fields=None, raw=False, **kwargs):
+    instance._revoke_tokens = False
+    if raw or instance.pk is None:
+        return
+    fields = REVOKING_FIELDS - instance.get_deferred_fields()
+    if update_fields is not None:
+        fields &= set(update_fields)
+    if not fields:
+        return
+    previous = User.objects.filter(pk=instance.pk).values(*fields).first()
+    if previous and any(previous[field] != getattr(instance, field) for field in fields):
+        instance._revoke_tokens = True
+
+
+@receiver(post_save, sender=User)
+def revoke_tokens(sender, instance, created, **kwargs):
+    if not getattr(instance, '_revoke_tokens', False):
+        return
+    instance._revoke_tokens = False
+    User.objects.filter(pk=instance.pk).update(token_version=F('token_version') + 1)
+    # Keep the in-memory value current so a later full save() cannot roll it back
+    instance.refresh_from_db(fields=['token_version'])
+    clear_token_state(instance.pk)
+
+
+@receiver(post_save, sender=User)
+def process_profile_picture_upload(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or 'profile_picture' in instance.get_deferred_fields():
+        return
+    if update_fields is not None and 'profile_picture' not in update_fields:
+        return
+    picture = instance.profile_picture
+    if picture and not is_processed(picture.name, instance.profile_picture_hash):
+        schedule_processing(instance.pk)
+
+
+def invalidate_profile(user_id):
+    """Names and pictures are embedded in team and project payloads too."""
+    from projects.models import Project, Team
+
+    team_ids = list(
+        Team.objects.filter(Q(members__id=user_id) | Q(team_lead_id=user_id))
+        .values_list('id', flat=True).distinct()
+    )
+    project_ids = Project.objects.filter(team_id__in=team_ids).values_list('id', flat=True)
+    invalidate(user_ids=[user_id], team_ids=team_ids, project_ids=list(project_ids))
+
+
+@receiver(post_save, sender=User)
+def invalidate_profile_etags(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # Logins only touch last_login
+    if raw or created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    invalidate_profile(instance.pk)
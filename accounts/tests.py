@@ -1,3 +1,259 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
 
-# Create your tests here.
+from io import BytesIO, StringIO
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.functional import SimpleLazyObject
+from rest_framework.test import APIClient
+
+from accounts.avatars import picture_url, processed_name
+from accounts.models import User
+from config.renderers import FastJSONRenderer
+from config.routers import PRIMARY, REPLICA, PrimaryReplicaRouter, ReplicaRoutingMiddleware
+from config.swagger import schema_path, write_schema
+from leaves.models import Leave
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Requests authenticated with real access tokens, not force_authenticate."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='secret-pw', full_name='Employee', role='employee')
+        self.client = APIClient()
+        response = self.client.post(
+            '/api/v1/accounts/token/generate/',
+            {'email': 'emp@example.com', 'password': 'secret-pw'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def test_request_user_has_integer_pk(self):
+        response = self.client.get('/api/v1/accounts/user/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.wsgi_request.user.pk, self.user.pk)
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_employee_manages_own_leave(self):
+        response = self.client.post('/api/v1/leaves/', {
+            'leave_type': 'casual', 'start_date': '2026-03-02', 'end_date': '2026-03-03', 'reason': 'Trip',
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        leave = Leave.objects.get(user=self.user)
+
+        self.assertEqual(self.client.get(f'/api/v1/leaves/{leave.pk}/').status_code, 200)
+        response = self.client.patch(f'/api/v1/leaves/{leave.pk}/', {'reason': 'Family trip'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.client.delete(f'/api/v1/leaves/{leave.pk}/').status_code, 204)
+
+    def test_only_claims_are_loaded(self):
+        response = self.client.get('/api/v1/accounts/user/')
+        user = response.wsgi_request.user
+        self.assertEqual(user.get_deferred_fields() & {'id', 'role', 'is_active'}, set())
+        self.assertIn('email', user.get_deferred_fields())
+        User.objects.filter(pk=self.user.pk).update(email='new@example.com')
+        with self.assertNumQueries(1):
+            self.assertEqual(user.email, 'new@example.com')
+
+    def test_change_password_keeps_out_of_band_changes(self):
+        User.objects.filter(pk=self.user.pk).update(email='new@example.com')
+        response = self.client.post('/api/v1/accounts/change-password/', {
+            'old_password': 'secret-pw', 'new_password': 'n3w-Secret-pw!',
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, 'new@example.com')
+        self.assertTrue(self.user.check_password('n3w-Secret-pw!'))
+
+
+class ReplicaRoutingTests(TestCase):
+    """The router decides from an already-resolved user and never loads the session user itself."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+
+    def route_read(self, request):
+        routed = []
+
+        def view(request):
+            routed.append(PrimaryReplicaRouter().db_for_read(User))
+            return HttpResponse()
+
+        ReplicaRoutingMiddleware(view)(request)
+        return routed[0]
+
+    def test_lazy_session_user_is_not_evaluated(self):
+        evaluated = []
+        request = RequestFactory().get('/admin/')
+        request.user = SimpleLazyObject(lambda: evaluated.append(True) or self.user)
+
+        self.assertEqual(self.route_read(request), PRIMARY)
+        self.assertEqual(evaluated, [])
+
+    def test_resolved_session_user_reads_from_replica(self):
+        request = RequestFactory().get('/admin/')
+        request.user = SimpleLazyObject(lambda: self.user)
+        request._cached_user = self.user
+
+        self.assertEqual(self.route_read(request), REPLICA)
+
+    def test_token_user_reads_from_replica(self):
+        request = RequestFactory().get('/api/v1/leaves/')
+        request.user = self.user
+
+        self.assertEqual(self.route_read(request), REPLICA)
+
+
+class LoginThrottleTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_forwarded_for_does_not_reset_the_bucket(self):
+        statuses = [
+            APIClient().post(
+                '/api/v1/accounts/token/generate/', {'email': 'nobody@example.com', 'password': 'guess'},
+                format='json', HTTP_X_FORWARDED_FOR=f'203.0.113.{attempt}',
+            ).status_code
+            for attempt in range(15)
+        ]
+        self.assertIn(429, statuses)
+
+
+class FastJSONRendererTests(TestCase):
+
+    def test_decodes_like_drf(self):
+        data = {'rate': 1e-07, 'big': 1e16, 'name': 'Ünïcode\u2028', 'missing': None, 'items': [1, 2.5]}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), data)
+
+    def test_rejects_non_finite_floats(self):
+        for value in (float('nan'), float('inf'), float('-inf')):
+            with self.assertRaises(ValueError):
+                FastJSONRenderer().render({'results': [{'rate': value}]})
+
+
+class MediaAccessTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        for name in ('profile_pictures/upload.jpg', 'profile_pictures/' + 'a' * 32 + '_sm.webp', 'exports/report.csv'):
+            os.makedirs(os.path.join(media_root.name, os.path.dirname(name)), exist_ok=True)
+            with open(os.path.join(media_root.name, name), 'wb') as handle:
+                handle.write(b'data')
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, MEDIA_ACCEL_BACKEND='')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_profile_pictures_are_public(self):
+        response = self.client.get('/media/profile_pictures/upload.jpg')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], 'public, no-cache')
+        response = self.client.get('/media/profile_pictures/' + 'a' * 32 + '_sm.webp')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_other_files_are_not_served(self):
+        user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        self.client.force_login(user)
+        self.assertEqual(self.client.get('/media/exports/report.csv').status_code, 404)
+        self.assertEqual(self.client.get('/media/profile_pictures/../exports/report.csv').status_code, 404)
+
+
+def _upload(color):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new('RGB', (80, 80), color).save(buffer, format='PNG')
+    return SimpleUploadedFile('avatar.png', buffer.getvalue(), content_type='image/png')
+
+
+class ProfilePictureTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name, PROFILE_PICTURE_ASYNC=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+
+    def set_picture(self, user, color):
+        user.profile_picture = _upload(color)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        user.refresh_from_db()
+        return user.profile_picture_hash
+
+    def stored(self, digest):
+        names = [processed_name(digest), processed_name(digest, 'sm'), processed_name(digest, 'md')]
+        return [default_storage.exists(name) for name in names]
+
+    def test_replacing_picture_deletes_previous_files(self):
+        old = self.set_picture(self.user, 'red')
+        self.assertEqual(self.stored(old), [True, True, True])
+        new = self.set_picture(self.user, 'blue')
+        self.assertNotEqual(old, new)
+        self.assertEqual(self.stored(old), [False, False, False])
+        self.assertEqual(self.stored(new), [True, True, True])
+
+    def test_files_shared_with_another_user_are_kept(self):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='pw', full_name='Other', role='employee')
+        old = self.set_picture(self.user, 'red')
+        self.assertEqual(self.set_picture(other, 'red'), old)
+        self.set_picture(self.user, 'blue')
+        self.assertEqual(self.stored(old), [True, True, True])
+
+    def test_urls_come_from_storage(self):
+        digest = self.set_picture(self.user, 'red')
+        request = RequestFactory().get('/')
+        self.assertEqual(
+            picture_url(processed_name(digest), digest, 'sm', {'request': request}),
+            f'http://testserver/media/profile_pictures/{digest}_sm.webp')
+        with override_settings(MEDIA_URL='https://cdn.example.com/media/'):
+            self.assertEqual(
+                picture_url(processed_name(digest), digest, 'sm', {'request': request}),
+                f'https://cdn.example.com/media/profile_pictures/{digest}_sm.webp')
+
+
+class OpenAPISchemaArtifactTests(TestCase):
+
+    def test_artifact_is_named_per_release_and_replaces_others(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                override_settings(OPENAPI_SCHEMA_FILE=os.path.join(directory, 'openapi.json')):
+            stale = os.path.join(directory, 'openapi.0123456789abcdef.json')
+            with open(stale, 'wb') as handle:
+                handle.write(b'{"old": true}')
+
+            path = write_schema(b'{}')
+            self.assertEqual(path, schema_path())
+            self.assertNotEqual(str(path), stale)
+            self.assertEqual(path.read_bytes(), b'{}')
+            self.assertEqual(os.listdir(directory), [path.name])
+
+
+class StartupProfileCommandTests(TestCase):
+
+    def test_runs_outside_the_project_directory(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            cwd = os.getcwd()
+            os.chdir(directory)
+            try:
+                call_command('startup_profile', '--json', '--limit', '1', stdout=out)
+            finally:
+                os.chdir(cwd)
+        self.assertIn('config', json.loads(out.getvalue())['ready'])
@@ -1,8 +1,7 @@
 from django.urls import path, include
-from accounts.views import UserView, UserViewSet, ChangePasswordView, RegisterView
+from accounts.views import LoginView, UserView, UserViewSet, ChangePasswordView, RegisterView
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
     TokenRefreshView,
     TokenVerifyView,
 )
@@ -12,7 +11,7 @@ router.register(r'users', UserViewSet, basename='user')
 
 urlpatterns = [
     # JWT Token endpoints
-    path('token/generate/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/generate/', LoginView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('token/verify/', TokenVerifyView.as_view(), name='token_verify'),
     
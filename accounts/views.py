@@ -3,9 +3,30 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
-from accounts.serializers import UserSerializer, UserProfileSerializer, ChangePasswordSerializer, CreateUserSerializer
+from rest_framework_simplejwt.views import TokenObtainPairView
+from accounts.serializers import (
+    UserSerializer,
+    UserDirectorySerializer,
+    UserSearchResultSerializer,
+    UserSearchQuerySerializer,
+    UserProfileSerializer,
+    ChangePasswordSerializer,
+    CreateUserSerializer,
+    USER_DIRECTORY_COLUMNS,
+)
 from accounts.models import User
+from accounts.search import search_users
+from django.conf import settings
 from config.enums import UserRole, UserDesignation
+from config.throttling import LoginRateThrottle
+
+
+class LoginView(TokenObtainPairView):
+    """
+    Obtain a JWT pair. Throttled per client IP since every attempt
+    runs a full password hash.
+    """
+    throttle_classes = [LoginRateThrottle]
 
 
 class UserView(APIView):
@@ -15,12 +36,15 @@ class UserView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        # request.user only carries token claims; load the displayed columns in one query
+        user = User.objects.only(*USER_DIRECTORY_COLUMNS).get(pk=request.user.pk)
+        serializer = UserDirectorySerializer(user, context={'request': request})
         return Response(serializer.data)
     
     def patch(self, request):
         
-        serializer = UserProfileSerializer(request.user, data=request.data, partial=True)
+        user = User.objects.get(pk=request.user.pk)
+        serializer = UserProfileSerializer(user, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
             return Response(serializer.data)
@@ -36,7 +60,8 @@ class ChangePasswordView(APIView):
     def post(self, request):
         serializer = ChangePasswordSerializer(data=request.data)
         if serializer.is_valid():
-            user = request.user
+            # request.user carries token claims that may be stale; don't write them back
+            user = User.objects.get(pk=request.user.pk)
             
             # Check old password
             if not user.check_password(serializer.validated_data['old_password']):
@@ -69,13 +94,20 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     
+    def is_detail_mode(self):
+        """`?detail=full` opts list/retrieve into the full payload (groups, permissions)."""
+        return self.request.query_params.get('detail') == 'full'
+
     def get_serializer_class(self):
         """
         Use CreateUserSerializer for user creation to handle password generation and email.
+        Use the compact UserDirectorySerializer for list/retrieve unless detail mode is requested.
         Use UserSerializer for other operations.
         """
         if self.action == 'create':
             return CreateUserSerializer
+        if self.action in ['list', 'retrieve'] and not self.is_detail_mode():
+            return UserDirectorySerializer
         return UserSerializer
     
     def create(self, request, *args, **kwargs):
@@ -115,8 +147,13 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """
         All authenticated users can see all users (for team creation, etc.)
+        Directory reads load only the displayed columns; full payloads
+        prefetch groups and permissions in bulk instead of per row.
         """
-        return User.objects.all().order_by('-created_at')
+        queryset = User.objects.all().order_by('-created_at')
+        if self.get_serializer_class() is UserDirectorySerializer:
+            return queryset.only(*USER_DIRECTORY_COLUMNS)
+        return queryset.prefetch_related('groups', 'user_permissions')
     
     def destroy(self, request, *args, **kwargs):
         """
@@ -130,6 +167,19 @@ class UserViewSet(viewsets.ModelViewSet):
             status=status.HTTP_405_METHOD_NOT_ALLOWED
         )
     
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Typeahead search: prefix (and on PostgreSQL trigram) matches on
+        full_name, email and username. Returns at most `limit` compact results.
+        """
+        query = UserSearchQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        limit = query.validated_data.get('limit', settings.USER_SEARCH_DEFAULT_RESULTS)
+        
+        users = search_users(query.validated_data['q'], limit)
+        return Response(UserSearchResultSerializer(users, many=True, context={'request': request}).data)
+    
     @action(detail=True, methods=['post'])
     def deactivate(self, request, pk=None):
         """
@@ -1,4 +1,8 @@
 from django.contrib import admin
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from config.admin import AutocompleteFilter, HighVolumeAdmin
 from .models import Attendance, AttendanceBreak
 
 
@@ -19,13 +23,14 @@ class AttendanceBreakInline(admin.TabularInline):
 
 
 @admin.register(Attendance)
-class AttendanceAdmin(admin.ModelAdmin):
+class AttendanceAdmin(HighVolumeAdmin):
     """
     Admin interface for Attendance model with inline breaks.
     """
     list_display = ('user', 'date', 'start_time', 'end_time', 'status', 
                    'breaks_count', 'total_break_time', 'total_work_time')
-    list_filter = ('status', 'date', 'user__role')
+    list_filter = ('status', 'date', 'user__role', ('user', AutocompleteFilter))
+    list_select_related = ('user',)
     search_fields = ('user__email', 'user__full_name')
     date_hierarchy = 'date'
     readonly_fields = ('total_break_time', 'total_work_time')
@@ -44,10 +49,25 @@ class AttendanceAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        # Correlated subquery rather than a JOIN + GROUP BY: it only runs for
+        # the rows on the current page and keeps the changelist count simple
+        breaks = (
+            AttendanceBreak.objects.filter(attendance=OuterRef('pk'))
+            .order_by()
+            .values('attendance')
+            .annotate(count=Count('pk'))
+            .values('count')
+        )
+        return super().get_queryset(request).annotate(
+            _breaks_count=Coalesce(Subquery(breaks, output_field=IntegerField()), Value(0)),
+        )
+
     def breaks_count(self, obj):
         """Display number of breaks taken"""
-        return obj.breaks.count()
+        return obj._breaks_count
     breaks_count.short_description = 'Breaks'
+    breaks_count.admin_order_field = '_breaks_count'
     
     def save_model(self, request, obj, form, change):
         """Auto-calculate totals on save"""
@@ -55,12 +75,13 @@ class AttendanceAdmin(admin.ModelAdmin):
 
 
 @admin.register(AttendanceBreak)
-class AttendanceBreakAdmin(admin.ModelAdmin):
+class AttendanceBreakAdmin(HighVolumeAdmin):
     """
     Admin interface for AttendanceBreak model.
     """
     list_display = ('attendance', 'break_start', 'break_end', 'duration_display', 'created_at')
-    list_filter = ('attendance__date', 'attendance__user')
+    list_filter = ('attendance__date', ('attendance__user', AutocompleteFilter))
+    list_select_related = ('attendance__user',)
     search_fields = ('attendance__user__email', 'attendance__user__full_name')
     date_hierarchy = 'break_start'
     readonly_fields = ('created_at', 'duration_display')
@@ -0,0 +1,91 @@
+"""
+Archival of closed attendance months.
+
+Finished attendance days older than the cutoff are folded into one
+`AttendanceArchive` row per user and month (breaks included) and removed from
+the hot tables. Readers that may be asked for old ranges use `archived_days`
+to union archived days with the hot rows.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+
+from config.archive import archive_in_batches, may_be_archived, month_start
+from .models import Attendance, AttendanceArchive
+
+
+def _seconds(value):
+    return value.total_seconds() if value is not None else None
+
+
+def _record(attendance):
+    return {
+        'date': attendance.date.isoformat(),
+        'start_time': attendance.start_time.isoformat(),
+        'end_time': attendance.end_time.isoformat() if attendance.end_time else None,
+        'status': attendance.status,
+        'total_break_time': _seconds(attendance.total_break_time),
+        'total_work_time': _seconds(attendance.total_work_time),
+        'breaks': [
+            [b.break_start.isoformat(), b.break_end.isoformat() if b.break_end else None]
+            for b in attendance.breaks.all()
+        ],
+    }
+
+
+def _archive_batch(ids):
+    grouped = defaultdict(list)
+    for attendance in Attendance.objects.filter(id__in=ids).prefetch_related('breaks'):
+        grouped[(attendance.user_id, month_start(attendance.date))].append(_record(attendance))
+
+    existing = {
+        (archive.user_id, archive.month): archive
+        for archive in AttendanceArchive.objects.select_for_update().filter(
+            user_id__in={user_id for user_id, _ in grouped},
+            month__in={month for _, month in grouped},
+        )
+    }
+    created, updated = [], []
+    for (user_id, month), records in grouped.items():
+        archive = existing.get((user_id, month))
+        if archive is None:
+            archive = AttendanceArchive(user_id=user_id, month=month)
+            created.append(archive)
+        else:
+            updated.append(archive)
+        by_date = {record['date']: record for record in archive.records}
+        by_date.update((record['date'], record) for record in records)
+        archive.records = sorted(by_date.values(), key=lambda record: record['date'])
+        archive.record_count = len(archive.records)
+        archive.total_work_time = timedelta(seconds=sum(r['total_work_time'] or 0 for r in archive.records))
+        archive.total_break_time = timedelta(seconds=sum(r['total_break_time'] or 0 for r in archive.records))
+
+    AttendanceArchive.objects.bulk_create(created)
+    AttendanceArchive.objects.bulk_update(
+        updated, ['records', 'record_count', 'total_work_time', 'total_break_time', 'archived_at']
+    )
+
+
+def archive_attendance(before, batch_size=500):
+    """
+    Archive finished attendance days dated before `before` (a month start).
+    Open days (no end time) stay in the hot table. Returns days archived.
+    """
+    queryset = Attendance.objects.filter(date__lt=month_start(before), end_time__isnull=False)
+    return archive_in_batches(queryset, _archive_batch, batch_size)
+
+
+def archived_days(user_ids, start_date, end_date):
+    """(user_id, date, status) of archived attendance in [start_date, end_date]."""
+    if not may_be_archived(start_date):
+        return []
+
+    days = []
+    for user_id, records in AttendanceArchive.objects.filter(
+        user_id__in=user_ids,
+        month__range=(month_start(start_date), month_start(end_date)),
+    ).values_list('user_id', 'records'):
+        for record in records:
+            day = date.fromisoformat(record['date'])
+            if start_date <= day <= end_date:
+                days.append((user_id, day, record['status']))
+    return days
@@ -0,0 +1,39 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance.archive import archive_attendance
+from config.archive import archive_cutoff
+from timesheet.archive import archive_time_entries
+
+
+class Command(BaseCommand):
+    help = (
+        "Move closed months of attendance (with breaks) and time entries into "
+        "archive tables in batches. Defaults to keeping ARCHIVE_HOT_MONTHS months."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--before', metavar='YYYY-MM',
+                            help='Archive months before this one (default: ARCHIVE_HOT_MONTHS ago).')
+        parser.add_argument('--batch-size', type=int, default=500, help='Rows moved per transaction.')
+        parser.add_argument('--only', choices=['attendance', 'timesheet'], help='Archive one kind of data only.')
+
+    def handle(self, *args, **options):
+        if options['before']:
+            try:
+                before = date.fromisoformat(f"{options['before']}-01")
+            except ValueError:
+                raise CommandError("--before must look like YYYY-MM.")
+            if before > archive_cutoff(hot_months=0):
+                raise CommandError("Only closed months can be archived.")
+        else:
+            before = archive_cutoff()
+
+        if options['only'] in (None, 'attendance'):
+            count = archive_attendance(before, options['batch_size'])
+            self.stdout.write(f"Archived {count} attendance days before {before:%Y-%m}.")
+        if options['only'] in (None, 'timesheet'):
+            count = archive_time_entries(before, options['batch_size'])
+            self.stdout.write(f"Archived {count} time entries before {before:%Y-%m}.")
+        self.stdout.write(self.style.SUCCESS("Done."))
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:15
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from config.postgres import RunPostgresSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_alter_attendance_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the archived month')),
+                ('records', models.JSONField(default=list)),
+                ('record_count', models.PositiveIntegerField(default=0)),
+                ('total_work_time', models.DurationField(default=datetime.timedelta(0))),
+                ('total_break_time', models.DurationField(default=datetime.timedelta(0))),
+                ('archived_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_archives', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month'), name='unique_attendance_archive_per_user_month')],
+            },
+        ),
+        # Rows arrive in date order, so BRIN indexes serve date-range scans
+        # over history at a fraction of a btree's size
+        RunPostgresSQL(
+            sql="CREATE INDEX IF NOT EXISTS attendance_date_brin_idx ON attendance_attendance USING brin (date)",
+            reverse_sql="DROP INDEX IF EXISTS attendance_date_brin_idx",
+        ),
+        RunPostgresSQL(
+            sql="CREATE INDEX IF NOT EXISTS attendancebreak_start_brin_idx "
+                "ON attendance_attendancebreak USING brin (break_start)",
+            reverse_sql="DROP INDEX IF EXISTS attendancebreak_start_brin_idx",
+        ),
+    ]
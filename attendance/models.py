@@ -3,6 +3,7 @@ from django.db import models
 from django.conf import settings
 from config.enums import AttendanceStatus
 from django.utils import timezone
+from .utils import format_duration_as_hms
 
 class Attendance(models.Model):
     user = models.ForeignKey(
@@ -53,3 +54,39 @@ class AttendanceBreak(models.Model):
 
     def __str__(self):
         return f"Break - {self.attendance.user.email}"
+
+    def duration_display(self):
+        """Break length as HH:MM:SS, or "-" while the break is ongoing"""
+        if not self.break_end:
+            return "-"
+        return format_duration_as_hms(self.break_end - self.break_start)
+
+
+class AttendanceArchive(models.Model):
+    """
+    One user's attendance days (with their breaks) for a closed month, moved
+    out of the hot tables by `manage.py archive_time_data`.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="attendance_archives"
+    )
+    month = models.DateField(help_text="First day of the archived month")
+    records = models.JSONField(default=list)
+    record_count = models.PositiveIntegerField(default=0)
+    total_work_time = models.DurationField(default=timedelta(0))
+    total_break_time = models.DurationField(default=timedelta(0))
+    archived_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "month"],
+                name="unique_attendance_archive_per_user_month"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.month:%Y-%m} (archived)"
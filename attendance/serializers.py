@@ -1,9 +1,14 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
 from .models import Attendance, AttendanceBreak
 from .utils import format_duration_as_hms
 from config.enums import AttendanceStatus
+from accounts.serializers import ProfilePictureURLField
+from accounts.avatars import picture_url
+from config.rows import RowReader
+from config.sparse import SparseFieldsMixin
 
 
 class AttendanceBreakSerializer(serializers.ModelSerializer):
@@ -40,10 +45,10 @@ class AttendanceBreakSerializer(serializers.ModelSerializer):
         return instance
 
 
-class AttendanceSerializer(serializers.ModelSerializer):
-    user_id = serializers.IntegerField(source="user.id", read_only=True)
+class AttendanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    user_id = serializers.IntegerField(read_only=True)
     full_name = serializers.CharField(source="user.full_name", read_only=True)
-    profile_picture = serializers.SerializerMethodField(read_only=True)
+    profile_picture = ProfilePictureURLField(size="sm", source="user")
     breaks = AttendanceBreakSerializer(many=True, read_only=True)
     start_time_display = serializers.SerializerMethodField(read_only=True)
     end_time_display = serializers.SerializerMethodField(read_only=True)
@@ -57,6 +62,11 @@ class AttendanceSerializer(serializers.ModelSerializer):
         source="end_time", write_only=True, required=False, allow_null=True
     )
 
+    # Without ?expand=breaks a sparse response lists break IDs only
+    compact_fields = {
+        "breaks": lambda: serializers.PrimaryKeyRelatedField(many=True, read_only=True),
+    }
+
     class Meta:
         model = Attendance
         fields = [
@@ -84,13 +94,6 @@ class AttendanceSerializer(serializers.ModelSerializer):
             "current_break",
         ]
 
-    def get_profile_picture(self, obj):
-        pic = getattr(obj.user, "profile_picture", None)
-        if not pic:
-            return None
-        request = self.context.get("request")
-        return request.build_absolute_uri(pic.url) if request else pic.url
-
     def get_total_break_time_display(self, obj):
         return format_duration_as_hms(obj.total_break_time)
 
@@ -110,7 +113,11 @@ class AttendanceSerializer(serializers.ModelSerializer):
         return local_time.strftime("%H:%M:%S")
 
     def get_current_break(self, obj):
-        current = obj.breaks.filter(break_end__isnull=True).first()
+        # Served from the prefetch when the viewset loaded the breaks
+        if "breaks" in getattr(obj, "_prefetched_objects_cache", {}):
+            current = next((br for br in obj.breaks.all() if br.break_end is None), None)
+        else:
+            current = obj.breaks.filter(break_end__isnull=True).first()
         return AttendanceBreakSerializer(current).data if current else None
 
     def validate(self, data):
@@ -130,14 +137,11 @@ class AttendanceSerializer(serializers.ModelSerializer):
 
     def _check_leave_status(self, user, date):
         """Check if user has approved leave on given date"""
-        from leaves.models import Leave
+        from leaves.lookup import ApprovedLeaveLookup
         
-        approved_leave = Leave.objects.filter(
-            user=user,
-            status='approved',
-            start_date__lte=date,
-            end_date__gte=date
-        ).exists()
+        # One interval index per user for the whole request, answered by bisection
+        lookup = self.context.setdefault('_approved_leave_lookup', ApprovedLeaveLookup())
+        approved_leave = lookup.is_on_leave(user.id, date)
         
         return AttendanceStatus.LEAVE if approved_leave else None
 
@@ -196,3 +200,97 @@ class AttendanceSerializer(serializers.ModelSerializer):
         
         instance.save()
         return instance
+
+
+class AttendanceRowReader(RowReader):
+    """
+    values()-based AttendanceSerializer output for the list endpoint. Breaks
+    are read in one extra query, in the order `prefetch_related` gives them.
+    """
+    columns = (
+        "id", "user_id", "user__full_name", "user__profile_picture", "user__profile_picture_hash",
+        "date", "status", "start_time", "end_time", "total_break_time", "total_work_time",
+    )
+    break_columns = ("id", "attendance_id", "break_start", "break_end", "created_at")
+
+    def load_breaks(self, attendance_ids):
+        """
+        AttendanceBreakSerializer dicts per attendance ID, and the first open
+        break (the serializer's `current_break`) per attendance ID.
+        """
+        to_datetime = self.datetime_formatter()
+        breaks, current = {}, {}
+        rows = AttendanceBreak.objects.filter(attendance_id__in=attendance_ids).values_list(*self.break_columns)
+        for pk, attendance_id, break_start, break_end, created_at in rows:
+            item = {
+                "id": pk,
+                "attendance": attendance_id,
+                "break_start": to_datetime(break_start),
+                "break_end": to_datetime(break_end),
+                "duration": (
+                    format_duration_as_hms(break_end - break_start)
+                    if break_start and break_end else "00:00:00"
+                ),
+                "created_at": to_datetime(created_at),
+            }
+            breaks.setdefault(attendance_id, []).append(item)
+            if break_end is None:
+                current.setdefault(attendance_id, item)
+        return breaks, current
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.breaks, self.current_breaks = self.load_breaks([row[0] for row in rows])
+        return super().to_representation(rows)
+
+    def compile(self):
+        to_date = self.date_formatter()
+        localtime = timezone.localtime
+        context = self.context
+        breaks, current_breaks = self.breaks, self.current_breaks
+
+        def to_dict(row):
+            (pk, user_id, full_name, picture, picture_hash,
+             date, status, start_time, end_time, total_break_time, total_work_time) = row
+            return {
+                "id": pk,
+                "user_id": user_id,
+                "full_name": full_name,
+                "profile_picture": picture_url(picture, picture_hash, "sm", context),
+                "date": to_date(date),
+                "status": status,
+                "breaks": breaks.get(pk, []),
+                "start_time_display": localtime(start_time).strftime("%H:%M:%S") if start_time else None,
+                "end_time_display": localtime(end_time).strftime("%H:%M:%S") if end_time else None,
+                "total_break_time_display": format_duration_as_hms(total_break_time),
+                "total_work_time_display": format_duration_as_hms(total_work_time),
+                "current_break": current_breaks.get(pk),
+            }
+        return to_dict
+
+
+class AttendanceReportQuerySerializer(serializers.Serializer):
+    """Query parameters for the attendance report (defaults to the current month)."""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, data):
+        from leaves.workdays import month_bounds
+
+        first, last = month_bounds()
+        data.setdefault("start", first)
+        data.setdefault("end", last)
+        if data["end"] < data["start"]:
+            raise serializers.ValidationError({
+                "end": "End date cannot be before start date."
+            })
+        if (data["end"] - data["start"]).days >= settings.ATTENDANCE_REPORT_MAX_DAYS:
+            raise serializers.ValidationError({
+                "end": f"The range cannot exceed {settings.ATTENDANCE_REPORT_MAX_DAYS} days."
+            })
+        return data
+
+
+class AbsenceQuerySerializer(AttendanceReportQuerySerializer):
+    """Report range plus the user to check (admins only; defaults to the requester)."""
+    user = serializers.IntegerField(required=False)
@@ -1,8 +1,12 @@
 from datetime import timedelta
+import numpy as np
+from django.db import models
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from .models import Attendance, AttendanceBreak
-from config.enums import AttendanceStatus
+from config.enums import AttendanceStatus, LeaveStatus, UserRole
+from config.etags import invalidate
+from .archive import archived_days
 
 
 def get_attendance_or_error(user, date):
@@ -16,6 +20,82 @@ def get_running_break(attendance):
     return AttendanceBreak.objects.filter(attendance=attendance, break_end__isnull=True).first()
 
 
+def get_status_data(user):
+    """Payload of `attendance/status`: today's attendance and break state."""
+    from .serializers import AttendanceBreakSerializer
+
+    attendance, current_break = get_status(user)
+    if not attendance:
+        return {
+            "isDayStarted": False,
+            "isDayEnded": False,
+            "isOnBreak": False,
+            "status": "offline",
+            "startTime": None,
+            "endTime": None,
+            "currentBreak": None,
+        }
+
+    return {
+        "isDayStarted": True,
+        "isDayEnded": attendance.end_time is not None,
+        "isOnBreak": current_break is not None,
+        "status": attendance.status,
+        "startTime": timezone.localtime(attendance.start_time).strftime("%H:%M:%S"),
+        "endTime": timezone.localtime(attendance.end_time).strftime("%H:%M:%S") if attendance.end_time else None,
+        "currentBreak": AttendanceBreakSerializer(current_break).data if current_break else None,
+    }
+
+
+def get_team_member_ids(user):
+    """
+    Users whose presence `user` sees: everyone for admins, otherwise the
+    members and leads of the teams they lead or belong to.
+    """
+    from accounts.models import User
+    from projects.models import Team
+
+    if user.role == UserRole.ADMIN:
+        return list(User.objects.values_list('id', flat=True))
+
+    team_ids = Team.objects.filter(models.Q(team_lead=user) | models.Q(members=user)).values('id')
+    member_ids = set(Team.members.through.objects.filter(team_id__in=team_ids).values_list('user_id', flat=True))
+    member_ids.update(
+        Team.objects.filter(id__in=team_ids, team_lead__isnull=False).values_list('team_lead_id', flat=True)
+    )
+    return list(member_ids)
+
+
+def get_team_presence(user_ids, context=None):
+    """Payload of `attendance/team_status`: today's status, name and avatar per user."""
+    from accounts.avatars import picture_url
+    from accounts.models import User
+
+    user_ids = list(user_ids)
+    users = User.objects.filter(id__in=user_ids).values('id', 'full_name', 'profile_picture', 'profile_picture_hash')
+    user_map = {u['id']: u for u in users}
+
+    # Fetch attendance records for today
+    attendances = Attendance.objects.filter(
+        user_id__in=user_ids,
+        date=timezone.localdate()
+    ).values('user_id', 'status')
+    status_map = {a['user_id']: a['status'] for a in attendances}
+
+    result = []
+    for uid in user_ids:
+        info = user_map.get(uid, {})
+        result.append({
+            "user_id": uid,
+            "status": status_map.get(uid, AttendanceStatus.OFFLINE),
+            "full_name": info.get('full_name', "Unknown"),
+            "profile_picture": picture_url(
+                info.get('profile_picture'), info.get('profile_picture_hash'), 'sm', context
+            ),
+        })
+    return result
+
+
 def start_day(user, timestamp):
     date = timestamp.date()
     if Attendance.objects.filter(user=user, date=date).exists():
@@ -116,37 +196,142 @@ def handle_approved_leave(leave):
     Args:
         leave: Leave model instance with user, start_date, and end_date
     """
-    from .serializers import AttendanceSerializer
-    
-    # Get all dates in the leave range
-    current_date = leave.start_date
-    while current_date <= leave.end_date:
-        # Check if there's an attendance record for this date
-        attendance = Attendance.objects.filter(
-            user=leave.user,
-            date=current_date
-        ).first()
+    handle_approved_leaves([leave])
+
+
+def handle_approved_leaves(leaves, batch_size=200):
+    """
+    Set-based version of `handle_approved_leave` for many leaves at once.
+    Per batch: one query for the affected attendance (with breaks), one UPDATE
+    closing active breaks and one bulk UPDATE for the attendance rows.
+    """
+    leaves = list(leaves)
+    for offset in range(0, len(leaves), batch_size):
+        batch = leaves[offset:offset + batch_size]
+        now = timezone.now()
+        
+        in_leave_range = models.Q()
+        for leave in batch:
+            in_leave_range |= models.Q(user_id=leave.user_id, date__range=(leave.start_date, leave.end_date))
+        
+        attendances = list(Attendance.objects.filter(in_leave_range).prefetch_related('breaks'))
+        if not attendances:
+            continue
+        
+        # End any active breaks first
+        AttendanceBreak.objects.filter(
+            attendance__in=attendances,
+            break_end__isnull=True
+        ).update(break_end=now)
         
-        if attendance:
-            # End any active breaks first
-            for br in attendance.breaks.filter(break_end__isnull=True):
-                br.break_end = timezone.now()
-                br.save()
-            
-            # End the day if it's still active (no end_time)
-            # Use the serializer to handle all time calculations
-            if not attendance.end_time:
-                serializer = AttendanceSerializer(
-                    attendance,
-                    data={'endTime': timezone.now()},
-                    partial=True
-                )
-                serializer.is_valid(raise_exception=True)
-                serializer.save()
-            else:
-                # Day already ended, just update status
-                attendance.status = AttendanceStatus.LEAVE
-                attendance.save()
+        for attendance in attendances:
+            # End the day if it's still active (no end_time) and recalculate totals
+            if not attendance.end_time and now > attendance.start_time:
+                total_break = timedelta(0)
+                for br in attendance.breaks.all():
+                    total_break += (br.break_end or now) - br.break_start
+                attendance.end_time = now
+                attendance.total_break_time = total_break
+                attendance.total_work_time = (now - attendance.start_time) - total_break
+            attendance.status = AttendanceStatus.LEAVE
         
-        current_date += timedelta(days=1)
+        Attendance.objects.bulk_update(
+            attendances,
+            ['end_time', 'total_break_time', 'total_work_time', 'status']
+        )
+        # Bulk updates bypass model signals
+        invalidate(user_ids={attendance.user_id for attendance in attendances})
 
+
+def get_absent_dates(user_id, start_date, end_date):
+    """
+    Return the working days in [start_date, end_date] on which the user
+    neither has an attendance record nor an approved leave.
+    Weekends and holidays are excluded by the work calendar.
+    """
+    from leaves.models import Leave
+    from leaves.workdays import RangeCalendar, to_date
+    
+    working = RangeCalendar(start_date, end_date).business_days()
+    if not len(working):
+        return []
+    
+    attended = list(Attendance.objects.filter(
+        user_id=user_id, date__range=(start_date, end_date)
+    ).values_list('date', flat=True))
+    attended += [day for _, day, _ in archived_days([user_id], start_date, end_date)]
+    attended = np.array(attended, dtype='datetime64[D]')
+    
+    on_leave = [np.arange(np.datetime64(max(start, start_date)), np.datetime64(min(end, end_date)) + 1)
+                for start, end in Leave.objects.filter(
+                    user_id=user_id,
+                    status=LeaveStatus.APPROVED,
+                    start_date__lte=end_date,
+                    end_date__gte=start_date
+                ).values_list('start_date', 'end_date')]
+    
+    covered = np.concatenate([attended, *on_leave]) if on_leave else attended
+    return [to_date(day) for day in np.setdiff1d(working, covered)]
+
+
+def build_attendance_report(user_ids, start_date, end_date):
+    """
+    Per-user attendance summary for [start_date, end_date].
+    Working days come from the stored year masks: the denominator and every
+    per-user count are vectorized lookups, so the cost does not grow with
+    range length.
+    """
+    from accounts.models import User
+    from leaves.models import Leave
+    from leaves.workdays import RangeCalendar
+    
+    calendar = RangeCalendar(start_date, end_date)
+    working_days = calendar.working_days
+    
+    users = list(User.objects.filter(id__in=user_ids).order_by('id').values('id', 'full_name'))
+    index = {u['id']: i for i, u in enumerate(users)}
+    present = np.zeros(len(users), dtype=np.int64)
+    on_leave = np.zeros(len(users), dtype=np.int64)
+    
+    # Days worked: attendance rows on business days (leave-marked days excluded)
+    rows = list(Attendance.objects.filter(
+        user_id__in=user_ids,
+        date__range=(start_date, end_date)
+    ).exclude(status=AttendanceStatus.LEAVE).values_list('user_id', 'date'))
+    rows += [
+        (uid, day) for uid, day, status in archived_days(user_ids, start_date, end_date)
+        if status != AttendanceStatus.LEAVE
+    ]
+    if rows:
+        owners = np.array([index[uid] for uid, _ in rows])
+        dates = np.array([d for _, d in rows], dtype='datetime64[D]')
+        present = np.bincount(owners[calendar.is_business_day(dates)], minlength=len(users))
+    
+    # Leave days: approved leaves clipped to the window, counted in one call
+    leaves = list(Leave.objects.filter(
+        user_id__in=user_ids,
+        status=LeaveStatus.APPROVED,
+        start_date__lte=end_date,
+        end_date__gte=start_date
+    ).values_list('user_id', 'start_date', 'end_date'))
+    if leaves:
+        owners = np.array([index[uid] for uid, _, _ in leaves])
+        starts = np.maximum(np.array([s for _, s, _ in leaves], dtype='datetime64[D]'), np.datetime64(start_date))
+        ends = np.minimum(np.array([e for _, _, e in leaves], dtype='datetime64[D]'), np.datetime64(end_date))
+        on_leave = np.bincount(owners, weights=calendar.count(starts, ends),
+                               minlength=len(users)).astype(np.int64)
+    
+    absent = np.maximum(working_days - present - on_leave, 0)
+    
+    report = []
+    for i, u in enumerate(users):
+        report.append({
+            "user_id": u['id'],
+            "full_name": u['full_name'],
+            "working_days": working_days,
+            "present_days": int(present[i]),
+            "leave_days": int(on_leave[i]),
+            "absent_days": int(absent[i]),
+            "attendance_rate": round(int(present[i]) / working_days * 100, 2) if working_days else 0.0,
+        })
+    return report
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.etags import invalidate
+from .models import Attendance, AttendanceBreak
+
+
+@receiver([post_save, post_delete], sender=Attendance)
+def invalidate_attendance_etags(sender, instance, **kwargs):
+    invalidate(user_ids=[instance.user_id])
+
+
+@receiver([post_save, post_delete], sender=AttendanceBreak)
+def invalidate_break_etags(sender, instance, origin=None, **kwargs):
+    # Cascaded from an attendance delete, which already invalidated its user
+    if isinstance(origin, Attendance) or getattr(origin, 'model', None) is Attendance:
+        return
+    user_id = Attendance.objects.filter(pk=instance.attendance_id).values_list('user_id', flat=True).first()
+    invalidate(user_ids=[user_id])
@@ -1,3 +1,139 @@
+from datetime import date, datetime, timedelta
+
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.avatars import processed_name
+from accounts.models import User
+from config.enums import AttendanceStatus, LeaveStatus, LeaveType
+from config.testing import RowReaderContractTestCase
+from attendance.models import Attendance, AttendanceBreak
+from attendance.views import AttendanceViewSet
+from leaves.models import Holiday, Leave, WorkCalendar
+from leaves.workdays import RangeCalendar
+from projects.models import Team
+
+
+class AttendanceRowReaderContractTests(RowReaderContractTestCase):
+    """The values() list path renders exactly what AttendanceSerializer does."""
+    viewset = AttendanceViewSet
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        User.objects.filter(pk=cls.user.pk).update(
+            full_name='Émployee', profile_picture=processed_name('abc123'), profile_picture_hash='abc123')
+        raw = User.objects.create_user(
+            username='raw', email='raw@example.com', password='pw', role='employee')
+        User.objects.filter(pk=raw.pk).update(profile_picture='profile_pictures/upload.jpg')
+
+        now = timezone.now()
+        today = timezone.localdate()
+        finished = Attendance.objects.create(
+            user=cls.user, date=today - timedelta(days=2), start_time=now - timedelta(days=2, hours=9),
+            end_time=now - timedelta(days=2), total_break_time=timedelta(minutes=45),
+            total_work_time=timedelta(hours=8, minutes=15, seconds=7), status=AttendanceStatus.OFFLINE)
+        AttendanceBreak.objects.create(
+            attendance=finished, break_start=finished.start_time + timedelta(hours=4),
+            break_end=finished.start_time + timedelta(hours=4, minutes=45))
+        AttendanceBreak.objects.create(
+            attendance=finished, break_start=finished.start_time + timedelta(hours=1),
+            break_end=finished.start_time + timedelta(hours=1))
+
+        on_break = Attendance.objects.create(
+            user=cls.user, date=today, start_time=now - timedelta(hours=3), status=AttendanceStatus.BREAK)
+        AttendanceBreak.objects.create(
+            attendance=on_break, break_start=now - timedelta(hours=2), break_end=now - timedelta(hours=1))
+        AttendanceBreak.objects.create(attendance=on_break, break_start=now - timedelta(minutes=10))
+
+        Attendance.objects.create(
+            user=raw, date=today - timedelta(days=1), start_time=now - timedelta(days=1, hours=2),
+            status=AttendanceStatus.PRESENT)
+
+    def test_admin_list(self):
+        content = self.assertSameList(self.admin, '/api/v1/attendance/attendance/')
+        self.assertIn(b'"current_break":{', content)
+        self.assertIn(b'_sm.', content)
+
+    def test_employee_list(self):
+        self.assertSameList(self.user, '/api/v1/attendance/attendance/')
+
+    def test_empty_list(self):
+        Attendance.objects.all().delete()
+        self.assertSameList(self.admin, '/api/v1/attendance/attendance/')
+
+    def test_sparse_request_uses_serializer(self):
+        content = self.render_list(self.admin, '/api/v1/attendance/attendance/?fields=id,breaks')
+        self.assertNotIn(b'"status"', content)
+
+
+class WorkingDayReportTests(TestCase):
+    """Report and absence counts read the stored year masks (weekends and holidays excluded)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        cls.other = User.objects.create_user(
+            username='other', email='other@example.com', password='pw', full_name='Other', role='employee')
+        Holiday.objects.create(name='New Year', date=date(2026, 1, 1))
+        Holiday.objects.create(name='Founders Day', date=date(2026, 3, 4))
+        start = timezone.make_aware(datetime(2026, 3, 2, 9))
+        Attendance.objects.create(
+            user=cls.user, date=date(2026, 3, 2), start_time=start, end_time=start + timedelta(hours=8),
+            status=AttendanceStatus.OFFLINE)
+        Leave.objects.create(
+            user=cls.user, leave_type=LeaveType.CASUAL, start_date=date(2026, 3, 5), end_date=date(2026, 3, 8),
+            reason='Trip', status=LeaveStatus.APPROVED)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_report(self):
+        response = self.client.get('/api/v1/attendance/attendance/report/?start=2026-03-02&end=2026-03-08')
+        row = response.data['results'][0]
+        self.assertEqual(
+            (row['working_days'], row['present_days'], row['leave_days'], row['absent_days']), (4, 1, 2, 1))
+
+    def test_report_across_years(self):
+        response = self.client.get('/api/v1/attendance/attendance/report/?start=2025-12-29&end=2026-01-04')
+        self.assertEqual(response.data['results'][0]['working_days'], 4)
+
+    def test_absences(self):
+        response = self.client.get('/api/v1/attendance/attendance/absences/?start=2026-03-02&end=2026-03-08')
+        self.assertEqual(response.data['dates'], [date(2026, 3, 3)])
+
+    def test_absences_of_invisible_user(self):
+        response = self.client.get(f'/api/v1/attendance/attendance/absences/?start=2026-03-02&user={self.other.pk}')
+        self.assertEqual(response.status_code, 404)
+
+    def test_range_is_capped(self):
+        response = self.client.get('/api/v1/attendance/attendance/absences/?start=0001-01-01&end=9999-12-31')
+        self.assertEqual(response.status_code, 400)
+
+    def test_years_outside_the_window_are_not_stored(self):
+        response = self.client.get('/api/v1/attendance/attendance/report/?start=1990-01-01&end=1990-12-31')
+        self.assertEqual(response.data['results'][0]['working_days'], 261)
+        self.assertFalse(WorkCalendar.objects.filter(year=1990).exists())
+
+    def test_range_calendar_rejects_dates_outside_the_window(self):
+        calendar = RangeCalendar(date(2026, 3, 2), date(2026, 3, 8))
+        with self.assertRaises(ValueError):
+            calendar.count([date(2026, 3, 1)], [date(2026, 3, 3)])
+
+
+class AttendanceVisibilityTests(TestCase):
+
+    def test_team_lead_reads_only_own_attendance(self):
+        lead = User.objects.create_user(
+            username='lead', email='lead@example.com', password='pw', full_name='Lead', role='team_lead')
+        member = User.objects.create_user(
+            username='member', email='member@example.com', password='pw', full_name='Member', role='employee')
+        Team.objects.create(name='Core', team_lead=lead).members.add(member)
+        Attendance.objects.create(user=member, date=timezone.localdate(), start_time=timezone.now())
 
-# Create your tests here.
+        client = APIClient()
+        client.force_authenticate(lead)
+        self.assertEqual(client.get('/api/v1/attendance/attendance/').data, [])
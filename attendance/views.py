@@ -1,27 +1,47 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from django.db import models
 from config.enums import UserRole
+from config.etags import ALL_SCOPE, ConditionalGetMixin, user_scope
+from config.rows import FastListMixin
+from config.sparse import FieldSelection
 from .models import Attendance, AttendanceBreak
-from .serializers import AttendanceSerializer, AttendanceBreakSerializer
+from .serializers import (
+    AttendanceSerializer,
+    AttendanceBreakSerializer,
+    AttendanceReportQuerySerializer,
+    AbsenceQuerySerializer,
+    AttendanceRowReader,
+)
 from . import services
+from config.throttling import ExportRateThrottle, StatusPollingThrottle
 from accounts.models import User
-from config.enums import AttendanceStatus
-from django.utils import timezone
-from projects.models import Team
-from django.utils.timezone import localtime
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     serializer_class = AttendanceSerializer
+    row_reader_class = AttendanceRowReader
     permission_classes = [IsAuthenticated]
 
+    def get_etag_scopes(self):
+        user = self.request.user
+        if user.role == UserRole.ADMIN:
+            return [ALL_SCOPE]
+        return [user_scope(user.id)]
+
     def get_queryset(self):
         user = self.request.user
         qs = Attendance.objects.all()
 
+        # Only join/prefetch what the (possibly sparse) response shows
+        selection = FieldSelection(self.request)
+        if selection.wants("full_name", "profile_picture"):
+            qs = qs.select_related("user")
+        if selection.wants("breaks", "current_break"):
+            qs = qs.prefetch_related("breaks")
+
         if user.role == UserRole.ADMIN:
             return qs
         return qs.filter(user=user)
@@ -29,83 +49,76 @@ class AttendanceViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
-    @action(detail=False, methods=["get"])
+    @action(detail=False, methods=["get"], throttle_classes=[StatusPollingThrottle])
     def status(self, request):
-        attendance, current_break = services.get_status(request.user)
-
-        if not attendance:
-            return Response({
-                "isDayStarted": False,
-                "isDayEnded": False,
-                "isOnBreak": False,
-                "status": "offline",
-                "startTime": None,
-                "endTime": None,
-                "currentBreak": None,
-            })
+        return Response(services.get_status_data(request.user))
 
-        
-        return Response({
-            "isDayStarted": True,
-            "isDayEnded": attendance.end_time is not None,
-            "isOnBreak": current_break is not None,
-            "status": attendance.status,
-            "startTime": localtime(attendance.start_time).strftime("%H:%M:%S"),
-            "endTime": localtime(attendance.end_time).strftime("%H:%M:%S") if attendance.end_time else None,
-            "currentBreak": AttendanceBreakSerializer(current_break).data if current_break else None,
-        })
-
-    @action(detail=False, methods=["get"])
+    @action(detail=False, methods=["get"], throttle_classes=[StatusPollingThrottle])
     def team_status(self, request):
-        user = request.user
-        today = timezone.localdate()
+        user_ids = services.get_team_member_ids(request.user)
+        return Response(services.get_team_presence(user_ids, {'request': request}))
+
+    @action(detail=False, methods=["get"], throttle_classes=[ExportRateThrottle])
+    def report(self, request):
+        """
+        Working-day based attendance summary per user.
+        Admin sees everyone, other users only themselves.
+        """
+        query = AttendanceReportQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
         
-        if user.role == UserRole.ADMIN:
-            # Admin sees everyone
+        if request.user.role == UserRole.ADMIN:
             user_ids = User.objects.values_list('id', flat=True)
         else:
-            # Team Lead and Employee: See all members of teams they belong to
-            # Get all teams where user is either team_lead or a member
-            teams = Team.objects.filter(
-                models.Q(team_lead=user) | models.Q(members=user)
-            ).distinct()
-            
-            # Get all member IDs from these teams
-            team_member_ids = set()
-            for team in teams:
-                team_member_ids.update(team.members.values_list('id', flat=True))
-                if team.team_lead:
-                    team_member_ids.add(team.team_lead.id)
-            
-            user_ids = list(team_member_ids)
-       
-        # Fetch full names from User model for all users
-        users = User.objects.filter(id__in=user_ids).values('id', 'full_name')
-        full_name_map = {u['id']: u['full_name'] for u in users}
-        
-        # Fetch attendance records for today
-        attendances = Attendance.objects.filter(
-            user_id__in=user_ids,
-            date=today
-        ).values('user_id', 'status')
-        
-        status_map = {a['user_id']: a['status'] for a in attendances}
+            user_ids = [request.user.id]
         
-        result = []
-        for uid in user_ids:
-            result.append({
-                "user_id": uid,
-                "status": status_map.get(uid, AttendanceStatus.OFFLINE),
-                "full_name": full_name_map.get(uid, "Unknown")
-            })
-        
-        return Response(result)
+        return Response({
+            "start": query.validated_data["start"],
+            "end": query.validated_data["end"],
+            "results": services.build_attendance_report(
+                user_ids,
+                query.validated_data["start"],
+                query.validated_data["end"]
+            ),
+        })
+
+    @action(detail=False, methods=["get"], throttle_classes=[ExportRateThrottle])
+    def absences(self, request):
+        """
+        Working days without attendance or approved leave for one user.
+        Like the report, admins may pass `?user=`; others only see themselves.
+        """
+        query = AbsenceQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+
+        user_id = query.validated_data.get("user", request.user.id)
+        users = User.objects.all()
+        if request.user.role != UserRole.ADMIN:
+            users = users.filter(pk=request.user.id)
+        user = get_object_or_404(users.only("id"), pk=user_id)
+
+        return Response({
+            "user_id": user.id,
+            "start": query.validated_data["start"],
+            "end": query.validated_data["end"],
+            "dates": services.get_absent_dates(
+                user.id,
+                query.validated_data["start"],
+                query.validated_data["end"]
+            ),
+        })
 
 
-class AttendanceBreakViewSet(viewsets.ModelViewSet):
+class AttendanceBreakViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     serializer_class = AttendanceBreakSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_etag_scopes(self):
+        user = self.request.user
+        if user.role == UserRole.ADMIN:
+            return [ALL_SCOPE]
+        return [user_scope(user.id)]
+
     def get_queryset(self):
         user = self.request.user
         qs = AttendanceBreak.objects.select_related("attendance", "attendance__user")
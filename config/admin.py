@@ -0,0 +1,114 @@
+"""
+Admin helpers for high-volume tables.
+
+`HighVolumeAdmin` swaps the exact `COUNT(*)` of the changelist for PostgreSQL's
+row estimate once a result set is large, disables the second full-table count
+and facet counts, and loads the assets needed by `AutocompleteFilter`, a list
+filter that searches related objects through the admin autocomplete endpoint
+instead of rendering every one of them.
+"""
+import json
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin.utils import get_last_value_from_parameters
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+from config.postgres import is_postgres
+
+
+def estimate_count(queryset):
+    """
+    PostgreSQL's estimate of the rows in `queryset`: the table statistics when
+    unfiltered, otherwise the planner's row estimate. None if unknown.
+    """
+    with connections[queryset.db].cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed
+            return row[0] if row and row[0] >= 0 else None
+
+        sql, params = queryset.order_by().values('pk').query.sql_with_params()
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Uses the estimate when it reaches ADMIN_EXACT_COUNT_LIMIT rows; smaller
+    result sets (and non-PostgreSQL databases) are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        if is_postgres(self.object_list):
+            estimate = estimate_count(self.object_list)
+            if estimate is not None and estimate >= settings.ADMIN_EXACT_COUNT_LIMIT:
+                return estimate
+        return super().count
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Foreign key filter rendered as an autocomplete select. The related model's
+    admin must define `search_fields`.
+
+        list_filter = [('attendance__user', AutocompleteFilter)]
+    """
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        # Clearing the select submits an empty value
+        if params.get(self.lookup_kwarg) in ([''], ''):
+            del params[self.lookup_kwarg]
+        self.lookup_val = get_last_value_from_parameters(params, self.lookup_kwarg)
+        super().__init__(field, request, params, model, model_admin, field_path)
+        self.admin_site = model_admin.admin_site
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def render_widget(self):
+        widget = AutocompleteSelect(self.field, self.admin_site, attrs={'onchange': 'this.form.submit()'})
+        # The form field supplies the queryset used to render the selected option
+        form_field = self.field.formfield(widget=widget, required=False)
+        return form_field.widget.render(self.lookup_kwarg, self.lookup_val)
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is not None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'hidden_params': [
+                (name, value) for name, value in changelist.params.items()
+                if name != self.lookup_kwarg
+            ],
+            'widget': self.render_widget(),
+        }
+
+
+class HighVolumeAdmin(admin.ModelAdmin):
+    """ModelAdmin defaults for tables with millions of rows."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    @property
+    def media(self):
+        media = super().media
+        if any(
+            isinstance(list_filter, (list, tuple)) and issubclass(list_filter[1], AutocompleteFilter)
+            for list_filter in self.list_filter
+        ):
+            media += AutocompleteSelect(None, self.admin_site).media
+        return media
@@ -0,0 +1,51 @@
+"""
+Shared helpers for moving closed months of time-series rows into archive tables.
+
+Each app provides a function that turns one batch of hot rows into archive
+rows; `archive_in_batches` drives it in short transactions so locks stay small
+and an interrupted run can simply be restarted.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def add_months(day, months):
+    """First day of the month `months` away from `day`'s month."""
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def archive_cutoff(hot_months=None):
+    """First day of the oldest month kept in the hot tables."""
+    if hot_months is None:
+        hot_months = settings.ARCHIVE_HOT_MONTHS
+    return add_months(timezone.localdate(), -hot_months)
+
+
+def may_be_archived(start_date):
+    """Only closed months are archived, so ranges inside the current month never are."""
+    return start_date < month_start(timezone.localdate())
+
+
+def archive_in_batches(queryset, archive_batch, batch_size=500):
+    """
+    Repeatedly take up to `batch_size` rows of `queryset` (by id), pass them
+    to `archive_batch(ids)` and delete them, each batch in its own transaction.
+    Returns the number of rows archived.
+    """
+    total = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+            if not ids:
+                return total
+            archive_batch(ids)
+            queryset.model.objects.filter(id__in=ids).delete()
+        total += len(ids)
@@ -0,0 +1,54 @@
+"""
+Versioned cache keys shared by the apps.
+
+Every scope (a user, a team, a project, ...) owns a version token in the shared
+cache. Writes bump the token; cached entries embed the tokens they were built
+from, so stale entries are never read again and simply expire. Tokens are the
+UNIX time of the last bump, which also makes them usable as Last-Modified.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+
+
+def _version_key(scope, key):
+    return f"version:{scope}:{key}"
+
+
+def get_versions(pairs):
+    """
+    Return {(scope, key): token} for an iterable of (scope, key) pairs.
+    Scopes that were never bumped (or were evicted) start at the current time.
+    """
+    pairs = list(pairs)
+    cache_keys = {_version_key(scope, key): (scope, key) for scope, key in pairs}
+    found = cache.get_many(list(cache_keys))
+
+    missing = {ck: time.time() for ck in cache_keys if ck not in found}
+    for ck, token in missing.items():
+        # add() so a concurrent bump is never overwritten by an initial token
+        if not cache.add(ck, token, timeout=None):
+            missing[ck] = cache.get(ck, token)
+    found.update(missing)
+
+    return {cache_keys[ck]: token for ck, token in found.items()}
+
+
+def get_version(scope, key):
+    return get_versions([(scope, key)])[(scope, key)]
+
+
+def bump_versions(pairs):
+    """Invalidate everything cached against the given (scope, key) pairs."""
+    now = time.time()
+    cache.set_many({_version_key(scope, key): now for scope, key in pairs}, timeout=None)
+
+
+def versioned_key(prefix, versions, *parts):
+    """Build a cache key from a prefix, a {pair: token} mapping and extra parts."""
+    digest = hashlib.md5(
+        repr((sorted(versions.items()), parts)).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f"{prefix}:{digest}"
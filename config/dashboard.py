@@ -0,0 +1,224 @@
+"""
+Home screen in one round trip.
+
+`GET /api/v1/dashboard/` answers what the frontend used to fetch from six
+endpoints on load. Each section keeps the shape of the endpoint it replaces:
+
+- `user`: the profile (`accounts/user/`)
+- `attendance`: today's attendance and break state (`attendance/status/`)
+- `timer`: the running timer (`timesheet/current/`)
+- `logged_today`: minutes logged today, the running timer included
+- `pending_leaves`: leaves awaiting the viewer's approval (leave list rows)
+- `team_presence`: today's status of the viewer's teams (`attendance/team_status/`)
+
+`DashboardContext` resolves the viewer's teams and approvable users once for
+all sections. Sections are cached under versioned keys built from the
+`config.etags` scopes they read, so a write only rebuilds the sections it
+touches. Version tokens and cached sections are each fetched in one cache
+round trip, and only stale sections hit the database.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+from django.utils import timezone
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from accounts.avatars import site_prefix
+from config.cache import get_versions, versioned_key
+from config.enums import LeaveStatus, UserRole
+from config.etags import ALL_SCOPE, HOLIDAYS_SCOPE, user_scope
+from config.throttling import StatusPollingThrottle
+
+
+class DashboardContext:
+    """Viewer, date and visibility shared by all sections of one request."""
+
+    def __init__(self, request):
+        from attendance.services import get_team_member_ids
+
+        self.request = request
+        self.user = request.user
+        self.today = timezone.localdate()
+        self.serializer_context = {'request': request}
+        self.is_admin = self.user.role == UserRole.ADMIN
+        self.team_member_ids = sorted(get_team_member_ids(self.user))
+        self.approvable_user_ids = self._load_approvable_user_ids()
+
+    def _load_approvable_user_ids(self):
+        """Users whose leaves the viewer approves; None for admins (everyone but themselves)."""
+        from projects.visibility import visible_user_ids
+
+        user_ids = visible_user_ids(self.user)
+        if user_ids is None:
+            return None
+        return [user_id for user_id in user_ids if user_id != self.user.id]
+
+    @property
+    def cache_parts(self):
+        # Sections hold dates and absolute media URLs
+        return (self.user.id, self.today, site_prefix(self.serializer_context))
+
+
+class Section:
+    """
+    A cached part of the dashboard. `load()` returns picklable data for the
+    cache; `render()` turns it into top-level response keys, adding anything
+    that depends on the clock.
+    """
+    name = None
+
+    def scopes(self, ctx):
+        return [user_scope(ctx.user.id)]
+
+    def parts(self, ctx):
+        return ()
+
+    def load(self, ctx):
+        raise NotImplementedError('Dashboard sections must implement load().')
+
+    def render(self, ctx, data):
+        return {self.name: data}
+
+
+class ProfileSection(Section):
+    name = 'user'
+
+    def load(self, ctx):
+        from accounts.models import User
+        from accounts.serializers import USER_DIRECTORY_COLUMNS, UserDirectorySerializer
+
+        user = User.objects.only(*USER_DIRECTORY_COLUMNS).get(pk=ctx.user.pk)
+        return dict(UserDirectorySerializer(user, context=ctx.serializer_context).data)
+
+
+class AttendanceSection(Section):
+    name = 'attendance'
+
+    def load(self, ctx):
+        from attendance.services import get_status_data
+
+        return get_status_data(ctx.user)
+
+
+class TimesheetSection(Section):
+    """Backs both `timer` and `logged_today`: one query over today's and running entries."""
+    name = 'timesheet'
+
+    def load(self, ctx):
+        from datetime import timedelta
+        from timesheet.models import TimeEntry
+
+        rows = TimeEntry.objects.filter(
+            models.Q(date=ctx.today) | models.Q(is_running=True), user=ctx.user
+        ).values_list('task', 'project_id', 'start_time', 'duration', 'is_running', 'date')
+
+        running, running_date, logged = None, None, timedelta(0)
+        for task, project_id, start_time, duration, is_running, date in rows:
+            if is_running:
+                # The most recent one, like `timesheet/current`
+                if running is None or start_time > running[2]:
+                    running, running_date = (task, project_id, start_time), date
+            elif date == ctx.today and duration:
+                logged += duration
+        return {'running': running, 'running_today': running_date == ctx.today, 'logged': logged}
+
+    def render(self, ctx, data):
+        from timesheet.serializers import format_minutes, timer_state
+
+        timer = timer_state(*data['running']) if data['running'] else timer_state()
+        minutes = int(data['logged'].total_seconds() / 60)
+        if data['running_today']:
+            minutes += timer['elapsed']
+        return {
+            'timer': timer,
+            'logged_today': {'minutes': minutes, 'formatted': format_minutes(minutes)},
+        }
+
+
+class PendingLeavesSection(Section):
+    name = 'pending_leaves'
+
+    def scopes(self, ctx):
+        if ctx.is_admin:
+            return [ALL_SCOPE, HOLIDAYS_SCOPE]
+        return [HOLIDAYS_SCOPE, *(user_scope(user_id) for user_id in ctx.approvable_user_ids)]
+
+    def parts(self, ctx):
+        return tuple(ctx.approvable_user_ids or ())
+
+    def load(self, ctx):
+        from leaves.models import Leave
+        from leaves.serializers import LeaveRowReader
+
+        if ctx.approvable_user_ids == []:
+            return []
+        leaves = Leave.objects.filter(status=LeaveStatus.PENDING).exclude(user_id=ctx.user.id)
+        if ctx.approvable_user_ids is not None:
+            leaves = leaves.filter(user_id__in=ctx.approvable_user_ids)
+        reader = LeaveRowReader(ctx.serializer_context)
+        return reader.to_representation(reader.read(leaves))
+
+
+class TeamPresenceSection(Section):
+    name = 'team_presence'
+
+    def scopes(self, ctx):
+        if ctx.is_admin:
+            return [ALL_SCOPE]
+        return [user_scope(user_id) for user_id in ctx.team_member_ids]
+
+    def parts(self, ctx):
+        return tuple(ctx.team_member_ids)
+
+    def load(self, ctx):
+        from attendance.services import get_team_presence
+
+        return get_team_presence(ctx.team_member_ids, ctx.serializer_context)
+
+
+SECTIONS = (
+    ProfileSection(),
+    AttendanceSection(),
+    TimesheetSection(),
+    PendingLeavesSection(),
+    TeamPresenceSection(),
+)
+
+
+def get_dashboard(ctx, sections=SECTIONS):
+    """Assemble the dashboard from cached sections, rebuilding the stale ones."""
+    section_scopes = {section.name: section.scopes(ctx) for section in sections}
+    versions = get_versions({scope for scopes in section_scopes.values() for scope in scopes})
+
+    keys = {}
+    for section in sections:
+        section_versions = {scope: versions[scope] for scope in section_scopes[section.name]}
+        keys[section.name] = versioned_key(
+            f'dashboard:{section.name}', section_versions, *ctx.cache_parts, *section.parts(ctx)
+        )
+
+    cached = cache.get_many(list(keys.values()))
+    stale = {}
+    result = {}
+    for section in sections:
+        key = keys[section.name]
+        if key in cached:
+            data = cached[key]
+        else:
+            data = stale[key] = section.load(ctx)
+        result.update(section.render(ctx, data))
+
+    if stale:
+        cache.set_many(stale, settings.DASHBOARD_CACHE_TIMEOUT)
+    return result
+
+
+class DashboardView(APIView):
+    """Everything the home screen shows, in one response."""
+    permission_classes = [IsAuthenticated]
+    throttle_classes = [StatusPollingThrottle]
+
+    def get(self, request):
+        return Response(get_dashboard(DashboardContext(request)))
@@ -0,0 +1,101 @@
+"""
+Conditional GET for API endpoints.
+
+Responses are validated against the version tokens of `config.cache`. Writes
+to attendance, time entries, leaves, teams and projects bump the scopes they
+affect (the owning user, their teams, the project, and `ALL_SCOPE` for admin
+views) once the transaction commits. A view lists the scopes its output
+depends on; the ETag digests their tokens together with the URL, the response
+format and the viewer, so a poll that changes nothing is answered with 304
+after one cache lookup, before the queryset or serializer run.
+"""
+import time
+
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from config.cache import bump_versions, get_versions, versioned_key
+
+ALL_SCOPE = ('etag:all', 0)
+
+# Holidays change the working-day counts shown with leaves
+HOLIDAYS_SCOPE = ('etag:holidays', 0)
+
+
+def user_scope(user_id):
+    return ('etag:user', user_id)
+
+
+def team_scope(team_id):
+    return ('etag:team', team_id)
+
+
+def project_scope(project_id):
+    return ('etag:project', project_id)
+
+
+def invalidate(user_ids=(), team_ids=(), project_ids=(), scopes=()):
+    """Bump the given scopes (and ALL_SCOPE) after the current transaction commits."""
+    scopes = [ALL_SCOPE, *scopes]
+    scopes.extend(user_scope(user_id) for user_id in set(user_ids) if user_id)
+    scopes.extend(team_scope(team_id) for team_id in set(team_ids) if team_id)
+    scopes.extend(project_scope(project_id) for project_id in set(project_ids) if project_id)
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+class ConditionalGetMixin:
+    """
+    ETag/Last-Modified for `list` and `retrieve`.
+
+    Views implement `get_etag_scopes()`, returning the scopes the current
+    request's output depends on, or None to skip validation. Set
+    `etag_time_bucket` (seconds) when the output also depends on the clock,
+    e.g. the elapsed time of a running timer.
+    """
+    etag_time_bucket = None
+
+    def get_etag_scopes(self):
+        raise NotImplementedError('Views using ConditionalGetMixin must implement get_etag_scopes().')
+
+    def get_object_key(self):
+        """Integer primary key from the URL, or None."""
+        try:
+            return int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def get_validators(self, request):
+        scopes = self.get_etag_scopes()
+        if scopes is None:
+            return None, None
+        versions = get_versions(scopes)
+        parts = [request.get_full_path(), request.accepted_renderer.format, request.user.pk]
+        last_modified = max(versions.values(), default=0)
+        if self.etag_time_bucket:
+            bucket = int(time.time() // self.etag_time_bucket)
+            parts.append(bucket)
+            last_modified = max(last_modified, bucket * self.etag_time_bucket)
+        return quote_etag(versioned_key('api', versions, *parts)), int(last_modified)
+
+    def conditional(self, handler, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        if etag is None:
+            return handler(request, *args, **kwargs)
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+            # Per-viewer data: clients may store it but must revalidate
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ['Authorization'])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
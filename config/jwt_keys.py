@@ -0,0 +1,137 @@
+"""
+JWT signing-key ring.
+
+Tokens are signed with the ring's active key and carry its key ID (`kid`) in
+the JWT header; verification picks the key by `kid`, so every worker and node
+loading the same ring accepts every token regardless of which one issued it.
+
+The ring is JSON, read from `settings.JWT_KEY_RING_FILE` or the
+`settings.JWT_KEY_RING` string:
+
+    {
+        "active": "2026-10",
+        "keys": {
+            "2026-10": "<secret>",
+            "2026-07": {"secret": "<secret>", "expires": "2026-11-18T00:00:00+00:00"}
+        }
+    }
+
+Rotation: add a new key, make it active and give the previous key an
+`expires` time at least one refresh-token lifetime away (see the
+`rotate_jwt_keys` command). Tokens signed with a retired key keep verifying
+until that overlap window ends. Without a configured ring simplejwt's default
+single-key backend (SIGNING_KEY) is used.
+"""
+import json
+from datetime import datetime, timezone
+
+import jwt
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.exceptions import TokenBackendError
+from rest_framework_simplejwt.settings import api_settings
+
+
+def read_key_ring():
+    """Return the raw ring dict from the configured file or env, or None."""
+    if settings.JWT_KEY_RING_FILE:
+        try:
+            with open(settings.JWT_KEY_RING_FILE) as handle:
+                return json.load(handle)
+        except (OSError, ValueError) as e:
+            raise ImproperlyConfigured(f"Cannot read JWT key ring file: {e}") from e
+    if settings.JWT_KEY_RING:
+        try:
+            return json.loads(settings.JWT_KEY_RING)
+        except ValueError as e:
+            raise ImproperlyConfigured(f"JWT_KEY_RING is not valid JSON: {e}") from e
+    return None
+
+
+def parse_key_ring(ring):
+    """Normalize a ring dict to (active_kid, {kid: (secret, expires or None)})."""
+    keys = {}
+    for kid, entry in (ring.get('keys') or {}).items():
+        if isinstance(entry, str):
+            entry = {'secret': entry}
+        expires = entry.get('expires')
+        if expires:
+            expires = datetime.fromisoformat(expires)
+            if expires.tzinfo is None:
+                expires = expires.replace(tzinfo=timezone.utc)
+        keys[kid] = (entry['secret'], expires)
+
+    active = ring.get('active')
+    if active not in keys:
+        raise ImproperlyConfigured("JWT key ring 'active' must name one of its keys.")
+    if keys[active][1] is not None:
+        raise ImproperlyConfigured("The active JWT signing key cannot have an expiry.")
+    return active, keys
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """TokenBackend that signs with the active key and verifies by `kid`."""
+
+    def __init__(self, active_kid, keys, **kwargs):
+        super().__init__(signing_key=keys[active_kid][0], **kwargs)
+        if not self.algorithm.startswith('HS'):
+            raise ImproperlyConfigured("The JWT key ring only supports HMAC (HS*) algorithms.")
+        self.active_kid = active_kid
+        self.keys = {kid: (self._prepare_key(secret), expires) for kid, (secret, expires) in keys.items()}
+
+    def encode(self, payload):
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            self.prepared_signing_key,
+            algorithm=self.algorithm,
+            headers={'kid': self.active_kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def get_verifying_key(self, token):
+        try:
+            kid = jwt.get_unverified_header(token).get('kid', self.active_kid)
+        except jwt.InvalidTokenError as e:
+            raise TokenBackendError(_("Token is invalid")) from e
+
+        key, expires = self.keys.get(kid, (None, None))
+        if key is None or (expires is not None and expires <= datetime.now(timezone.utc)):
+            raise TokenBackendError(_("Token is invalid"))
+        return key
+
+
+def build_token_backend():
+    """Return a KeyRingTokenBackend for the configured ring, else simplejwt's default backend."""
+    ring = read_key_ring()
+    if ring is None:
+        from rest_framework_simplejwt.state import token_backend
+        return token_backend
+    active, keys = parse_key_ring(ring)
+    return KeyRingTokenBackend(
+        active,
+        keys,
+        algorithm=api_settings.ALGORITHM,
+        audience=api_settings.AUDIENCE,
+        issuer=api_settings.ISSUER,
+        leeway=api_settings.LEEWAY,
+        json_encoder=api_settings.JSON_ENCODER,
+    )
+
+
+def install_key_ring():
+    """
+    Point every simplejwt token class at the key ring. The ring is read on
+    first token use, so management commands run without one.
+    """
+    from django.utils.functional import SimpleLazyObject
+    from rest_framework_simplejwt.tokens import Token
+
+    Token._token_backend = SimpleLazyObject(build_token_backend)
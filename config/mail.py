@@ -0,0 +1,27 @@
+"""
+SMTP backend that verifies TLS against certifi's CA bundle.
+
+Replaces the import-time `ssl._create_default_https_context` patch: certifi is
+only loaded when mail is actually sent, the context is built once per process,
+and other HTTPS clients keep the system trust store.
+"""
+import ssl
+from functools import lru_cache
+
+from django.core.mail.backends.smtp import EmailBackend
+from django.utils.functional import cached_property
+
+
+@lru_cache(maxsize=1)
+def certifi_ssl_context():
+    import certifi
+    return ssl.create_default_context(cafile=certifi.where())
+
+
+class CertifiEmailBackend(EmailBackend):
+
+    @cached_property
+    def ssl_context(self):
+        if self.ssl_certfile or self.ssl_keyfile:
+            return EmailBackend.ssl_context.func(self)
+        return certifi_ssl_context()
@@ -0,0 +1,74 @@
+import timeit
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from config.enums import UserRole
+from config.renderers import FastJSONParser, FastJSONRenderer, orjson
+
+# (label, viewset import path, URL) of the largest list endpoints
+ENDPOINTS = [
+    ('attendance', 'attendance.views.AttendanceViewSet', '/api/v1/attendance/attendance/'),
+    ('time entries', 'projects.views.TaskViewSet', '/api/v1/projects/tasks/'),
+    ('leaves', 'leaves.views.LeaveViewSet', '/api/v1/leaves/'),
+    ('projects', 'projects.views.ProjectViewSet', '/api/v1/projects/projects/'),
+]
+
+
+def _best_ms(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stdlib and orjson JSON renderer/parser on the payloads of "
+        "the largest list endpoints, as seen by an admin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', help='Email of the user to fetch as (defaults to the first admin).')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per measurement (best is reported).')
+
+    def handle(self, *args, **options):
+        if options['user']:
+            user = User.objects.filter(email=options['user']).first()
+        else:
+            user = User.objects.filter(role=UserRole.ADMIN, is_active=True).order_by('id').first()
+        if user is None:
+            raise CommandError("No user to fetch as; pass --user.")
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; the fast path falls back to stdlib."))
+
+        factory = APIRequestFactory()
+        repeat = options['repeat']
+        std_renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+        std_parser, fast_parser = JSONParser(), FastJSONParser()
+
+        self.stdout.write(
+            f"{'endpoint':<14}{'rows':>7}{'KiB':>9}"
+            f"{'render std':>12}{'orjson':>9}{'parse std':>11}{'orjson':>9}  (ms)"
+        )
+        for label, view_path, url in ENDPOINTS:
+            request = factory.get(url)
+            force_authenticate(request, user=user)
+            response = import_string(view_path).as_view({'get': 'list'})(request)
+            data = response.data
+            rows = len(data['results'] if isinstance(data, dict) and 'results' in data else data)
+
+            body = std_renderer.render(data)
+            if fast_renderer.render(data) != body:
+                self.stdout.write(self.style.WARNING(f"{label}: renderer outputs differ"))
+
+            render_std = _best_ms(lambda: std_renderer.render(data), repeat)
+            render_fast = _best_ms(lambda: fast_renderer.render(data), repeat)
+            parse_std = _best_ms(lambda: std_parser.parse(BytesIO(body)), repeat)
+            parse_fast = _best_ms(lambda: fast_parser.parse(BytesIO(body)), repeat)
+            self.stdout.write(
+                f"{label:<14}{rows:>7}{len(body) / 1024:>9.1f}"
+                f"{render_std:>12.2f}{render_fast:>9.2f}{parse_std:>11.2f}{parse_fast:>9.2f}"
+            )
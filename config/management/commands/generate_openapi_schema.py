@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from config.swagger import render_schema, schema_path, write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the OpenAPI schema artifact served by the docs (OPENAPI_SCHEMA_FILE, "
+        "named after the current source fingerprint). "
+        "Run at build/deploy time and whenever views or serializers change."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Exit with an error if the artifact is missing or out of date (for CI).')
+
+    def handle(self, *args, **options):
+        content = render_schema()
+        path = schema_path()
+
+        if options['check']:
+            try:
+                with open(path, 'rb') as handle:
+                    current = handle.read()
+            except FileNotFoundError:
+                raise CommandError(f"{path} does not exist.")
+            if current != content:
+                raise CommandError(f"{path} is out of date; run generate_openapi_schema.")
+            self.stdout.write(self.style.SUCCESS(f"{path} is up to date."))
+            return
+
+        write_schema(content, path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path} ({len(content)} bytes)."))
@@ -0,0 +1,65 @@
+import json
+import os
+import secrets
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.settings import api_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Add a new JWT signing key to JWT_KEY_RING_FILE and make it active. "
+        "The previous active key keeps verifying for one refresh-token lifetime. "
+        "Reload every worker after distributing the file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', action='store_true',
+                            help='Add the new key without activating it (activate later with --activate).')
+        parser.add_argument('--activate', metavar='KID', help='Activate an already staged key.')
+
+    def handle(self, *args, **options):
+        path = settings.JWT_KEY_RING_FILE
+        if not path:
+            raise CommandError("JWT_KEY_RING_FILE is not set.")
+
+        ring = {'active': None, 'keys': {}}
+        if os.path.exists(path):
+            with open(path) as handle:
+                ring = json.load(handle)
+
+        now = datetime.now(timezone.utc)
+        keys = {
+            kid: entry for kid, entry in ring.get('keys', {}).items()
+            if isinstance(entry, str) or not entry.get('expires')
+            or datetime.fromisoformat(entry['expires']) > now
+        }
+
+        kid = options['activate']
+        if kid is None:
+            kid = now.strftime('%Y%m%d%H%M%S')
+            keys[kid] = secrets.token_urlsafe(64)
+            self.stdout.write(f"Added key {kid}.")
+        elif kid not in keys:
+            raise CommandError(f"Unknown key {kid}.")
+
+        if not options['stage'] or ring.get('active') is None:
+            previous = ring.get('active')
+            if previous in keys and previous != kid:
+                secret = keys[previous] if isinstance(keys[previous], str) else keys[previous]['secret']
+                expires = now + api_settings.REFRESH_TOKEN_LIFETIME
+                keys[previous] = {'secret': secret, 'expires': expires.isoformat()}
+                self.stdout.write(f"Key {previous} retires at {expires.isoformat()}.")
+            ring['active'] = kid
+            if isinstance(keys[kid], dict):
+                keys[kid] = keys[kid]['secret']
+            self.stdout.write(f"Active key is now {kid}.")
+
+        ring['keys'] = keys
+        tmp_path = f'{path}.tmp'
+        with open(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as handle:
+            json.dump(ring, handle, indent=2)
+        os.replace(tmp_path, path)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {path}."))
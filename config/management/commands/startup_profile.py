@@ -0,0 +1,109 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter so nothing is already imported. Times settings
+# loading, app population and each AppConfig.ready(), then prints JSON.
+BOOT_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import django
+from django.apps import AppConfig
+from django.conf import settings
+
+ready_times = {}
+create = AppConfig.create.__func__
+
+def timed_create(cls, entry):
+    config = create(cls, entry)
+    ready = config.ready
+    def timed_ready():
+        began = time.perf_counter()
+        ready()
+        ready_times[config.label] = time.perf_counter() - began
+    config.ready = timed_ready
+    return config
+
+AppConfig.create = classmethod(timed_create)
+settings.INSTALLED_APPS
+settings_loaded = time.perf_counter()
+django.setup()
+done = time.perf_counter()
+print(json.dumps({
+    'settings': settings_loaded - start,
+    'setup': done - settings_loaded,
+    'total': done - start,
+    'ready': ready_times,
+}))
+"""
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from `python -X importtime` output."""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure cold start: boot a fresh interpreter with `-X importtime` and "
+        "report settings/setup time, per-app ready() time and the slowest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20, help='Number of modules/packages to list.')
+        parser.add_argument('--json', action='store_true', help='Print the raw measurements as JSON.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings'))
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Boot failed:\n{result.stderr[-2000:]}")
+
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        modules = parse_importtime(result.stderr)
+        packages = defaultdict(int)
+        for name, self_us, _ in modules:
+            packages[name.split('.')[0]] += self_us
+
+        limit = options['limit']
+        slowest = sorted(modules, key=lambda module: module[2], reverse=True)[:limit]
+        heaviest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+        if options['json']:
+            self.stdout.write(json.dumps({
+                **timings,
+                'modules': [{'module': n, 'self_us': s, 'cumulative_us': c} for n, s, c in slowest],
+                'packages': [{'package': n, 'self_us': s} for n, s in heaviest],
+            }, indent=2))
+            return
+
+        self.stdout.write(f"Total boot:      {timings['total'] * 1000:8.1f} ms")
+        self.stdout.write(f"  settings:      {timings['settings'] * 1000:8.1f} ms")
+        self.stdout.write(f"  django.setup:  {timings['setup'] * 1000:8.1f} ms")
+        self.stdout.write(f"Imported modules: {len(modules)}")
+
+        self.stdout.write("\nAppConfig.ready() (ms):")
+        for label, seconds in sorted(timings['ready'].items(), key=lambda item: item[1], reverse=True):
+            self.stdout.write(f"  {seconds * 1000:8.1f}  {label}")
+
+        self.stdout.write(f"\nTop {limit} packages by own import time (ms):")
+        for name, self_us in heaviest:
+            self.stdout.write(f"  {self_us / 1000:8.1f}  {name}")
+
+        self.stdout.write(f"\nTop {limit} modules by cumulative import time (ms):")
+        for name, _, cumulative_us in slowest:
+            self.stdout.write(f"  {cumulative_us / 1000:8.1f}  {name}")
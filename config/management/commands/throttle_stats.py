@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from config.throttling import REJECTIONS_KEY, get_rejection_counts
+
+
+class Command(BaseCommand):
+    help = "Show requests rejected by each throttle scope."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Clear the counters after printing them.')
+
+    def handle(self, *args, **options):
+        scopes = list(settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {}))
+        for scope, count in get_rejection_counts(scopes).items():
+            self.stdout.write(f"{scope}: {count}")
+        if options['reset']:
+            cache.delete_many([REJECTIONS_KEY.format(scope=scope) for scope in scopes])
+            self.stdout.write(self.style.SUCCESS("Counters cleared."))
@@ -0,0 +1,95 @@
+"""
+Media delivery.
+
+Django only decides whether a file may be served; the bytes are sent by the
+front proxy when `MEDIA_ACCEL_BACKEND` is set:
+
+- "nginx": responds with `X-Accel-Redirect: <MEDIA_ACCEL_PREFIX><path>`, e.g.
+
+      location /protected-media/ {
+          internal;
+          alias /app/media/;
+      }
+
+- "sendfile": responds with `X-Sendfile: <absolute path>` (Apache
+  mod_xsendfile, lighttpd).
+
+Without a backend the file is streamed with `FileResponse`.
+
+Access is decided per path prefix. Profile pictures are public, as they always
+were: `<img src>` cannot send a JWT, and unprocessed or failed uploads keep
+their original names. Content-hashed files (a 32 hex digit name such as
+processed profile pictures) never change and get immutable caching; other
+public files are revalidated. Nothing else under MEDIA_ROOT is served: a
+prefix holding private files needs its own ownership check in
+`PRIVATE_MEDIA` before it is exposed.
+"""
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+
+HASHED_NAME = re.compile(r'(^|/)[0-9a-f]{32}(_\w+)?\.\w+$')
+
+PUBLIC_MEDIA_PREFIXES = ('profile_pictures/',)
+
+# prefix -> check(request, path): True if the requester owns the file
+PRIVATE_MEDIA = {}
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'public, no-cache'
+PRIVATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def is_hashed_name(path):
+    return bool(HASHED_NAME.search(path))
+
+
+def _cache_control(request, path):
+    """Cache-Control for a readable file, or None if the requester may not read it."""
+    if path.startswith(PUBLIC_MEDIA_PREFIXES):
+        return IMMUTABLE_CACHE_CONTROL if is_hashed_name(path) else REVALIDATE_CACHE_CONTROL
+    for prefix, owns in PRIVATE_MEDIA.items():
+        if path.startswith(prefix):
+            return PRIVATE_CACHE_CONTROL if owns(request, path) else None
+    return None
+
+
+def _deliver(path, full_path):
+    backend = settings.MEDIA_ACCEL_BACKEND
+    if backend == 'nginx':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + path
+    elif backend == 'sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+    else:
+        return FileResponse(open(full_path, 'rb'))
+
+    # The proxy keeps these headers and supplies the body
+    content_type, encoding = mimetypes.guess_type(full_path)
+    response['Content-Type'] = content_type or 'application/octet-stream'
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
+
+
+def serve_media(request, path):
+    """Authorize a media request and hand the file to the proxy (or stream it)."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except ValueError:
+        raise Http404
+    # Authorize the resolved path, so `public/../private` can't borrow a public prefix
+    path = os.path.relpath(full_path, safe_join(settings.MEDIA_ROOT)).replace(os.sep, '/')
+    cache_control = _cache_control(request, path)
+    # Unreadable files look missing, so their names aren't confirmed
+    if cache_control is None or not os.path.isfile(full_path):
+        raise Http404
+
+    response = _deliver(path, full_path)
+    response['Cache-Control'] = cache_control
+    return response
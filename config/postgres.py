@@ -0,0 +1,46 @@
+"""
+PostgreSQL-specific helpers with portable fallbacks.
+
+Production runs on PostgreSQL while local development uses SQLite, so
+anything that depends on Postgres features degrades gracefully elsewhere.
+"""
+from django.db import connections, migrations
+from django.db.models import F, Func, Value
+
+
+class RunPostgresSQL(migrations.RunSQL):
+    """RunSQL that only executes on PostgreSQL and is a no-op elsewhere."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def is_postgres(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def date_range_overlap(queryset, start_field, end_field, start, end):
+    """
+    Filter rows whose inclusive [start_field, end_field] period overlaps [start, end].
+
+    On PostgreSQL this compiles to `daterange(start, end, '[]') && daterange(...)`,
+    which is served by a GiST expression index on the same daterange. Other
+    databases fall back to the equivalent pair of comparisons.
+    """
+    if not is_postgres(queryset):
+        return queryset.filter(**{f'{start_field}__lte': end, f'{end_field}__gte': start})
+
+    from django.contrib.postgres.fields import DateRangeField
+    from django.db.backends.postgresql.psycopg_any import DateRange
+
+    period = Func(
+        F(start_field), F(end_field), Value('[]'),
+        function='daterange',
+        output_field=DateRangeField(),
+    )
+    return queryset.alias(_period=period).filter(_period__overlap=DateRange(start, end, '[]'))
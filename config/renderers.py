@@ -0,0 +1,93 @@
+"""
+JSON renderer and parser backed by orjson.
+
+orjson encodes datetimes, dates, UUIDs and dict/list/str subclasses (such as
+serializer ReturnDict and ErrorDetail) natively; timedelta, Decimal, lazy
+strings and the rest go through DRF's encoder, so responses decode to the
+same values as `rest_framework.renderers.JSONRenderer`. They are not always
+byte-identical: floats may be spelled differently (orjson writes `1e-7`
+where the stdlib writes `1e-07`).
+
+orjson writes NaN and infinities as `null`; whenever the output contains a
+`null`, the data is checked for them and the response goes through DRF,
+which rejects them like it always has. Indented output (`; indent=N`, the
+browsable API), non-UTF-8 bodies, non-strict JSON settings and values orjson
+rejects (integers beyond 64 bits) fall back to the stdlib implementation, as
+does everything when orjson is not installed.
+"""
+import math
+from decimal import Decimal
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Same escaping as JSONRenderer, keeping the output a strict JavaScript subset
+LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+_encoder = JSONEncoder()
+
+
+def has_non_finite(data):
+    """True if `data` holds a NaN or infinite float or Decimal anywhere."""
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, float):
+            if not math.isfinite(value):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            stack.extend(value)
+        elif isinstance(value, Decimal) and not value.is_finite():
+            return True
+    return False
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=_encoder.default,
+                option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if b'null' in ret and has_non_finite(data):
+            # Let DRF raise its "Out of range float values" error
+            return super().render(data, accepted_media_type, renderer_context)
+
+        for char, escaped in LINE_SEPARATORS:
+            if char in ret:
+                ret = ret.replace(char, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
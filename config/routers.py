@@ -0,0 +1,95 @@
+"""
+Primary/replica database routing.
+
+Reads go to the "replica" alias only while handling a safe-method (GET, HEAD,
+OPTIONS) request from an authenticated user; writes, management commands,
+background work and unsafe requests always use the primary. A request that
+writes anything is pinned to the primary for the rest of its queries.
+
+Read-your-writes: after a successful unsafe request the user is marked sticky
+in the shared cache for REPLICA_STICKY_SECONDS, and their reads stay on the
+primary until replication has had time to catch up.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import LazyObject
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Per-request routing state set by ReplicaRoutingMiddleware
+_request_state = ContextVar('db_request_state', default=None)
+
+
+def _sticky_key(user_id):
+    return f'db:sticky:{user_id}'
+
+
+def resolved_user(request):
+    """
+    The request's user if authentication has already produced it, else None.
+    Never evaluates AuthenticationMiddleware's lazy user: loading it queries
+    the session and user tables, which routes back here and recurses.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, LazyObject):
+        # Filled in by django.contrib.auth once the lazy user is evaluated
+        return request.__dict__.get('_cached_user')
+    # Set directly by DRF after authenticating (token auth), or absent
+    return user
+
+
+def mark_sticky(user_id):
+    """Keep `user_id` reading from the primary for REPLICA_STICKY_SECONDS."""
+    cache.set(_sticky_key(user_id), 1, settings.REPLICA_STICKY_SECONDS)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _request_state.get()
+        if state is None or state['pinned']:
+            return PRIMARY
+        if state['replica'] is None:
+            user = resolved_user(state['request'])
+            if user is None or not user.is_authenticated:
+                # Not authenticated yet (e.g. token checks); decide later
+                return PRIMARY
+            state['replica'] = not cache.get(_sticky_key(user.pk))
+        return REPLICA if state['replica'] else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None:
+            state['pinned'] = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaRoutingMiddleware:
+    """Scope replica reads to safe-method requests and record stickiness after writes."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        token = _request_state.set({'request': request, 'pinned': not safe, 'replica': None})
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_state.reset(token)
+
+        user = resolved_user(request)
+        if not safe and response.status_code < 400 and user is not None and user.is_authenticated:
+            mark_sticky(user.pk)
+        return response
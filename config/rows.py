@@ -0,0 +1,73 @@
+"""
+values()-based read path for large list endpoints.
+
+Instantiating a ModelSerializer and walking its fields for every row
+dominates CPU time once a list holds thousands of rows. A `RowReader` names
+the columns the list needs and compiles, once per response, a function that
+turns one `values_list()` tuple into exactly the dict the serializer would
+produce. `FastListMixin` serves plain list requests from it; sparse requests
+(`?fields=`), detail views and writes keep using the serializer.
+"""
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from config.sparse import FieldSelection
+
+
+class RowReader:
+    """
+    Subclasses list `columns` (values() paths, joins included) and implement
+    `compile()`. Their output must match the serializer they stand in for;
+    the contract tests of each app compare the two byte for byte.
+    """
+    columns = ()
+
+    def __init__(self, context=None):
+        self.context = context if context is not None else {}
+
+    # Formatters of the fields ModelSerializer generates, so values render
+    # with the same settings (timezone, DATETIME_FORMAT, ...)
+    @staticmethod
+    def datetime_formatter():
+        return serializers.DateTimeField().to_representation
+
+    @staticmethod
+    def date_formatter():
+        return serializers.DateField().to_representation
+
+    @staticmethod
+    def duration_formatter():
+        to_representation = serializers.DurationField().to_representation
+        return lambda value: None if value is None else to_representation(value)
+
+    def compile(self):
+        """Return a function mapping one row tuple (in `columns` order) to a dict."""
+        raise NotImplementedError('RowReader subclasses must implement compile().')
+
+    def read(self, queryset):
+        # values_list() cannot follow prefetches; joins come from `columns`
+        return queryset.prefetch_related(None).values_list(*self.columns)
+
+    def to_representation(self, rows):
+        to_dict = self.compile()
+        return [to_dict(row) for row in rows]
+
+
+class FastListMixin:
+    """Serve `list` through `row_reader_class` when the full shape is requested."""
+    row_reader_class = None
+
+    def use_row_reader(self):
+        return self.row_reader_class is not None and not FieldSelection(self.request).sparse
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_row_reader():
+            return super().list(request, *args, **kwargs)
+
+        reader = self.row_reader_class(self.get_serializer_context())
+        rows = reader.read(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.to_representation(page))
+        return Response(reader.to_representation(rows))
@@ -1,10 +1,10 @@
 
-import ssl
-import certifi
-
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 import os
+from corsheaders.defaults import default_headers
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 import dj_database_url
 from dotenv import load_dotenv
@@ -20,12 +20,21 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # =========================================
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")  # "development" / "production"
 
-# Secret key
-SECRET_KEY = os.environ.get("SECRET_KEY", get_random_secret_key())
-
 # Debug
 DEBUG = os.getenv("DEBUG", "False") == "True"
 
+# Secret key
+# Must be identical on every worker and node: a per-process random key makes
+# sessions, CSRF tokens and (without a JWT key ring) JWTs fail across processes.
+# Only a DEBUG development server may run without one; it gets a random key per
+# process, so sessions and tokens don't survive a restart. A committed fallback
+# would let anyone forge JWTs for every deployment that forgot to set it.
+SECRET_KEY = os.environ.get("SECRET_KEY")
+if not SECRET_KEY:
+    if ENVIRONMENT == "production" or not DEBUG:
+        raise ImproperlyConfigured("SECRET_KEY must be set unless DEBUG=True.")
+    SECRET_KEY = get_random_secret_key()
+
 # Allowed hosts
 ALLOWED_HOSTS_ENV = os.getenv("ALLOWED_HOSTS", "")
 ALLOWED_HOSTS = [
@@ -50,15 +59,26 @@ INSTALLED_APPS = [
     "rest_framework_simplejwt",
     "rest_registration",
     "drf_yasg",
+    "config",
     "accounts",
     "leaves",
     "projects",
     "attendance",
     "timesheet",
-    'debug_toolbar',
-    'django_extensions',
 ]
 
+# API docs (drf_yasg); can be switched off to keep it out of a worker entirely
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", "True") == "True"
+if not API_DOCS_ENABLED:
+    INSTALLED_APPS.remove("drf_yasg")
+
+# Development-only tooling, never loaded in production or when not installed
+DEV_APPS = [
+    app for app in ("debug_toolbar", "django_extensions")
+    if DEBUG and ENVIRONMENT != "production" and find_spec(app)
+]
+INSTALLED_APPS += DEV_APPS
+
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",  
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -69,15 +89,18 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+if "debug_toolbar" in DEV_APPS:
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+    INTERNAL_IPS = ["127.0.0.1"]
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
+        "DIRS": [BASE_DIR / "config" / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
@@ -105,26 +128,51 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 
 DATABASE_URL = os.environ.get("DATABASE_URL")
+# Optional read replica; safe-method requests read from it (config/routers.py)
+DATABASE_REPLICA_URL = os.environ.get("DATABASE_REPLICA_URL")
+
+# Connection reuse, applied to every PostgreSQL connection below:
+# - DB_POOL_MAX_SIZE > 0 and psycopg 3 with psycopg_pool installed: server-side
+#   pool per worker process (Django's "pool" option)
+# - otherwise persistent connections kept for DB_CONN_MAX_AGE seconds
+DB_CONN_MAX_AGE = int(os.getenv("DB_CONN_MAX_AGE", "600"))
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "0"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_AVAILABLE = bool(find_spec("psycopg") and find_spec("psycopg_pool"))
+
+
+def with_connection_reuse(config):
+    if DB_POOL_MAX_SIZE > 0 and DB_POOL_AVAILABLE:
+        config["CONN_MAX_AGE"] = 0  # the pool owns connection lifetime
+        config.setdefault("OPTIONS", {})["pool"] = {
+            "min_size": DB_POOL_MIN_SIZE,
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": DB_POOL_TIMEOUT,
+        }
+    else:
+        config["CONN_MAX_AGE"] = DB_CONN_MAX_AGE
+        config["CONN_HEALTH_CHECKS"] = True
+    return config
+
 
 if DATABASE_URL:
     DATABASES = {
-        "default": dj_database_url.parse(
+        "default": with_connection_reuse(dj_database_url.parse(
             DATABASE_URL,
-            conn_max_age=600,
             ssl_require=True,        # Required by Render
-            conn_health_checks=True, # Django 4.1+
-        )
+        ))
     }
 elif DB_NAME:
     DATABASES = {
-        "default": {
+        "default": with_connection_reuse({
             "ENGINE": "django.db.backends.postgresql",
             "NAME": DB_NAME,
             "USER": DB_USER,
             "PASSWORD": DB_PASSWORD,
             "HOST": DB_HOST,
             "PORT": DB_PORT,
-        }
+        })
     }
 else:
     # Default to SQLite (good for local dev)
@@ -135,6 +183,41 @@ else:
         }
     }
 
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = with_connection_reuse(dj_database_url.parse(DATABASE_REPLICA_URL))
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+    DATABASE_ROUTERS = ["config.routers.PrimaryReplicaRouter"]
+    MIDDLEWARE.append("config.routers.ReplicaRoutingMiddleware")
+
+# Seconds a user keeps reading from the primary after their own write
+# (covers replication lag so they see what they just saved)
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "15"))
+
+# =========================================
+# CACHE
+# - Redis (shared by all workers) when REDIS_URL is set
+# - Per-process local memory otherwise (local dev)
+# =========================================
+
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django_redis.cache.RedisCache",
+            "LOCATION": REDIS_URL,
+            "OPTIONS": {
+                "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            },
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # =========================================
 # PASSWORD VALIDATION
 # =========================================
@@ -166,10 +249,57 @@ STATIC_URL = "/static/"
 # Media files (uploads)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# "nginx" (X-Accel-Redirect), "sendfile" (X-Sendfile) or empty to stream from Django
+MEDIA_ACCEL_BACKEND = os.getenv("MEDIA_ACCEL_BACKEND", "")
+# Internal nginx location aliasing MEDIA_ROOT
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+
+# Profile picture processing (accounts/avatars.py)
+PROFILE_PICTURE_FORMAT = "WEBP"
+PROFILE_PICTURE_QUALITY = 85
+PROFILE_PICTURE_MAX_SIZE = 1024
+PROFILE_PICTURE_THUMBNAILS = {"sm": 64, "md": 256}
+PROFILE_PICTURE_ASYNC = os.getenv("PROFILE_PICTURE_ASYNC", "True") == "True"
+PROFILE_PICTURE_WORKERS = int(os.getenv("PROFILE_PICTURE_WORKERS", "2"))
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 AUTH_USER_MODEL = "accounts.User"
 
+# Months of attendance/time entries kept in the hot tables; older closed
+# months are moved to archive tables by `manage.py archive_time_data`
+ARCHIVE_HOT_MONTHS = int(os.getenv("ARCHIVE_HOT_MONTHS", "12"))
+
+# Working week for leave/attendance calculations (Mon..Sun, 1 = working day)
+WORK_WEEKMASK = os.getenv("WORK_WEEKMASK", "1111100")
+
+# Years around the current one whose business-day masks are stored in
+# WorkCalendar on first use; masks of other years are computed in memory
+WORK_CALENDAR_PAST_YEARS = int(os.getenv("WORK_CALENDAR_PAST_YEARS", "5"))
+WORK_CALENDAR_FUTURE_YEARS = int(os.getenv("WORK_CALENDAR_FUTURE_YEARS", "2"))
+
+# Longest date range (days) the attendance report and absences accept
+ATTENDANCE_REPORT_MAX_DAYS = int(os.getenv("ATTENDANCE_REPORT_MAX_DAYS", "366"))
+
+# Yearly leave allowance (working days) per leave type
+LEAVE_ALLOWANCES = {
+    "casual": int(os.getenv("CASUAL_LEAVE_ALLOWANCE", "10")),
+    "sick": int(os.getenv("SICK_LEAVE_ALLOWANCE", "8")),
+}
+
+# Seconds a team's leave calendar stays cached (entries are also versioned)
+LEAVE_CALENDAR_CACHE_TIMEOUT = int(os.getenv("LEAVE_CALENDAR_CACHE_TIMEOUT", "300"))
+
+# Seconds a dashboard section stays cached (sections are also versioned)
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv("DASHBOARD_CACHE_TIMEOUT", "300"))
+
+# Typeahead user search result limits
+USER_SEARCH_DEFAULT_RESULTS = 10
+USER_SEARCH_MAX_RESULTS = 25
+
+# Admin changelists show PostgreSQL's row estimate instead of an exact
+# COUNT(*) once a result set is estimated at this many rows (config/admin.py)
+ADMIN_EXACT_COUNT_LIMIT = int(os.getenv("ADMIN_EXACT_COUNT_LIMIT", "100000"))
+
 # =========================================
 # AUTH / DRF / JWT
 # =========================================
@@ -183,18 +313,54 @@ REST_REGISTRATION = {
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
     ),
+    # orjson-backed JSON with a stdlib fallback (config/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": (
+        "config.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "config.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+    # Token buckets in the shared cache (config/throttling.py); views opt into
+    # the login/status/export scopes, writes are limited everywhere.
+    "DEFAULT_THROTTLE_CLASSES": (
+        "config.throttling.WriteRateThrottle",
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        "login": os.getenv("THROTTLE_LOGIN_RATE", "10/min"),
+        "status": os.getenv("THROTTLE_STATUS_RATE", "60/min"),
+        "export": os.getenv("THROTTLE_EXPORT_RATE", "20/hour"),
+        "write": os.getenv("THROTTLE_WRITE_RATE", "120/min"),
+    },
+    # Reverse proxies in front of the app (1 on Render). Throttles key
+    # anonymous clients on the X-Forwarded-For entry that many hops back;
+    # left unset, DRF would trust the client-supplied header and let the
+    # login throttle be bypassed by rotating it. 0 uses REMOTE_ADDR.
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", "0")),
 }
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=7),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=30),
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.UserTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.UserTokenRefreshSerializer",
 }
 
+# JWT signing-key ring (see config/jwt_keys.py): a JSON file path or inline JSON.
+# Unset: tokens are signed with SIGNING_KEY (defaults to SECRET_KEY).
+JWT_KEY_RING_FILE = os.getenv("JWT_KEY_RING_FILE", "")
+JWT_KEY_RING = os.getenv("JWT_KEY_RING", "")
+
+# How long a user's token version / active flag may be served from cache
+TOKEN_STATE_CACHE_TIMEOUT = int(os.getenv("TOKEN_STATE_CACHE_TIMEOUT", "60"))
+
 # =========================================
 # CORS / CSRF
 # =========================================
@@ -220,6 +386,10 @@ CSRF_TRUSTED_ORIGINS = [
 # If you're using cookies/session auth from a different domain:
 CORS_ALLOW_CREDENTIALS = True
 
+# Conditional GET (config/etags.py): let browser clients send and read validators
+CORS_ALLOW_HEADERS = (*default_headers, "if-none-match", "if-modified-since")
+CORS_EXPOSE_HEADERS = ["ETag", "Last-Modified"]
+
 # =========================================
 # SECURITY (production hardening)
 # =========================================
@@ -244,6 +414,11 @@ else:
 
 SWAGGER_BASE_URL = os.getenv("SWAGGER_BASE_URL", "")
 
+# Pre-generated schema artifact (`manage.py generate_openapi_schema`); the
+# file is written as openapi.<source fingerprint>.json next to this path
+OPENAPI_SCHEMA_FILE = os.getenv("OPENAPI_SCHEMA_FILE", str(BASE_DIR / "openapi.json"))
+OPENAPI_UI_CACHE_TIMEOUT = int(os.getenv("OPENAPI_UI_CACHE_TIMEOUT", "86400"))
+
 SWAGGER_SETTINGS = {
     "USE_SESSION_AUTH": False,
     "LOGIN_URL": None,
@@ -269,7 +444,7 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 EMAIL_BACKEND = os.getenv(
     "EMAIL_BACKEND", 
-    "django.core.mail.backends.smtp.EmailBackend"
+    "config.mail.CertifiEmailBackend"  # SMTP with certifi's CA bundle
 )
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
 EMAIL_PORT = int(os.getenv("EMAIL_PORT", "587"))
@@ -280,5 +455,3 @@ DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", EMAIL_HOST_USER)
 
 # For development, you can use console backend to print emails to console
 # EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
-
-ssl._create_default_https_context = lambda: ssl.create_default_context(cafile=certifi.where())
@@ -0,0 +1,72 @@
+"""
+Sparse fieldsets for read endpoints.
+
+`?fields=id,name,team` limits a response to the listed fields. In that mode,
+nested objects are rendered compactly (as primary keys) unless also named in
+`?expand=`, e.g. `?fields=id,name,team&expand=team`. Without `?fields=` the
+full representation is returned, so existing clients are unaffected.
+
+Viewsets read the same `FieldSelection` to skip the joins, prefetches and
+annotations that only unrequested fields need.
+"""
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _param_set(request, name):
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+class FieldSelection:
+    """Fields and expansions requested by a read request."""
+
+    def __init__(self, request):
+        self.fields = _param_set(request, FIELDS_PARAM)
+        self.expand = _param_set(request, EXPAND_PARAM) or set()
+
+    @property
+    def sparse(self):
+        return self.fields is not None
+
+    def wants(self, *names):
+        """True if any of `names` is part of the response."""
+        return self.fields is None or any(name in self.fields for name in names)
+
+    def expands(self, name):
+        """True if `name` is requested and rendered in full."""
+        return self.fields is None or (name in self.fields and name in self.expand)
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin applying `?fields=`/`?expand=` to the top-level serializer
+    of a read request. `compact_fields` maps expandable nested fields to a
+    factory for their compact replacement.
+    """
+    compact_fields = {}
+
+    @property
+    def selection(self):
+        if not hasattr(self, '_selection'):
+            self._selection = FieldSelection(self.context.get('request'))
+        return self._selection
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.selection.sparse:
+            return fields
+        for name, field in list(fields.items()):
+            if field.write_only:
+                continue
+            if not self.selection.wants(name):
+                del fields[name]
+            elif name in self.compact_fields and not self.selection.expands(name):
+                fields[name] = self.compact_fields[name]()
+        return fields
@@ -1,20 +1,143 @@
+"""
+API docs.
+
+The OpenAPI document is a pre-generated artifact (`manage.py
+generate_openapi_schema`, run at build/deploy time) read once per process and
+served with a content-hash ETag. Its name carries a fingerprint of the
+sources it is generated from, so an artifact from a previous release is never
+served after the API changes. If this release's artifact is missing it is
+generated on first request and written atomically for the other workers. The
+Swagger UI page itself is cached, so docs traffic never introspects the views
+again.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import drf_yasg
+import rest_framework
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
 from django.urls import path
-from rest_framework import permissions
-from drf_yasg.views import get_schema_view
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import require_safe
 from drf_yasg import openapi
-from django.conf import settings
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+from drf_yasg.views import get_schema_view
+from rest_framework import permissions
+
+API_INFO = openapi.Info(
+    title="TorchSync API",
+    default_version='v1',
+)
 
 schema_view = get_schema_view(
-    openapi.Info(
-        title="TorchSync API",
-        default_version='v1',
-    ),
+    API_INFO,
     public=True,
     permission_classes=(permissions.AllowAny,),
     url=settings.SWAGGER_BASE_URL
 
 )
 
+_schema = None
+_schema_lock = threading.Lock()
+
+
+def render_schema():
+    """Introspect the views and return the OpenAPI document as JSON bytes."""
+    generator = OpenAPISchemaGenerator(API_INFO, url=settings.SWAGGER_BASE_URL)
+    return OpenAPICodecJson(validators=[]).encode(generator.get_schema(request=None, public=True))
+
+
+def source_fingerprint():
+    """
+    Hash of what the schema is generated from: the project's Python sources
+    and the versions of the libraries that introspect them.
+    """
+    base_dir = Path(settings.BASE_DIR)
+    roots = {Path(app.path) for app in apps.get_app_configs() if Path(app.path).is_relative_to(base_dir)}
+    roots.add(base_dir / 'config')
+    digest = hashlib.sha256(f'{drf_yasg.__version__} {rest_framework.VERSION}'.encode())
+    for path in sorted(file for root in roots for file in root.rglob('*.py')):
+        digest.update(str(path.relative_to(base_dir)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def schema_path():
+    """
+    OPENAPI_SCHEMA_FILE with the source fingerprint in its name
+    (`openapi.<fingerprint>.json`), so an artifact left over from another
+    release is never served.
+    """
+    path = Path(settings.OPENAPI_SCHEMA_FILE)
+    return path.with_name(f'{path.stem}.{source_fingerprint()}{path.suffix}')
+
+
+def write_schema(content, path=None):
+    """Write the artifact atomically and remove those of other releases."""
+    path = path or schema_path()
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    for stale in path.parent.glob(f'{path.stem.rsplit(".", 1)[0]}.*{path.suffix}'):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return path
+
+
+def load_schema():
+    """(content, etag) of this release's schema artifact, generating it if missing."""
+    global _schema
+    if _schema is None:
+        with _schema_lock:
+            if _schema is None:
+                path = schema_path()
+                try:
+                    with open(path, 'rb') as handle:
+                        content = handle.read()
+                except FileNotFoundError:
+                    content = render_schema()
+                    try:
+                        write_schema(content, path)
+                    except OSError:
+                        pass  # read-only filesystem: keep it in memory only
+                _schema = (content, f'"{hashlib.sha256(content).hexdigest()[:32]}"')
+    return _schema
+
+
+@require_safe
+def openapi_schema(request):
+    content, etag = load_schema()
+    if etag in request.headers.get('If-None-Match', ''):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
+
+
+swagger_ui = schema_view.with_ui('swagger', cache_timeout=settings.OPENAPI_UI_CACHE_TIMEOUT)
+
+
+def docs(request):
+    # Swagger UI loads its spec from this same URL with ?format=openapi
+    if request.GET.get('format') == 'openapi':
+        return openapi_schema(request)
+    return swagger_ui(request)
+
+
 urlpatterns = [
-    path('', schema_view.with_ui('swagger', cache_timeout=0)),
-] 
\ No newline at end of file
+    path('', docs),
+    path('openapi.json', openapi_schema, name='openapi-schema'),
+]
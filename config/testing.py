@@ -0,0 +1,39 @@
+"""
+Shared test helpers.
+
+`RowReaderContractTestCase` checks that a `FastListMixin` view's values() list
+path renders byte-for-byte what its serializer does. Subclasses set `viewset`
+and add their own rows in `setUpTestData()` after calling super(), which
+creates an admin (`cls.admin`) and an employee (`cls.user`).
+"""
+from django.test import TestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+
+
+def render_list(viewset, user, url, **overrides):
+    """Rendered `list` response of `viewset` for `user`, with class attributes overridden."""
+    request = APIRequestFactory().get(url)
+    force_authenticate(request, user=user)
+    view = type(viewset.__name__, (viewset,), overrides) if overrides else viewset
+    return view.as_view({'get': 'list'})(request).render().content
+
+
+class RowReaderContractTestCase(TestCase):
+    viewset = None
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pw', full_name='Admin', role='admin')
+        cls.user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+
+    def render_list(self, user, url, viewset=None, **overrides):
+        return render_list(viewset or self.viewset, user, url, **overrides)
+
+    def assertSameList(self, user, url, viewset=None):
+        fast = self.render_list(user, url, viewset)
+        self.assertEqual(fast, self.render_list(user, url, viewset, row_reader_class=None))
+        return fast
@@ -0,0 +1,156 @@
+"""
+Token-bucket throttles backed by the shared cache.
+
+A scope's rate uses DRF's "<requests>/<period>" format: the bucket holds that
+many requests and refills continuously at requests/period, so short bursts are
+allowed without exceeding the sustained rate. On Redis (django-redis) each
+check is a single Lua script run atomically on the server, so the limit holds
+across every worker and node. Other cache backends fall back to a
+read-modify-write guarded by a process-local lock.
+
+Rejections are logged and counted per scope (see `get_rejection_counts`).
+"""
+import logging
+import threading
+import time
+
+from django.core.cache import cache, caches
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+REJECTIONS_KEY = 'throttle:rejected:{scope}'
+
+TOKEN_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return {allowed, tostring(tokens)}
+"""
+
+_local_lock = threading.Lock()
+_redis_script = None
+
+
+def _get_redis_script():
+    """Registered Lua script when the default cache is django-redis, else None."""
+    global _redis_script
+    if _redis_script is None:
+        try:
+            from django_redis import get_redis_connection
+            from django_redis.cache import RedisCache
+        except ImportError:
+            return None
+        if not isinstance(caches['default'], RedisCache):
+            return None
+        _redis_script = get_redis_connection('default').register_script(TOKEN_BUCKET_SCRIPT)
+    return _redis_script
+
+
+def consume(key, capacity, period):
+    """
+    Take one token from the bucket at `key`.
+    Returns (allowed, seconds until the next token is available).
+    """
+    rate = capacity / period
+    ttl = int(period) + 1
+    script = _get_redis_script()
+    if script is not None:
+        allowed, tokens = script(keys=[cache.make_key(key)], args=[capacity, rate, ttl])
+        tokens = float(tokens)
+    else:
+        with _local_lock:
+            now = time.time()
+            tokens, ts = cache.get(key, (capacity, now))
+            tokens = min(capacity, tokens + max(0, now - ts) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            cache.set(key, (tokens, now), ttl)
+    return bool(allowed), 0 if allowed else (1 - tokens) / rate
+
+
+def record_rejection(scope):
+    key = REJECTIONS_KEY.format(scope=scope)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def get_rejection_counts(scopes):
+    """{scope: rejected requests} since the counters were last cleared."""
+    keys = {REJECTIONS_KEY.format(scope=scope): scope for scope in scopes}
+    counts = cache.get_many(list(keys))
+    return {scope: counts.get(key, 0) for key, scope in keys.items()}
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle with token-bucket accounting in the shared cache."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, self._wait = consume(self.key, self.num_requests, self.duration)
+        if not allowed:
+            record_rejection(self.scope)
+            logger.warning("Throttled %s request to %s (scope=%s, key=%s)",
+                           request.method, request.path, self.scope, self.key)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class UserScopedThrottle(TokenBucketThrottle):
+    """One bucket per authenticated user, falling back to client IP."""
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class LoginRateThrottle(TokenBucketThrottle):
+    """Per client IP; every attempt costs a password hash."""
+    scope = 'login'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class StatusPollingThrottle(UserScopedThrottle):
+    scope = 'status'
+
+
+class ExportRateThrottle(UserScopedThrottle):
+    scope = 'export'
+
+
+class WriteRateThrottle(UserScopedThrottle):
+    """Applies to unsafe methods only."""
+    scope = 'write'
+
+    def allow_request(self, request, view):
+        if request.method in ('GET', 'HEAD', 'OPTIONS'):
+            return True
+        return super().allow_request(request, view)
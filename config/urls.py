@@ -1,17 +1,28 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import include, path, re_path
+
+from config.dashboard import DashboardView
+from config.media import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', include('config.swagger')),
     path('api/v1/accounts/', include('accounts.urls')),
     path('api/v1/leaves/', include('leaves.urls')),
     path('api/v1/projects/', include('projects.urls')),
     path('api/v1/attendance/', include('attendance.urls')),
     path('api/v1/timesheet/', include('timesheet.urls')),
+    path('api/v1/dashboard/', DashboardView.as_view(), name='dashboard'),
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.API_DOCS_ENABLED:
+    urlpatterns.insert(1, path('', include('config.swagger')))
+
+if 'debug_toolbar' in settings.INSTALLED_APPS:
+    from debug_toolbar.toolbar import debug_toolbar_urls
+    urlpatterns += debug_toolbar_urls()
+
+# Authorized media, delivered by the front proxy when MEDIA_ACCEL_BACKEND is set
+urlpatterns += [
+    re_path(rf'^{settings.MEDIA_URL.strip("/")}/(?P<path>.+)$', serve_media, name='media'),
+]
@@ -1,8 +1,10 @@
 from django.contrib import admin
-from .models import Leave
+
+from config.admin import AutocompleteFilter, HighVolumeAdmin
+from .models import Leave, Holiday, WorkCalendar, LeaveBalance
 
 @admin.register(Leave)
-class LeaveAdmin(admin.ModelAdmin):
+class LeaveAdmin(HighVolumeAdmin):
     list_display = (
         'id',
         'user',
@@ -18,7 +20,9 @@ class LeaveAdmin(admin.ModelAdmin):
         'status',
         'start_date',
         'applied_at',
+        ('user', AutocompleteFilter),
     )
+    list_select_related = ('user', 'applied_by')
     search_fields = (
         'user__email',
         'user__full_name',
@@ -31,4 +35,37 @@ class LeaveAdmin(admin.ModelAdmin):
     )
     date_hierarchy = 'start_date'
     ordering = ('-applied_at',)
-    list_per_page = 25
\ No newline at end of file
+    list_per_page = 25
+
+
+@admin.register(Holiday)
+class HolidayAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'date', 'created_at')
+    search_fields = ('name',)
+    date_hierarchy = 'date'
+    ordering = ('date',)
+
+
+@admin.register(WorkCalendar)
+class WorkCalendarAdmin(admin.ModelAdmin):
+    """
+    Read-only view of the precomputed masks; they are rebuilt from holidays.
+    """
+    list_display = ('year', 'weekmask', 'working_days', 'updated_at')
+    readonly_fields = ('year', 'weekmask', 'business_day_mask', 'working_days', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(LeaveBalance)
+class LeaveBalanceAdmin(admin.ModelAdmin):
+    """
+    Ledger rows are maintained by leave actions; use the
+    `rebuild_leave_balances` command to recompute them.
+    """
+    list_display = ('user', 'leave_type', 'year', 'allowance', 'used_days', 'pending_days', 'updated_at')
+    list_filter = ('leave_type', 'year')
+    search_fields = ('user__email', 'user__full_name')
+    list_select_related = ('user',)
+    readonly_fields = ('user', 'leave_type', 'year', 'used_days', 'pending_days', 'updated_at')
@@ -0,0 +1,215 @@
+"""
+Leave balance ledger.
+
+Each leave contributes its working days to `pending_days` while pending and to
+`used_days` once approved, split per calendar year. Changes are applied as
+deltas between a before/after snapshot of the leave, so approve, reject, edit
+and delete all go through `record_leave_change(s)`.
+"""
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from config.enums import LeaveStatus, LeaveType
+from .models import Leave, LeaveBalance
+from .workdays import count_business_days, get_busdaycalendar
+
+STATUS_FIELDS = {
+    LeaveStatus.PENDING: 'pending_days',
+    LeaveStatus.APPROVED: 'used_days',
+}
+
+
+def get_allowance(leave_type):
+    return settings.LEAVE_ALLOWANCES.get(leave_type, 0)
+
+
+def snapshot(leave):
+    """Capture the ledger-relevant state of a leave before it changes."""
+    if leave is None or leave.pk is None:
+        return None
+    return {
+        'user_id': leave.user_id,
+        'leave_type': leave.leave_type,
+        'status': leave.status,
+        'start_date': leave.start_date,
+        'end_date': leave.end_date,
+    }
+
+
+def _year_segments(start_date, end_date):
+    """Split an inclusive date range at year boundaries."""
+    for year in range(start_date.year, end_date.year + 1):
+        yield year, max(start_date, date(year, 1, 1)), min(end_date, date(year, 12, 31))
+
+
+def _contributions(state, calendar):
+    """Ledger deltas a leave in `state` contributes, keyed by balance row and field."""
+    result = Counter()
+    field = STATUS_FIELDS.get(state['status']) if state else None
+    if not field:
+        return result
+    for year, start, end in _year_segments(state['start_date'], state['end_date']):
+        days = count_business_days(start, end, calendar)
+        if days:
+            result[(state['user_id'], state['leave_type'], year, field)] += days
+    return result
+
+
+def _apply_delta(delta):
+    """
+    Apply {(user_id, leave_type, year, field): days} to the ledger set-based:
+    missing rows are bulk-created and all rows are adjusted in one UPDATE.
+    """
+    delta = {key: days for key, days in delta.items() if days}
+    if not delta:
+        return
+
+    row_keys = {(user_id, leave_type, year) for user_id, leave_type, year, _ in delta}
+
+    def load_pks():
+        return {
+            (user_id, leave_type, year): pk
+            for pk, user_id, leave_type, year in LeaveBalance.objects.filter(
+                user_id__in={key[0] for key in row_keys},
+                year__in={key[2] for key in row_keys},
+            ).values_list('pk', 'user_id', 'leave_type', 'year')
+            if (user_id, leave_type, year) in row_keys
+        }
+
+    pks = load_pks()
+    missing = row_keys - pks.keys()
+    if missing:
+        LeaveBalance.objects.bulk_create(
+            [
+                LeaveBalance(user_id=user_id, leave_type=leave_type, year=year, allowance=get_allowance(leave_type))
+                for user_id, leave_type, year in missing
+            ],
+            ignore_conflicts=True,
+        )
+        pks = load_pks()
+
+    updates = {}
+    for field in STATUS_FIELDS.values():
+        whens = [
+            When(pk=pks[(user_id, leave_type, year)], then=Value(days))
+            for (user_id, leave_type, year, key_field), days in delta.items()
+            if key_field == field
+        ]
+        if whens:
+            updates[field] = F(field) + Case(*whens, default=Value(0), output_field=IntegerField())
+    LeaveBalance.objects.filter(pk__in=pks.values()).update(**updates)
+
+
+def record_leave_changes(changes):
+    """
+    Apply the ledger difference for many (before_snapshot, leave) pairs at once
+    (pass `leave=None` for deletions).
+    """
+    calendar = get_busdaycalendar()
+    delta = Counter()
+    for before, leave in changes:
+        delta.update(_contributions(snapshot(leave), calendar))
+        delta.subtract(_contributions(before, calendar))
+
+    with transaction.atomic():
+        _apply_delta(delta)
+
+
+def record_leave_change(before, leave):
+    """
+    Apply the difference between a snapshot taken before a change and the
+    leave's current state (pass `leave=None` for deletions).
+    """
+    record_leave_changes([(before, leave)])
+
+
+def get_balance(user_id, leave_type, year):
+    """O(1) lookup by the unique (user, leave_type, year) key."""
+    balance = LeaveBalance.objects.filter(user_id=user_id, leave_type=leave_type, year=year).first()
+    if balance is None:
+        balance = LeaveBalance(
+            user_id=user_id,
+            leave_type=leave_type,
+            year=year,
+            allowance=get_allowance(leave_type),
+        )
+    return balance
+
+
+def get_balances(user_ids, year):
+    """
+    Balances for every user and leave type in `year`.
+    Missing ledger rows are returned as unsaved zero-usage balances.
+    """
+    existing = {
+        (b.user_id, b.leave_type): b
+        for b in LeaveBalance.objects.filter(user_id__in=user_ids, year=year).select_related('user')
+    }
+    from accounts.models import User
+
+    balances = []
+    for user in User.objects.filter(id__in=user_ids).order_by('id').only('id', 'full_name', 'email'):
+        for leave_type in LeaveType.values:
+            balance = existing.get((user.id, leave_type))
+            if balance is None:
+                balance = LeaveBalance(
+                    user=user,
+                    leave_type=leave_type,
+                    year=year,
+                    allowance=get_allowance(leave_type),
+                )
+            balances.append(balance)
+    return balances
+
+
+def rebuild_balances(year=None, user_ids=None):
+    """
+    Recompute ledger rows from `Leave` history.
+    Working days are counted for all leave segments in one vectorized call.
+    Returns the number of balance rows written.
+    """
+    leaves = Leave.objects.filter(status__in=STATUS_FIELDS.keys())
+    balances = LeaveBalance.objects.all()
+    if year is not None:
+        leaves = leaves.filter(start_date__lte=date(year, 12, 31), end_date__gte=date(year, 1, 1))
+        balances = balances.filter(year=year)
+    if user_ids is not None:
+        leaves = leaves.filter(user_id__in=user_ids)
+        balances = balances.filter(user_id__in=user_ids)
+
+    keys, starts, ends = [], [], []
+    for user_id, leave_type, status, start_date, end_date in leaves.values_list(
+        'user_id', 'leave_type', 'status', 'start_date', 'end_date'
+    ).iterator():
+        for segment_year, start, end in _year_segments(start_date, end_date):
+            if year is None or segment_year == year:
+                keys.append((user_id, leave_type, segment_year, STATUS_FIELDS[status]))
+                starts.append(start)
+                ends.append(end)
+
+    totals = defaultdict(Counter)
+    if keys:
+        counts = count_business_days(starts, ends, get_busdaycalendar())
+        for (user_id, leave_type, segment_year, field), days in zip(keys, counts):
+            totals[(user_id, leave_type, segment_year)][field] += int(days)
+
+    rows = [
+        LeaveBalance(
+            user_id=user_id,
+            leave_type=leave_type,
+            year=segment_year,
+            allowance=get_allowance(leave_type),
+            used_days=fields['used_days'],
+            pending_days=fields['pending_days'],
+        )
+        for (user_id, leave_type, segment_year), fields in totals.items()
+    ]
+
+    with transaction.atomic():
+        balances.delete()
+        LeaveBalance.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
@@ -0,0 +1,68 @@
+"""
+In-memory approved-leave lookups.
+
+A user's approved leaves are loaded once into merged, sorted intervals and
+answered by bisection, so "is the user on leave on date D?" costs no query
+after the first. Interval lists are cached under the user's `config.etags`
+scope, which is bumped once a transaction saving or re-statusing one of
+their leaves commits (`team_calendar.invalidate_users`).
+"""
+from bisect import bisect_right
+
+from django.conf import settings
+from django.core.cache import cache
+
+from config.cache import get_version, versioned_key
+from config.enums import LeaveStatus
+from config.etags import user_scope
+from .models import Leave
+
+
+class ApprovedLeaveIndex:
+    """Merged, sorted approved-leave intervals of one user."""
+
+    def __init__(self, intervals):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def contains(self, day):
+        i = bisect_right(self.starts, day) - 1
+        return i >= 0 and day <= self.ends[i]
+
+
+def load_approved_intervals(user_id):
+    scope = user_scope(user_id)
+    key = versioned_key('leaves:approved', {scope: get_version(*scope)}, user_id)
+    intervals = cache.get(key)
+    if intervals is None:
+        intervals = list(
+            Leave.objects.filter(user_id=user_id, status=LeaveStatus.APPROVED)
+            .order_by('start_date')
+            .values_list('start_date', 'end_date')
+        )
+        cache.set(key, intervals, settings.LEAVE_CALENDAR_CACHE_TIMEOUT)
+    return intervals
+
+
+class ApprovedLeaveLookup:
+    """
+    Per-request (or per-batch) memo of approved-leave indexes.
+    Create one and reuse it for every date check within the same unit of work.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+
+    def get_index(self, user_id):
+        if user_id not in self._indexes:
+            self._indexes[user_id] = ApprovedLeaveIndex(load_approved_intervals(user_id))
+        return self._indexes[user_id]
+
+    def is_on_leave(self, user_id, day):
+        return self.get_index(user_id).contains(day)
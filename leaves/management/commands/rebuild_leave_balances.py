@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from leaves.balances import rebuild_balances
+
+
+class Command(BaseCommand):
+    help = "Recompute the leave balance ledger from existing Leave records."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, help='Only rebuild balances for this year.')
+        parser.add_argument('--user', type=int, action='append', dest='users',
+                            help='Only rebuild balances for this user ID (repeatable).')
+
+    def handle(self, *args, **options):
+        count = rebuild_balances(year=options['year'], user_ids=options['users'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} leave balance rows."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from leaves.overlaps import resolve_overlapping_leaves
+
+
+class Command(BaseCommand):
+    help = (
+        "Reject pending/approved leaves that overlap another leave of the same user. "
+        "Run before deploying leaves migration 0006, which fails while overlaps exist."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only list the leaves that would be rejected.')
+
+    def handle(self, *args, **options):
+        conflicts = resolve_overlapping_leaves(dry_run=options['dry_run'])
+        for rejected_id, kept_id in sorted(conflicts.items()):
+            self.stdout.write(f"Leave #{rejected_id} overlaps leave #{kept_id}")
+        verb = "Would reject" if options['dry_run'] else "Rejected"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(conflicts)} overlapping leaves."))
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 00:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0003_holiday_workcalendar'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveBalance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('leave_type', models.CharField(choices=[('casual', 'Casual'), ('sick', 'Sick')], max_length=20)),
+                ('year', models.PositiveIntegerField()),
+                ('allowance', models.IntegerField(default=0)),
+                ('used_days', models.IntegerField(default=0)),
+                ('pending_days', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_balances', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['user', 'year', 'leave_type'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'leave_type', 'year'), name='unique_leave_balance_per_user_type_year')],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+from config.postgres import RunPostgresSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0004_leavebalance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['user', 'start_date', 'end_date'], name='leave_user_period_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['start_date', 'end_date'], name='leave_period_idx'),
+        ),
+        RunPostgresSQL(
+            sql="CREATE INDEX IF NOT EXISTS leave_period_gist_idx ON leaves_leave "
+                "USING gist (daterange(start_date, end_date, '[]'))",
+            reverse_sql="DROP INDEX IF EXISTS leave_period_gist_idx",
+        ),
+    ]
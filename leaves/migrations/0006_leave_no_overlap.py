@@ -0,0 +1,47 @@
+from django.db import migrations
+
+from config.postgres import RunPostgresSQL
+from leaves.overlaps import find_overlapping_leaves
+
+
+def check_overlaps(apps, schema_editor):
+    """
+    The constraint can't be added while overlaps exist. Resolving them
+    rejects leaves and updates the balance ledger, which needs the live
+    models, so it is a manual pre-deploy step rather than part of this
+    migration.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    conflicts = find_overlapping_leaves(apps.get_model('leaves', 'Leave').objects.all())
+    if conflicts:
+        raise RuntimeError(
+            f"{len(conflicts)} pending/approved leaves overlap another leave of the same user. "
+            "Run `manage.py resolve_leave_overlaps --dry-run` to list them and "
+            "`manage.py resolve_leave_overlaps` to reject them, then migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+    """
+    PostgreSQL-only: forbid overlapping pending/approved leaves per user.
+    Fails while overlaps exist; run `manage.py resolve_leave_overlaps` first.
+    """
+
+    dependencies = [
+        ('leaves', '0005_leave_period_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_overlaps, migrations.RunPython.noop),
+        RunPostgresSQL(
+            sql="CREATE EXTENSION IF NOT EXISTS btree_gist",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        RunPostgresSQL(
+            sql="ALTER TABLE leaves_leave ADD CONSTRAINT leave_no_overlap "
+                "EXCLUDE USING gist (user_id WITH =, daterange(start_date, end_date, '[]') WITH &&) "
+                "WHERE (status IN ('pending', 'approved'))",
+            reverse_sql="ALTER TABLE leaves_leave DROP CONSTRAINT IF EXISTS leave_no_overlap",
+        ),
+    ]
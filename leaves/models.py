@@ -21,4 +21,72 @@ class Leave(models.Model):
     class Meta:
         ordering = ['-applied_at']
         verbose_name = 'Leave'
-        verbose_name_plural = 'Leaves'
\ No newline at end of file
+        verbose_name_plural = 'Leaves'
+        indexes = [
+            # Range-overlap lookups (calendar, overlap checks); PostgreSQL also
+            # gets a GiST index on daterange(start_date, end_date) in migrations
+            models.Index(fields=['user', 'start_date', 'end_date'], name='leave_user_period_idx'),
+            models.Index(fields=['start_date', 'end_date'], name='leave_period_idx'),
+        ]
+
+
+class Holiday(models.Model):
+    name = models.CharField(max_length=255)
+    date = models.DateField(unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.date})"
+
+    class Meta:
+        ordering = ['date']
+
+
+class WorkCalendar(models.Model):
+    """
+    Precomputed business-day mask for one calendar year.
+    `business_day_mask` holds one '1'/'0' per day of the year (index 0 is Jan 1),
+    so weekends and holidays never have to be recomputed on read.
+    """
+    year = models.PositiveIntegerField(unique=True)
+    weekmask = models.CharField(max_length=7)
+    business_day_mask = models.CharField(max_length=366)
+    working_days = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.year} ({self.working_days} working days)"
+
+    class Meta:
+        ordering = ['-year']
+
+
+class LeaveBalance(models.Model):
+    """
+    Ledger row holding a user's leave usage for one leave type and year.
+    Maintained incrementally by `leaves.balances` so lookups never have to
+    scan or expand `Leave` rows.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leave_balances')
+    leave_type = models.CharField(max_length=20, choices=LeaveType.choices)
+    year = models.PositiveIntegerField()
+    allowance = models.IntegerField(default=0)
+    used_days = models.IntegerField(default=0)
+    pending_days = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def remaining_days(self):
+        return self.allowance - self.used_days
+
+    def __str__(self):
+        return f"{self.user.email} - {self.leave_type} {self.year} ({self.used_days}/{self.allowance})"
+
+    class Meta:
+        ordering = ['user', 'year', 'leave_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'leave_type', 'year'],
+                name='unique_leave_balance_per_user_type_year'
+            )
+        ]
@@ -0,0 +1,63 @@
+"""
+Overlapping pending/approved leaves.
+
+The `leave_no_overlap` exclusion constraint (PostgreSQL) forbids them, but
+rows written before it existed may still overlap, and adding the constraint
+fails while they do. Migration 0006 refuses to run until they are gone:
+before deploying it, run `manage.py resolve_leave_overlaps --dry-run` to
+review them and `manage.py resolve_leave_overlaps` to reject them through
+the balance ledger.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+
+from config.enums import LeaveStatus
+
+OVERLAP_STATUSES = (LeaveStatus.PENDING, LeaveStatus.APPROVED)
+
+
+def find_overlapping_leaves(queryset):
+    """
+    Map each pending/approved leave in `queryset` that overlaps a leave kept
+    for the same user to that leave's ID. Approved leaves are kept before
+    pending ones, then earlier applications first. Works on historical
+    models too.
+    """
+    rows = queryset.filter(status__in=OVERLAP_STATUSES).values_list(
+        'id', 'user_id', 'status', 'start_date', 'end_date', 'applied_at'
+    )
+    kept = defaultdict(list)
+    conflicts = {}
+    for pk, user_id, status, start, end, applied_at in sorted(
+        rows, key=lambda row: (row[1], row[2] != LeaveStatus.APPROVED, row[5], row[0])
+    ):
+        kept_pk = next((other for other, other_start, other_end in kept[user_id]
+                        if other_start <= end and start <= other_end), None)
+        if kept_pk is None:
+            kept[user_id].append((pk, start, end))
+        else:
+            conflicts[pk] = kept_pk
+    return conflicts
+
+
+def resolve_overlapping_leaves(dry_run=False):
+    """
+    Reject every leave `find_overlapping_leaves` reports, updating the
+    balance ledger. Returns the {rejected_id: kept_id} mapping.
+    """
+    from .balances import record_leave_change, snapshot
+    from .models import Leave
+
+    conflicts = find_overlapping_leaves(Leave.objects.all())
+    if dry_run:
+        return conflicts
+
+    for leave in Leave.objects.filter(pk__in=conflicts):
+        with transaction.atomic():
+            before = snapshot(leave)
+            leave.status = LeaveStatus.REJECTED
+            leave.admin_comment = f"Automatically rejected: overlaps leave #{conflicts[leave.pk]}."
+            leave.save(update_fields=['status', 'admin_comment', 'updated_at'])
+            record_leave_change(before, leave)
+    return conflicts
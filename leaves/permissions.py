@@ -1,6 +1,8 @@
 from rest_framework import permissions
 from config.enums import UserRole
 
+APPROVAL_ACTIONS = ['approve', 'reject', 'bulk_approve', 'bulk_reject']
+
 
 class RoleBasedLeavePermission(permissions.BasePermission):
     """
@@ -25,16 +27,16 @@ class RoleBasedLeavePermission(permissions.BasePermission):
         if action == 'create':
             return user.role in [UserRole.EMPLOYEE, UserRole.TEAM_LEAD, UserRole.ADMIN]
         
-        # List/Retrieve: All authenticated users can view
-        if action in ['list', 'retrieve']:
+        # List/Retrieve/Balances/Calendar: All authenticated users can view (results are scoped)
+        if action in ['list', 'retrieve', 'balances', 'calendar']:
             return True
         
         # Edit: All authenticated users (object-level check will verify ownership)
         if action == 'edit':
             return True
         
-        # Approve/Reject: Only admin and team lead
-        if action in ['approve', 'reject']:
+        # Approve/Reject (single or bulk): Only admin and team lead
+        if action in APPROVAL_ACTIONS:
             return user.role in [UserRole.ADMIN, UserRole.TEAM_LEAD]
         
         # Update/Delete: Standard permissions (object-level check)
@@ -56,7 +58,7 @@ class RoleBasedLeavePermission(permissions.BasePermission):
             return obj.user == user
 
         # Approve/Reject: Admin and team lead can approve/reject (but not their own)
-        if action in ['approve', 'reject']:
+        if action in APPROVAL_ACTIONS:
             # Cannot approve/reject your own leave
             if obj.user == user:
                 return False
@@ -1,6 +1,11 @@
 from rest_framework import serializers
-from .models import Leave
+from .models import Leave, LeaveBalance
 from accounts.models import User
+from .workdays import count_business_days, get_busdaycalendar
+from config.enums import LeaveStatus
+from config.postgres import date_range_overlap
+from config.rows import RowReader
+from .overlaps import OVERLAP_STATUSES
 
 
 class LeaveSerializer(serializers.ModelSerializer):
@@ -12,24 +17,154 @@ class LeaveSerializer(serializers.ModelSerializer):
     # Target user (who the leave is for)
     user_id = serializers.IntegerField(source='user.id', read_only=True)
     user_name = serializers.CharField(source='user.full_name', read_only=True)
+    working_days = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Leave
         fields = [
             'id', 'user', 'user_id', 'user_name', 'applied_by',
-            'leave_type', 'start_date', 'end_date', 'reason', 
+            'leave_type', 'start_date', 'end_date', 'working_days', 'reason', 
             'status', 'admin_comment', 'applied_at', 'updated_at'
         ]
-        read_only_fields = ('id', 'applied_at', 'updated_at', 'user_id', 'user_name')
+        read_only_fields = ('id', 'applied_at', 'updated_at', 'user_id', 'user_name', 'working_days')
+
+    def get_working_days(self, obj):
+        """Business days covered by the leave (weekends and holidays excluded)"""
+        # One calendar per response instead of one per row
+        if '_busdaycalendar' not in self.context:
+            self.context['_busdaycalendar'] = get_busdaycalendar()
+        return count_business_days(obj.start_date, obj.end_date, self.context['_busdaycalendar'])
 
     def validate(self, data):
         start = data.get('start_date')
         end = data.get('end_date')
         if start and end and end < start:
             raise serializers.ValidationError("End date cannot be before start date.")
+        self._check_overlap(data)
         return data
 
+    def _check_overlap(self, data):
+        """
+        Reject leaves overlapping the user's other pending/approved leaves.
+        A single indexed EXISTS query (user + date range); PostgreSQL also
+        enforces this with the `leave_no_overlap` exclusion constraint.
+        """
+        instance = self.instance
+        request = self.context.get('request')
+
+        user = data.get('user') or (instance.user if instance else getattr(request, 'user', None))
+        start = data.get('start_date') or (instance.start_date if instance else None)
+        end = data.get('end_date') or (instance.end_date if instance else None)
+        status = data.get('status') or (instance.status if instance else LeaveStatus.PENDING)
+        if not user or not start or not end or status not in OVERLAP_STATUSES:
+            return
+
+        overlapping = date_range_overlap(
+            Leave.objects.filter(user=user, status__in=OVERLAP_STATUSES),
+            'start_date', 'end_date', start, end
+        )
+        if instance:
+            overlapping = overlapping.exclude(pk=instance.pk)
+        if overlapping.exists():
+            raise serializers.ValidationError(
+                "This leave overlaps another pending or approved leave for the same user."
+            )
+
+
+class LeaveRowReader(RowReader):
+    """values()-based LeaveSerializer output for the list endpoint."""
+    columns = (
+        'id', 'user_id', 'user__full_name', 'leave_type', 'start_date', 'end_date',
+        'reason', 'status', 'admin_comment', 'applied_at', 'updated_at',
+    )
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        self.working_days = {}
+        if rows:
+            # Working days of the whole list in one vectorized call
+            calendar = self.context.setdefault('_busdaycalendar', get_busdaycalendar())
+            counts = count_business_days([row[4] for row in rows], [row[5] for row in rows], calendar)
+            self.working_days = dict(zip((row[0] for row in rows), counts.tolist()))
+        return super().to_representation(rows)
+
+    def compile(self):
+        to_datetime = self.datetime_formatter()
+        to_date = self.date_formatter()
+        working_days = self.working_days
+
+        def to_dict(row):
+            (pk, user_id, user_name, leave_type, start_date, end_date,
+             reason, status, admin_comment, applied_at, updated_at) = row
+            return {
+                'id': pk,
+                'user_id': user_id,
+                'user_name': user_name,
+                'leave_type': leave_type,
+                'start_date': to_date(start_date),
+                'end_date': to_date(end_date),
+                'working_days': working_days[pk],
+                'reason': reason,
+                'status': status,
+                'admin_comment': admin_comment,
+                'applied_at': to_datetime(applied_at),
+                'updated_at': to_datetime(updated_at),
+            }
+        return to_dict
+
 
 class LeaveActionSerializer(serializers.Serializer):
     comment = serializers.CharField(allow_blank=True, required=False)
-    
\ No newline at end of file
+
+
+class LeaveBulkActionSerializer(LeaveActionSerializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=500)
+    
+
+class LeaveBalanceSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(source='user.id', read_only=True)
+    user_name = serializers.CharField(source='user.full_name', read_only=True)
+    remaining_days = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = LeaveBalance
+        fields = [
+            'user_id', 'user_name', 'leave_type', 'year',
+            'allowance', 'used_days', 'pending_days', 'remaining_days'
+        ]
+        read_only_fields = fields
+
+
+class LeaveBalanceQuerySerializer(serializers.Serializer):
+    year = serializers.IntegerField(required=False, min_value=2000, max_value=2100)
+    user = serializers.IntegerField(required=False)
+
+
+class LeaveCalendarQuerySerializer(serializers.Serializer):
+    """Date window for the team calendar: explicit start/end, or `weeks` from start."""
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+    weeks = serializers.IntegerField(required=False, min_value=1, max_value=26, default=4)
+
+    def validate(self, data):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        data.setdefault('start', timezone.localdate())
+        data.setdefault('end', data['start'] + timedelta(weeks=data['weeks'], days=-1))
+        if data['end'] < data['start']:
+            raise serializers.ValidationError("End date cannot be before start date.")
+        if (data['end'] - data['start']).days > 366:
+            raise serializers.ValidationError("Calendar window cannot exceed one year.")
+        return data
+
+
+class LeaveCalendarEntrySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    user_id = serializers.IntegerField()
+    user_name = serializers.CharField(source='user__full_name', allow_null=True)
+    leave_type = serializers.CharField()
+    status = serializers.CharField()
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
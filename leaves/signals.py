@@ -0,0 +1,29 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.etags import HOLIDAYS_SCOPE, invalidate
+from .models import Holiday, Leave, WorkCalendar
+from .team_calendar import invalidate_users
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def refresh_work_calendar(sender, instance, **kwargs):
+    """
+    Keep the precomputed business-day masks in sync with holiday edits.
+    Every stored year is rebuilt so moving a holiday across years is covered.
+    """
+    # NumPy is only needed here, keep it out of app loading
+    from .workdays import clear_holiday_cache, is_stored_year, rebuild_work_calendar
+
+    clear_holiday_cache()
+    years = set(WorkCalendar.objects.values_list('year', flat=True))
+    if is_stored_year(instance.date.year):
+        years.add(instance.date.year)
+    for year in years:
+        rebuild_work_calendar(year)
+    invalidate(scopes=[HOLIDAYS_SCOPE])
+
+
+@receiver([post_save, post_delete], sender=Leave)
+def invalidate_leave_calendar(sender, instance, **kwargs):
+    invalidate_users([instance.user_id])
@@ -0,0 +1,86 @@
+"""
+Team leave calendar.
+
+Leaves overlapping a date window are cached per scope (one team, one user, or
+everyone for admins) under versioned keys. The scopes are the `config.etags`
+ones: a leave change bumps its user's scopes and their teams', and membership
+changes bump the team's (`projects.signals`), so a viewer's calendar is
+assembled from per-team entries that stay valid until one of those teams
+actually changes.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+from config.cache import get_versions, versioned_key
+from config.enums import LeaveStatus, UserRole
+from config.etags import ALL_SCOPE, invalidate, team_scope, user_scope
+from config.postgres import date_range_overlap
+from .models import Leave
+
+CALENDAR_STATUSES = [LeaveStatus.APPROVED, LeaveStatus.PENDING]
+
+def get_viewer_scopes(user):
+    """Cache scopes making up the calendar visible to `user`."""
+    if user.role == UserRole.ADMIN:
+        return [ALL_SCOPE]
+
+    scopes = [user_scope(user.id)]
+    if user.role == UserRole.TEAM_LEAD:
+        from projects.models import Team
+        team_ids = Team.objects.filter(team_lead=user).order_by().values_list('id', flat=True)
+        scopes.extend(team_scope(team_id) for team_id in team_ids)
+    return scopes
+
+
+def _scope_queryset(scope):
+    key = scope[1]
+    qs = Leave.objects.filter(status__in=CALENDAR_STATUSES)
+    if scope == team_scope(key):
+        from projects.models import Team
+        return qs.filter(
+            models.Q(user_id__in=Team.members.through.objects.filter(team_id=key).values('user_id'))
+            | models.Q(user_id__in=Team.objects.filter(id=key).values('team_lead_id'))
+        )
+    if scope == user_scope(key):
+        return qs.filter(user_id=key)
+    return qs
+
+
+def _load_scope(scope, start, end):
+    qs = date_range_overlap(_scope_queryset(scope), 'start_date', 'end_date', start, end)
+    return list(qs.order_by('start_date', 'id').values(
+        'id', 'user_id', 'user__full_name', 'leave_type', 'status', 'start_date', 'end_date'
+    ))
+
+
+def get_calendar(user, start, end):
+    """
+    Approved and pending leaves of the viewer's visible users overlapping
+    [start, end], merged from the per-scope cache entries.
+    """
+    scopes = get_viewer_scopes(user)
+    versions = get_versions(scopes)
+
+    leaves = {}
+    for scope in scopes:
+        key = versioned_key('leaves:calendar', {scope: versions[scope]}, start, end)
+        rows = cache.get(key)
+        if rows is None:
+            rows = _load_scope(scope, start, end)
+            cache.set(key, rows, settings.LEAVE_CALENDAR_CACHE_TIMEOUT)
+        for row in rows:
+            leaves[row['id']] = row
+
+    return sorted(leaves.values(), key=lambda row: (row['start_date'], row['id']))
+
+
+def invalidate_users(user_ids):
+    """Bump the scopes affected by leave changes of `user_ids`, their teams' included."""
+    from projects.models import Team
+
+    user_ids = set(user_ids)
+    team_ids = Team.objects.filter(
+        models.Q(members__id__in=user_ids) | models.Q(team_lead_id__in=user_ids)
+    ).values_list('id', flat=True).distinct()
+    invalidate(user_ids=user_ids, team_ids=list(team_ids))
@@ -1,3 +1,133 @@
+from datetime import date
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import User
+from config.cache import get_version
+from config.enums import LeaveStatus, LeaveType
+from config.etags import team_scope, user_scope
+from config.testing import RowReaderContractTestCase
+from .balances import get_balance, rebuild_balances
+from .models import Holiday, Leave
+from .overlaps import resolve_overlapping_leaves
+from .views import LeaveViewSet
+
+
+class LeaveRowReaderContractTests(RowReaderContractTestCase):
+    """The values() list path renders exactly what LeaveSerializer does."""
+    viewset = LeaveViewSet
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        nameless = User.objects.create_user(
+            username='anon', email='anon@example.com', password='pw', role='employee')
+        Holiday.objects.create(name='Holiday', date=date(2025, 3, 5))
+
+        Leave.objects.create(
+            user=cls.user, applied_by=cls.user, leave_type=LeaveType.CASUAL,
+            start_date=date(2025, 3, 3), end_date=date(2025, 3, 9), reason='Trip   ünïcode')
+        Leave.objects.create(
+            user=cls.user, applied_by=cls.admin, leave_type=LeaveType.SICK, status=LeaveStatus.APPROVED,
+            start_date=date(2025, 4, 5), end_date=date(2025, 4, 6), reason='Flu', admin_comment='Get well')
+        Leave.objects.create(
+            user=nameless, leave_type=LeaveType.SICK, status=LeaveStatus.REJECTED,
+            start_date=date(2025, 5, 1), end_date=date(2025, 5, 1), reason='', admin_comment='')
+
+    def test_admin_list(self):
+        content = self.assertSameList(self.admin, '/api/v1/leaves/')
+        # Mon-Sun with a midweek holiday
+        self.assertIn(b'"working_days":4', content)
+
+    def test_employee_list(self):
+        self.assertSameList(self.user, '/api/v1/leaves/')
+
+    def test_filtered_and_searched_list(self):
+        self.assertSameList(self.admin, '/api/v1/leaves/?status=pending&search=employee&ordering=start_date')
+
+    def test_empty_list(self):
+        self.assertSameList(self.admin, '/api/v1/leaves/?status=approved&leave_type=casual')
+
+
+class ResolveOverlappingLeavesTests(TestCase):
+
+    def test_keeps_approved_then_earliest_leaves(self):
+        user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='pw', full_name='Other', role='employee')
+
+        def leave(owner, start, end, status=LeaveStatus.PENDING):
+            return Leave.objects.create(
+                user=owner, leave_type=LeaveType.CASUAL, start_date=start, end_date=end,
+                reason='Trip', status=status)
+
+        first = leave(user, date(2026, 3, 2), date(2026, 3, 4))
+        approved = leave(user, date(2026, 3, 4), date(2026, 3, 5), LeaveStatus.APPROVED)
+        later = leave(user, date(2026, 3, 6), date(2026, 3, 6))
+        overlapping_later = leave(user, date(2026, 3, 6), date(2026, 3, 9))
+        unrelated = leave(other, date(2026, 3, 2), date(2026, 3, 9))
+        rebuild_balances()
+
+        self.assertEqual(resolve_overlapping_leaves(), {first.pk: approved.pk, overlapping_later.pk: later.pk})
+        statuses = dict(Leave.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[first.pk], LeaveStatus.REJECTED)
+        self.assertEqual(statuses[overlapping_later.pk], LeaveStatus.REJECTED)
+        self.assertEqual(statuses[unrelated.pk], LeaveStatus.PENDING)
+        # Only `later` (one working day) is still pending for the user
+        self.assertEqual(get_balance(user.pk, LeaveType.CASUAL, 2026).pending_days, 1)
+        self.assertEqual(resolve_overlapping_leaves(), {})
+
+    def test_constraint_migration_refuses_overlaps(self):
+        migration = import_module('leaves.migrations.0006_leave_no_overlap')
+        schema_editor = SimpleNamespace(connection=SimpleNamespace(vendor='postgresql'))
+        user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        for start in (date(2026, 3, 2), date(2026, 3, 3)):
+            Leave.objects.create(
+                user=user, leave_type=LeaveType.CASUAL, start_date=start, end_date=date(2026, 3, 4), reason='Trip')
+
+        with self.assertRaisesMessage(RuntimeError, 'resolve_leave_overlaps'):
+            migration.check_overlaps(apps, schema_editor)
+        resolve_overlapping_leaves()
+        migration.check_overlaps(apps, schema_editor)
+
+
+class LeaveCalendarInvalidationTests(TestCase):
+
+    def test_versions_bump_after_commit(self):
+        cache.clear()
+        user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        before = get_version(*user_scope(user.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Leave.objects.create(
+                user=user, leave_type=LeaveType.CASUAL, start_date=date(2026, 3, 2), end_date=date(2026, 3, 3),
+                reason='Trip', status=LeaveStatus.APPROVED)
+            self.assertEqual(get_version(*user_scope(user.pk)), before)
+
+        self.assertNotEqual(get_version(*user_scope(user.pk)), before)
+
+    def test_member_leave_bumps_team_scope(self):
+        from projects.models import Team
+
+        cache.clear()
+        lead = User.objects.create_user(
+            username='lead', email='lead@example.com', password='pw', full_name='Lead', role='team_lead')
+        user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        team = Team.objects.create(name='Core', team_lead=lead)
+        team.members.add(user)
+        before = get_version(*team_scope(team.pk))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Leave.objects.create(
+                user=user, leave_type=LeaveType.CASUAL, start_date=date(2026, 3, 2), end_date=date(2026, 3, 3),
+                reason='Trip')
+
+        self.assertNotEqual(get_version(*team_scope(team.pk)), before)
@@ -1,19 +1,93 @@
 # leaves/utils.py
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
+from config.enums import LeaveStatus
+from .models import Leave
+from .balances import record_leave_change, record_leave_changes, snapshot
 
 def update_leave_status(leave, new_status, comment=None, allowed_status='pending'):
     if leave.status != allowed_status:
         raise ValidationError(f"Cannot change status for a leave that is already '{leave.status}'")
 
-    leave.status = new_status
-    if comment:
-        leave.admin_comment = comment
-    leave.save()
-    
-    # If leave is approved, handle attendance records
-    if new_status == 'approved':
-        from attendance.services import handle_approved_leave
-        handle_approved_leave(leave)
+    with transaction.atomic():
+        before = snapshot(leave)
+        leave.status = new_status
+        if comment:
+            leave.admin_comment = comment
+        leave.save()
+
+        # Move the leave's days between pending and used in the balance ledger
+        record_leave_change(before, leave)
+        
+        # If leave is approved, handle attendance records
+        if new_status == 'approved':
+            from attendance.services import handle_approved_leave
+            handle_approved_leave(leave)
     
     return leave
 
+
+def bulk_update_leave_status(leaves, new_status, comment=None, allowed_status='pending'):
+    """
+    Change the status of many leaves with a single UPDATE.
+    Rows are locked and re-checked for `allowed_status` first, so leaves changed
+    concurrently are skipped. Returns the set of IDs that were updated.
+    """
+    leaves = list(leaves)
+    if not leaves:
+        return set()
+
+    with transaction.atomic():
+        updated_ids = set(
+            Leave.objects.select_for_update()
+            .filter(id__in=[leave.id for leave in leaves], status=allowed_status)
+            .values_list('id', flat=True)
+        )
+        changes = {'status': new_status, 'updated_at': timezone.now()}
+        if comment:
+            changes['admin_comment'] = comment
+        Leave.objects.filter(id__in=updated_ids).update(**changes)
+
+        updated = [leave for leave in leaves if leave.id in updated_ids]
+        befores = [snapshot(leave) for leave in updated]
+        for leave in updated:
+            for field, value in changes.items():
+                setattr(leave, field, value)
+        record_leave_changes(zip(befores, updated))
+
+        if new_status == LeaveStatus.APPROVED:
+            from attendance.services import handle_approved_leaves
+            handle_approved_leaves(updated)
+
+    # update() bypasses model signals, so invalidate cached calendars and ETags here
+    from .team_calendar import invalidate_users
+    invalidate_users({leave.user_id for leave in updated})
+
+    return updated_ids
+
+
+def save_leave(serializer, **kwargs):
+    """
+    Save a leave through its serializer and keep the balance ledger in sync.
+    Used for create and edit so the ledger is updated in the same transaction.
+    """
+    try:
+        with transaction.atomic():
+            before = snapshot(serializer.instance)
+            leave = serializer.save(**kwargs)
+            record_leave_change(before, leave)
+    except IntegrityError as exc:
+        # Concurrent overlapping request caught by the PostgreSQL exclusion constraint
+        if 'leave_no_overlap' not in str(exc):
+            raise
+        raise ValidationError("This leave overlaps another pending or approved leave for the same user.")
+    return leave
+
+
+def delete_leave(leave):
+    """Delete a leave and release its days from the balance ledger."""
+    with transaction.atomic():
+        before = snapshot(leave)
+        leave.delete()
+        record_leave_change(before, None)
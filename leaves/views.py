@@ -4,15 +4,31 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import PermissionDenied
 from django_filters.rest_framework import DjangoFilterBackend
-from config.enums import UserRole
+from django.utils import timezone
+from config.enums import UserRole, LeaveStatus
+from config.etags import ALL_SCOPE, HOLIDAYS_SCOPE, ConditionalGetMixin, user_scope
+from config.rows import FastListMixin
 from .models import Leave
-from .serializers import LeaveSerializer, LeaveActionSerializer
+from .serializers import (
+    LeaveSerializer,
+    LeaveRowReader,
+    LeaveActionSerializer,
+    LeaveBulkActionSerializer,
+    LeaveBalanceSerializer,
+    LeaveBalanceQuerySerializer,
+    LeaveCalendarQuerySerializer,
+    LeaveCalendarEntrySerializer,
+)
 from .permissions import RoleBasedLeavePermission
-from .utils import update_leave_status
+from projects.visibility import scope_to_visible_users, visible_user_ids
+from .utils import update_leave_status, bulk_update_leave_status, save_leave, delete_leave
+from .balances import get_balances
+from .team_calendar import get_calendar
 
-class LeaveViewSet(viewsets.ModelViewSet):
+class LeaveViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Leave.objects.all()
     serializer_class = LeaveSerializer
+    row_reader_class = LeaveRowReader
     permission_classes = [IsAuthenticated, RoleBasedLeavePermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'leave_type', 'user', 'start_date']
@@ -20,26 +36,25 @@ class LeaveViewSet(viewsets.ModelViewSet):
     ordering_fields = ['applied_at', 'start_date', 'end_date']
     ordering = ['-applied_at']
 
+    def get_visible_user_ids(self):
+        """
+        IDs of users whose leaves the current user may see.
+        Returns None for admins (no restriction).
+        """
+        # Computed once per request for the ETag check and balances
+        if not hasattr(self, '_visible_user_ids'):
+            self._visible_user_ids = visible_user_ids(self.request.user)
+        return self._visible_user_ids
+
+    def get_etag_scopes(self):
+        user_ids = self.get_visible_user_ids()
+        if user_ids is None:
+            return [ALL_SCOPE, HOLIDAYS_SCOPE]
+        return [HOLIDAYS_SCOPE, *(user_scope(user_id) for user_id in user_ids)]
+
     def get_queryset(self):
-        user = self.request.user
-        qs = Leave.objects.all()
-        
-        if user.role == UserRole.ADMIN:
-            # Admin sees all leaves
-            return qs
-        elif user.role == UserRole.TEAM_LEAD:
-            # Team lead sees own + team members' leaves
-            from projects.models import Team
-            led_teams = Team.objects.filter(team_lead=user)
-            team_member_ids = []
-            for team in led_teams:
-                team_member_ids.extend(team.members.values_list('id', flat=True))
-            # Include self
-            team_member_ids.append(user.id)
-            return qs.filter(user_id__in=team_member_ids)
-        else:
-            # Employee sees only own leaves
-            return qs.filter(user=user)
+        # Admin: all leaves; team lead: own + led teams' members'; employee: own
+        return scope_to_visible_users(Leave.objects.all(), self.request.user)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -47,11 +62,17 @@ class LeaveViewSet(viewsets.ModelViewSet):
 
         if target_user and target_user != user:
             if user.role in [UserRole.ADMIN, UserRole.TEAM_LEAD]:
-                serializer.save(user=target_user, applied_by=user)
+                save_leave(serializer, user=target_user, applied_by=user)
             else:
                 raise PermissionDenied("You cannot apply leave for another user.")
         else:
-            serializer.save(user=user, applied_by=user)
+            save_leave(serializer, user=user, applied_by=user)
+
+    def perform_update(self, serializer):
+        save_leave(serializer)
+
+    def perform_destroy(self, instance):
+        delete_leave(instance)
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -79,6 +100,50 @@ class LeaveViewSet(viewsets.ModelViewSet):
 
         return Response({"status": "Leave rejected successfully"})
 
+    @action(detail=False, methods=['post'])
+    def bulk_approve(self, request):
+        return self._bulk_update_status(request, LeaveStatus.APPROVED)
+
+    @action(detail=False, methods=['post'])
+    def bulk_reject(self, request):
+        return self._bulk_update_status(request, LeaveStatus.REJECTED)
+
+    def _bulk_update_status(self, request, new_status):
+        """
+        Approve/reject a list of leave IDs in one pass.
+        Permissions are checked against the preloaded leaves; every ID gets an
+        outcome: the new status, 'not_found', 'forbidden' or 'invalid_status'.
+        """
+        action_serializer = LeaveBulkActionSerializer(data=request.data)
+        action_serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(action_serializer.validated_data['ids']))
+        comment = action_serializer.validated_data.get('comment', '')
+
+        leaves = self.get_queryset().select_related('user', 'applied_by').in_bulk(ids)
+        permission = RoleBasedLeavePermission()
+
+        outcomes = {}
+        allowed = []
+        for leave_id in ids:
+            leave = leaves.get(leave_id)
+            if leave is None:
+                outcomes[leave_id] = 'not_found'
+            elif not permission.has_object_permission(request, self, leave):
+                outcomes[leave_id] = 'forbidden'
+            elif leave.status != LeaveStatus.PENDING:
+                outcomes[leave_id] = 'invalid_status'
+            else:
+                allowed.append(leave)
+
+        updated_ids = bulk_update_leave_status(allowed, new_status, comment=comment)
+        for leave in allowed:
+            outcomes[leave.id] = new_status if leave.id in updated_ids else 'invalid_status'
+
+        return Response({
+            "updated": len(updated_ids),
+            "results": [{"id": leave_id, "result": outcomes[leave_id]} for leave_id in ids],
+        })
+
     @action(detail=True, methods=['patch'])
     def edit(self, request, pk=None):
         leave = self.get_object()
@@ -86,9 +151,49 @@ class LeaveViewSet(viewsets.ModelViewSet):
 
         serializer = self.get_serializer(leave, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        save_leave(serializer)
 
         return Response({
             "status": "Leave updated successfully",
             "data": serializer.data
         })
+
+    @action(detail=False, methods=['get'])
+    def balances(self, request):
+        """
+        Leave balances per user and leave type for a year (defaults to current).
+        Scoped like the leave list: admin sees all, team leads their teams.
+        """
+        query = LeaveBalanceQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        year = query.validated_data.get('year', timezone.localdate().year)
+        
+        user_ids = self.get_visible_user_ids()
+        if user_ids is None:
+            from accounts.models import User
+            user_ids = User.objects.filter(is_active=True).values_list('id', flat=True)
+        
+        target = query.validated_data.get('user')
+        if target is not None:
+            user_ids = [uid for uid in user_ids if uid == target]
+        
+        serializer = LeaveBalanceSerializer(get_balances(user_ids, year), many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Approved and pending leaves overlapping a date window for the caller's
+        visible users (?start=&end= or ?weeks=N, default 4 weeks from today).
+        """
+        query = LeaveCalendarQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        start = query.validated_data['start']
+        end = query.validated_data['end']
+        
+        entries = get_calendar(request.user, start, end)
+        return Response({
+            "start": start,
+            "end": end,
+            "results": LeaveCalendarEntrySerializer(entries, many=True).data,
+        })
@@ -0,0 +1,177 @@
+"""
+Working-day arithmetic backed by NumPy business-day functions.
+
+Weekends come from `settings.WORK_WEEKMASK` (Mon..Sun, '1' = working day) and
+public holidays from the `Holiday` table. Every count works on whole date
+ranges at once instead of looping over calendar days in Python. Reports over
+a fixed window use `RangeCalendar`, which reads the per-year masks stored in
+`WorkCalendar` instead of re-deriving weekends and holidays.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+HOLIDAYS_CACHE_KEY = 'leaves:holidays'
+HOLIDAYS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_weekmask():
+    return getattr(settings, 'WORK_WEEKMASK', '1111100')
+
+
+def get_holidays():
+    """Return all holiday dates as a sorted datetime64[D] array (cached)."""
+    holidays = cache.get(HOLIDAYS_CACHE_KEY)
+    if holidays is None:
+        from .models import Holiday
+        holidays = [d.isoformat() for d in Holiday.objects.order_by('date').values_list('date', flat=True)]
+        cache.set(HOLIDAYS_CACHE_KEY, holidays, HOLIDAYS_CACHE_TIMEOUT)
+    return np.array(holidays, dtype='datetime64[D]')
+
+
+def clear_holiday_cache():
+    cache.delete(HOLIDAYS_CACHE_KEY)
+
+
+def get_busdaycalendar():
+    """Build a NumPy business-day calendar from the weekmask and holidays."""
+    return np.busdaycalendar(weekmask=get_weekmask(), holidays=get_holidays())
+
+
+def _to_datetime64(value):
+    return np.asarray(value, dtype='datetime64[D]')
+
+
+def count_business_days(start, end, calendar=None):
+    """
+    Count working days between `start` and `end`, both inclusive.
+    Accepts single dates or equal-length sequences of dates (vectorized).
+    """
+    if calendar is None:
+        calendar = get_busdaycalendar()
+    begin = _to_datetime64(start)
+    stop = _to_datetime64(end) + np.timedelta64(1, 'D')
+    counts = np.busday_count(begin, np.maximum(begin, stop), busdaycal=calendar)
+    return int(counts) if np.ndim(counts) == 0 else counts
+
+
+def is_business_day(dates, calendar=None):
+    """Vectorized check of one date or a sequence of dates."""
+    if calendar is None:
+        calendar = get_busdaycalendar()
+    result = np.is_busday(_to_datetime64(dates), busdaycal=calendar)
+    return bool(result) if np.ndim(result) == 0 else result
+
+
+def build_year_mask(year):
+    """Compute the '1'/'0' business-day mask string for a calendar year."""
+    days = np.arange(np.datetime64(f'{year}-01-01'), np.datetime64(f'{year + 1}-01-01'))
+    mask = is_business_day(days)
+    return ''.join('1' if flag else '0' for flag in mask)
+
+
+def rebuild_work_calendar(year):
+    """Recompute and store the precomputed mask for `year`."""
+    from .models import WorkCalendar
+
+    mask = build_year_mask(year)
+    calendar, _ = WorkCalendar.objects.update_or_create(
+        year=year,
+        defaults={
+            'weekmask': get_weekmask(),
+            'business_day_mask': mask,
+            'working_days': mask.count('1'),
+        },
+    )
+    return calendar
+
+
+def is_stored_year(year):
+    """Whether `year` lies in the window of calendars kept in WorkCalendar."""
+    from django.utils import timezone
+
+    current = timezone.localdate().year
+    return current - settings.WORK_CALENDAR_PAST_YEARS <= year <= current + settings.WORK_CALENDAR_FUTURE_YEARS
+
+
+def get_work_calendar(year):
+    """
+    Return the calendar for `year`. Years in the stored window are built and
+    saved on first use; others are computed in memory and never written.
+    """
+    from .models import WorkCalendar
+
+    calendar = WorkCalendar.objects.filter(year=year).first()
+    if calendar is None or calendar.weekmask != get_weekmask():
+        if is_stored_year(year):
+            return rebuild_work_calendar(year)
+        mask = build_year_mask(year)
+        calendar = WorkCalendar(year=year, weekmask=get_weekmask(), business_day_mask=mask,
+                                working_days=mask.count('1'))
+    return calendar
+
+
+def get_year_mask(year):
+    """Return the business-day mask for `year` as a boolean array."""
+    mask = get_work_calendar(year).business_day_mask
+    return np.frombuffer(mask.encode(), dtype=np.uint8) == ord('1')
+
+
+def get_range_mask(start, end):
+    """Business-day flags for every day in [start, end], sliced from the stored year masks."""
+    mask = np.concatenate([get_year_mask(year) for year in range(start.year, end.year + 1)])
+    offset = (start - date(start.year, 1, 1)).days
+    return mask[offset:offset + (end - start).days + 1]
+
+
+class RangeCalendar:
+    """
+    Working-day lookups inside one [start, end] window, answered from the
+    precomputed masks: a day is an index into the mask and a count is a
+    difference of its cumulative sums, so neither walks the days in between.
+    """
+
+    def __init__(self, start, end):
+        self.origin = np.datetime64(start, 'D')
+        self.mask = get_range_mask(start, end)
+        self.cumulative = np.concatenate(([0], np.cumsum(self.mask)))
+
+    @property
+    def working_days(self):
+        return int(self.cumulative[-1])
+
+    def _offsets(self, dates):
+        offsets = (_to_datetime64(dates) - self.origin).astype(np.int64)
+        # numpy would wrap negative indexes around instead of failing
+        if np.any(offsets < 0) or np.any(offsets >= len(self.mask)):
+            raise ValueError('Dates must lie inside the calendar window.')
+        return offsets
+
+    def is_business_day(self, dates):
+        """Vectorized check of dates inside the window."""
+        return self.mask[self._offsets(dates)]
+
+    def count(self, starts, ends):
+        """Working days of inclusive [starts, ends] periods inside the window (vectorized)."""
+        return self.cumulative[self._offsets(ends) + 1] - self.cumulative[self._offsets(starts)]
+
+    def business_days(self):
+        """The window's working days as a datetime64[D] array."""
+        return self.origin + np.flatnonzero(self.mask)
+
+
+def month_bounds(day=None):
+    """First and last day of the month containing `day` (defaults to today)."""
+    from django.utils import timezone
+
+    day = day or timezone.localdate()
+    first = day.replace(day=1)
+    next_month = (first + timedelta(days=32)).replace(day=1)
+    return first, next_month - timedelta(days=1)
+
+
+def to_date(value):
+    """Convert a numpy datetime64[D] scalar back to `datetime.date`."""
+    return date.fromisoformat(str(value))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from projects.visibility import rebuild_visibility
+
+
+class Command(BaseCommand):
+    help = "Recompute the team-lead visibility ACL from current team leads and members."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--team', type=int, action='append', dest='teams',
+                            help='Only rebuild rows for this team ID (repeatable).')
+
+    def handle(self, *args, **options):
+        count = rebuild_visibility(team_ids=options['teams'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} user visibility rows."))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.8 on 2026-10-19 02:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate(apps, schema_editor):
+    Team = apps.get_model('projects', 'Team')
+    UserVisibility = apps.get_model('projects', 'UserVisibility')
+    Membership = Team.members.through
+
+    rows = [
+        UserVisibility(viewer_id=lead_id, visible_user_id=user_id, via_team_id=team_id)
+        for team_id, user_id, lead_id in Membership.objects.filter(
+            team__team_lead__isnull=False
+        ).values_list('team_id', 'user_id', 'team__team_lead_id')
+        if user_id != lead_id
+    ]
+    UserVisibility.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_remove_task_assigned_to'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserVisibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('via_team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='projects.team')),
+                ('viewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('visible_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('viewer', 'visible_user', 'via_team'), name='unique_user_visibility')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -14,6 +14,29 @@ class Team(models.Model):
     class Meta:
         ordering = ['-created_at']
 
+class UserVisibility(models.Model):
+    """
+    Materialized "viewer may see visible_user's records" pairs: a team lead
+    sees the members of each team they lead. Kept in sync by
+    `projects.visibility` on membership and lead changes, so scoping a
+    queryset is one indexed semi-join instead of walking teams per request.
+    """
+    viewer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    visible_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    via_team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        constraints = [
+            # Leads with viewer_id, so `visible_user_id IN (... WHERE viewer_id = ?)` is index-only
+            models.UniqueConstraint(
+                fields=['viewer', 'visible_user', 'via_team'],
+                name='unique_user_visibility',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.viewer_id} -> {self.visible_user_id} (team {self.via_team_id})"
+
 class Project(models.Model):
     STATUS_CHOICES = [
         ('not_started', 'Not Started'),
@@ -1,10 +1,69 @@
 from rest_framework import serializers
 from django.utils import timezone
-from datetime import date
-from django.db.models import Sum
+from datetime import date, timedelta
+from django.db.models import Count, DurationField, IntegerField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from .models import Team, Project, Task
 from timesheet.models import TimeEntry
+from timesheet.archive import archive_totals_queryset, archived_project_totals, summarize_archives
 from django.db import models
+from accounts.avatars import profile_picture_url
+from config.sparse import FieldSelection, SparseFieldsMixin
+
+
+TEAM_MEMBER_FIELDS = [
+    'id', 'full_name', 'username', 'email', 'role', 'designation',
+    'profile_picture', 'profile_picture_hash',
+]
+
+
+def prefetch_team_details(queryset, prefix=''):
+    """
+    Load what TeamSerializer displays in bulk: the lead via a join and the
+    members (displayed columns only) via one prefetch query.
+    `prefix` is the lookup path to the team, e.g. 'team__' for projects.
+    """
+    from accounts.models import User
+    return queryset.select_related(f'{prefix}team_lead').prefetch_related(
+        models.Prefetch(f'{prefix}members', queryset=User.objects.only(*TEAM_MEMBER_FIELDS))
+    )
+
+
+def _is_employee(user):
+    return hasattr(user, 'role') and user.role == 'employee'
+
+
+def annotate_project_stats(queryset, request):
+    """
+    Annotate the task/time statistics the response shows as correlated
+    subqueries: one query per page instead of one per project and field, and
+    unaffected by the visibility joins of ProjectViewSet.
+    """
+    selection = FieldSelection(request)
+    entries = TimeEntry.objects.filter(project=OuterRef('pk')).order_by().values('project')
+
+    def count(**filters):
+        counts = entries.filter(**filters).annotate(count=Count('pk')).values('count')
+        return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+    annotations = {}
+    if selection.wants('total_tasks'):
+        annotations['_total_tasks'] = count()
+    if selection.wants('completed_tasks'):
+        annotations['_completed_tasks'] = count(status='completed')
+    if selection.wants('in_progress_tasks'):
+        annotations['_in_progress_tasks'] = count(status='in_progress')
+    if selection.wants('total_time') and request is not None:
+        own = entries.filter(user=request.user) if _is_employee(request.user) else entries
+        annotations['_total_duration'] = Subquery(
+            own.annotate(total=Sum('duration')).values('total'), output_field=DurationField()
+        )
+    if selection.wants('total_time', 'total_tasks', 'completed_tasks', 'in_progress_tasks', 'user_time_breakdown'):
+        # Archived months for the whole page in one query
+        queryset = queryset.prefetch_related(
+            models.Prefetch('time_entry_archives', queryset=archive_totals_queryset(), to_attr='_archives')
+        )
+    return queryset.annotate(**annotations)
 
 
 class TeamSerializer(serializers.ModelSerializer):
@@ -15,6 +74,11 @@ class TeamSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at']
 
     def to_representation(self, instance):
+        # Reuse one payload per team within a response (e.g. many projects of one team)
+        payloads = self.context.setdefault('_team_payloads', {})
+        if instance.pk in payloads:
+            return payloads[instance.pk]
+
         response = super().to_representation(instance)
         
         # Team Lead Details
@@ -25,12 +89,14 @@ class TeamSerializer(serializers.ModelSerializer):
                 'username': instance.team_lead.username, 
                 'email': instance.team_lead.email,
                 'role': instance.team_lead.role,
+                'profile_picture': profile_picture_url(instance.team_lead, 'sm', self.context),
 
             }
         
-        # Members Details
+        # Members Details (served from the prefetch cache when available)
+        members = list(instance.members.all())
         members_data = []
-        for member in instance.members.all():
+        for member in members:
             members_data.append({
                 'id': member.id,
                 'full_name': member.full_name,
@@ -38,20 +104,22 @@ class TeamSerializer(serializers.ModelSerializer):
                 'email': member.email,
                 'role': member.role,
                 'designation': member.designation,
+                'profile_picture': profile_picture_url(member, 'sm', self.context),
 
             })
         response['members'] = members_data
         
         # Team Count (team lead + members)
-        team_count = instance.members.count()
+        team_count = len(members)
         if instance.team_lead:
             team_count += 1
         response['team_count'] = team_count
         
+        payloads[instance.pk] = response
         return response
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     team_name = serializers.SerializerMethodField(read_only=True)
     total_time = serializers.SerializerMethodField(read_only=True)
     total_tasks = serializers.SerializerMethodField(read_only=True)
@@ -67,19 +135,35 @@ class ProjectSerializer(serializers.ModelSerializer):
     def get_team_name(self, obj):
         return obj.team.name if obj.team else None
 
+    def _archived_totals(self, obj):
+        """Per-user totals of archived time entries, prefetched by annotate_project_stats."""
+        cache = self.context.setdefault('_archived_project_totals', {})
+        if obj.pk not in cache:
+            if hasattr(obj, '_archives'):
+                cache[obj.pk] = summarize_archives(obj._archives)
+            else:
+                cache[obj.pk] = archived_project_totals(obj.pk)
+        return cache[obj.pk]
+
     def get_total_time(self, obj):
         request = self.context.get('request')
         if not request or not hasattr(request, 'user'):
             return "0h 0m"
 
         user = request.user
-        time_entries = TimeEntry.objects.filter(project=obj)
-
-        if hasattr(user, 'role') and user.role == 'employee':
-            time_entries = time_entries.filter(user=user)
+        if hasattr(obj, '_total_duration'):
+            total_duration = obj._total_duration
+        else:
+            time_entries = TimeEntry.objects.filter(project=obj)
+            if _is_employee(user):
+                time_entries = time_entries.filter(user=user)
+            total_duration = time_entries.aggregate(total=Sum('duration'))['total']
         
-        # Calculate total duration
-        total_duration = time_entries.aggregate(total=Sum('duration'))['total']
+        # Calculate total duration (hot entries plus archived months)
+        total_duration = total_duration or timedelta(0)
+        for row in self._archived_totals(obj):
+            if not _is_employee(user) or row['user_id'] == user.id:
+                total_duration += row['duration'] or timedelta(0)
         
         if total_duration:
             total_seconds = int(total_duration.total_seconds())
@@ -89,15 +173,24 @@ class ProjectSerializer(serializers.ModelSerializer):
         
         return "0h 0m"
 
+    def _entry_count(self, obj, annotation, **filters):
+        """Annotated by the viewset; counted per project otherwise."""
+        if hasattr(obj, annotation):
+            return getattr(obj, annotation)
+        return TimeEntry.objects.filter(project=obj, **filters).count()
+
     def get_total_tasks(self, obj):
-        return TimeEntry.objects.filter(project=obj).count()
+        archived = sum(row['entries'] for row in self._archived_totals(obj))
+        return self._entry_count(obj, '_total_tasks') + archived
 
     def get_completed_tasks(self, obj):
-        return TimeEntry.objects.filter(project=obj, status='completed').count()
+        archived = sum(row['completed'] for row in self._archived_totals(obj))
+        return self._entry_count(obj, '_completed_tasks', status='completed') + archived
 
     def get_in_progress_tasks(self, obj):
         """Return number of in-progress time entries (tasks) for this project."""
-        return TimeEntry.objects.filter(project=obj, status='in_progress').count()
+        archived = sum(row['entries'] - row['completed'] for row in self._archived_totals(obj))
+        return self._entry_count(obj, '_in_progress_tasks', status='in_progress') + archived
 
     def get_user_time_breakdown(self, obj):
         """Return time breakdown per user for this project."""
@@ -109,26 +202,36 @@ class ProjectSerializer(serializers.ModelSerializer):
             total_duration=Sum('duration')
         ).order_by('-total_duration')
         
-        breakdown = []
+        # Merge hot and archived durations per user
+        totals = {}
         for entry in user_times:
-            if entry['total_duration']:
-                total_seconds = int(entry['total_duration'].total_seconds())
+            totals[entry['user__id']] = [entry['user__full_name'], entry['user__email'], entry['total_duration'] or timedelta(0)]
+        for row in self._archived_totals(obj):
+            total = totals.setdefault(row['user_id'], [row['user__full_name'], row['user__email'], timedelta(0)])
+            total[2] += row['duration'] or timedelta(0)
+        
+        breakdown = []
+        for user_id, (full_name, email, total_duration) in totals.items():
+            if total_duration:
+                total_seconds = int(total_duration.total_seconds())
                 hours = total_seconds // 3600
                 minutes = (total_seconds % 3600) // 60
                 breakdown.append({
-                    'user_id': entry['user__id'],
-                    'user_name': entry['user__full_name'],
-                    'user_email': entry['user__email'],
+                    'user_id': user_id,
+                    'user_name': full_name,
+                    'user_email': email,
                     'total_time': f"{hours}h {minutes}m",
                     'total_seconds': total_seconds
                 })
         
+        breakdown.sort(key=lambda item: item['total_seconds'], reverse=True)
         return breakdown
 
     def to_representation(self, instance):
         response = super().to_representation(instance)
-        if instance.team:
-            response['team'] = TeamSerializer(instance.team).data
+        # Sparse responses keep the team ID unless ?expand=team
+        if 'team' in response and instance.team_id and self.selection.expands('team'):
+            response['team'] = TeamSerializer(instance.team, context=self.context).data
         return response
 
 
@@ -0,0 +1,68 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from config.etags import invalidate
+from .models import Project, Team
+from .visibility import rebuild_visibility
+
+
+def invalidate_teams(team_ids):
+    """Teams are embedded in their projects' payloads, so those change too."""
+    team_ids = list(team_ids)
+    project_ids = Project.objects.filter(team_id__in=team_ids).values_list('id', flat=True)
+    invalidate(team_ids=team_ids, project_ids=list(project_ids))
+
+
+@receiver([post_save, post_delete], sender=Team)
+def invalidate_team_etags(sender, instance, **kwargs):
+    invalidate_teams([instance.pk])
+
+
+@receiver(pre_save, sender=Team)
+def detect_team_lead_change(sender, instance, update_fields=None, raw=False, **kwargs):
+    instance._team_lead_changed = False
+    if raw or instance.pk is None or (update_fields is not None and 'team_lead' not in update_fields):
+        return
+    previous = Team.objects.filter(pk=instance.pk).values_list('team_lead_id', flat=True).first()
+    instance._team_lead_changed = previous != instance.team_lead_id
+
+
+@receiver(post_save, sender=Team)
+def rebuild_team_visibility(sender, instance, created, **kwargs):
+    # A new team has no members yet; deletes cascade to its rows
+    if not created and getattr(instance, '_team_lead_changed', False):
+        rebuild_visibility([instance.pk])
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+def rebuild_team_members_visibility(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            rebuild_visibility([instance.pk])
+    elif action == 'pre_clear':
+        # instance is a user; capture its teams before they are detached
+        instance._cleared_team_ids = list(instance.teams.values_list('id', flat=True))
+    elif action == 'post_clear':
+        rebuild_visibility(getattr(instance, '_cleared_team_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        rebuild_visibility(pk_set)
+
+
+@receiver(m2m_changed, sender=Team.members.through)
+def invalidate_team_members_etags(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            invalidate_teams([instance.pk])
+    elif action == 'pre_clear':
+        # instance is a user; capture its teams before they are detached
+        invalidate_teams(instance.teams.values_list('id', flat=True))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_teams(pk_set)
+
+
+@receiver([post_save, pre_delete], sender=Project)
+def invalidate_project_etags(sender, instance, created=False, **kwargs):
+    # Time entry payloads show the project name, so their owners' lists change
+    # too; on delete, read them before the entries' project is set to NULL
+    user_ids = [] if created else instance.time_entries.values_list('user_id', flat=True).distinct()
+    invalidate(user_ids=user_ids, team_ids=[instance.team_id], project_ids=[instance.pk])
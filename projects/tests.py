@@ -1,3 +1,78 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from timesheet.archive import archive_time_entries
+from timesheet.models import TimeEntry
+from .models import Project, Team
+
+
+class ProjectArchivedStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='pw', full_name='Admin', role='admin')
+        team = Team.objects.create(name='Core', team_lead=cls.admin)
+        start = timezone.now().replace(year=2024, month=3, day=4, hour=9)
+        for name in ('Apollo', 'Gemini', 'Mercury'):
+            project = Project.objects.create(name=name, team=team)
+            for status in ('completed', 'in_progress'):
+                TimeEntry.objects.create(
+                    user=cls.admin, task=name, project=project, start_time=start,
+                    end_time=start + timedelta(hours=1), status=status)
+        archive_time_entries(before=timezone.localdate())
+
+    def test_list_reads_archives_in_one_query(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/projects/projects/')
+        self.assertEqual(response.status_code, 200)
+
+        archive_queries = [query for query in queries if 'timesheet_timeentryarchive' in query['sql']]
+        self.assertEqual(len(archive_queries), 1)
+        for project in response.data:
+            self.assertEqual(project['total_tasks'], 2)
+            self.assertEqual(project['completed_tasks'], 1)
+            self.assertEqual(project['total_time'], '2h 0m')
+            self.assertEqual(project['user_time_breakdown'][0]['total_seconds'], 7200)
+
+
+class TeamLeadTaskVisibilityTests(TestCase):
+    """Team leads see the entries on their teams' projects, whoever logged them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.lead = User.objects.create_user(
+            username='lead', email='lead@example.com', password='pw', full_name='Lead', role='team_lead')
+        member = User.objects.create_user(
+            username='member', email='member@example.com', password='pw', full_name='Member', role='employee')
+        outsider = User.objects.create_user(
+            username='outsider', email='outsider@example.com', password='pw', full_name='Outsider', role='employee')
+        team = Team.objects.create(name='Core', team_lead=cls.lead)
+        team.members.add(member)
+        other_team = Team.objects.create(name='Other', team_lead=outsider)
+        own_project = Project.objects.create(name='Apollo', team=team)
+        other_project = Project.objects.create(name='Gemini', team=other_team)
+
+        start = timezone.now() - timedelta(hours=2)
+        for user, project, task in (
+            (outsider, own_project, 'visible'),
+            (member, other_project, 'other team'),
+            (member, None, 'no project'),
+        ):
+            TimeEntry.objects.create(
+                user=user, task=task, project=project, start_time=start,
+                end_time=start + timedelta(hours=1), status='completed')
 
-# Create your tests here.
+    def test_lead_task_list(self):
+        client = APIClient()
+        client.force_authenticate(self.lead)
+        response = client.get('/api/v1/projects/tasks/')
+        self.assertEqual([entry['task'] for entry in response.data], ['visible'])
@@ -1,12 +1,18 @@
 from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db import models
+from config.etags import ALL_SCOPE, ConditionalGetMixin, project_scope, team_scope, user_scope
+from config.rows import FastListMixin
 from .models import Team, Project, Task
-from .serializers import TeamSerializer, ProjectSerializer, TaskSerializer
+from config.sparse import FieldSelection
+from .serializers import (
+    TeamSerializer, ProjectSerializer, TaskSerializer, annotate_project_stats, prefetch_team_details,
+)
 from .permissions import TeamPermission, ProjectPermission, TaskPermission
+from .visibility import lead_team_ids
 
 
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Team model.
     Provides CRUD operations for teams with role-based permissions.
@@ -20,6 +26,20 @@ class TeamViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'name']
     ordering = ['-created_at']
 
+    def get_etag_scopes(self):
+        if self.action == 'retrieve':
+            pk = self.get_object_key()
+            return [team_scope(pk)] if pk is not None else None
+        user = self.request.user
+        if not hasattr(user, 'role'):
+            return None
+        if user.role == 'admin':
+            return [ALL_SCOPE]
+        team_ids = Team.objects.filter(
+            models.Q(team_lead=user) | models.Q(members=user)
+        ).values_list('id', flat=True).distinct()
+        return [team_scope(team_id) for team_id in team_ids]
+
     def get_queryset(self):
         """
         Filter queryset based on user role.
@@ -27,7 +47,7 @@ class TeamViewSet(viewsets.ModelViewSet):
         - Team Lead: sees teams they lead or are members of
         - Employee: sees only teams they are members of
         """
-        queryset = super().get_queryset()
+        queryset = prefetch_team_details(super().get_queryset())
         user = self.request.user
         
         # Admin sees all teams
@@ -47,7 +67,7 @@ class TeamViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for Project model.
     Provides CRUD operations for projects with role-based permissions.
@@ -62,6 +82,22 @@ class ProjectViewSet(viewsets.ModelViewSet):
     ordering_fields = ['created_at', 'deadline', 'name']
     ordering = ['-created_at']
 
+    def get_etag_scopes(self):
+        if self.action == 'retrieve':
+            pk = self.get_object_key()
+            return [project_scope(pk)] if pk is not None else None
+        user = self.request.user
+        if not hasattr(user, 'role'):
+            return None
+        if user.role == 'admin':
+            return [ALL_SCOPE]
+        scopes = set()
+        for project_id, team_id in Project.objects.filter(
+            models.Q(team__team_lead=user) | models.Q(team__members=user)
+        ).values_list('id', 'team_id').distinct():
+            scopes.update([project_scope(project_id), team_scope(team_id)])
+        return list(scopes)
+
     def get_queryset(self):
         """
         Filter queryset based on user role.
@@ -69,7 +105,12 @@ class ProjectViewSet(viewsets.ModelViewSet):
         - Team Lead: sees projects for teams they lead or are members of
         - Employee: sees projects for teams they are members of
         """
-        queryset = super().get_queryset()
+        queryset = annotate_project_stats(super().get_queryset(), self.request)
+        selection = FieldSelection(self.request)
+        if selection.expands('team'):
+            queryset = prefetch_team_details(queryset.select_related('team'), prefix='team__')
+        elif selection.wants('team_name'):
+            queryset = queryset.select_related('team')
         user = self.request.user
         
         # Admin sees all projects
@@ -90,21 +131,38 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
 
 from timesheet.models import TimeEntry
-from timesheet.serializers import TimeEntrySerializer
+from timesheet.serializers import TimeEntrySerializer, TimeEntryRowReader, with_project_details
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for Task model (Now served by TimeEntry).
     Provides CRUD operations for tasks (time entries) with role-based permissions.
     """
     queryset = TimeEntry.objects.all()
     serializer_class = TimeEntrySerializer
+    row_reader_class = TimeEntryRowReader
     permission_classes = [TaskPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'project', 'user']
     search_fields = ['task', 'project__name']
     ordering_fields = ['start_time', 'date', 'status']
     ordering = ['-start_time']
+    # Running timers report elapsed minutes
+    etag_time_bucket = 60
+
+    def get_etag_scopes(self):
+        user = self.request.user
+        if not hasattr(user, 'role'):
+            return None
+        if user.role == 'admin':
+            return [ALL_SCOPE]
+        if user.role == 'team_lead':
+            # Entry writes bump their project; membership changes bump the team
+            scopes = set()
+            for project_id, team_id in Project.objects.filter(team_id__in=lead_team_ids(user)).values_list('id', 'team_id'):
+                scopes.update([project_scope(project_id), team_scope(team_id)])
+            return list(scopes)
+        return [user_scope(user.id)]
 
     def get_queryset(self):
         """
@@ -113,22 +171,20 @@ class TaskViewSet(viewsets.ModelViewSet):
         - Team Lead: sees all time entries for projects in teams they lead or are members of
         - Employee: sees only their own time entries
         """
-        queryset = super().get_queryset()
+        queryset = with_project_details(super().get_queryset(), self.request)
         user = self.request.user
         
         # Admin sees all time entries
         if hasattr(user, 'role') and user.role == 'admin':
             return queryset
         
-        # Team Lead sees all time entries for projects in teams they lead or are members of
+        # Team Lead: one semi-join on their teams instead of a distinct join
         if hasattr(user, 'role') and user.role == 'team_lead':
-            return queryset.filter(
-                models.Q(project__team__team_lead=user) | models.Q(project__team__members=user)
-            ).distinct()
+            return queryset.filter(project__team_id__in=lead_team_ids(user))
         
         # Employee sees only their own time entries
         if hasattr(user, 'role') and user.role == 'employee':
-            return queryset.filter(user=user).distinct()
+            return queryset.filter(user=user)
         
         return queryset
 
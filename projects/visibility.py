@@ -0,0 +1,78 @@
+"""
+Team-lead visibility ACL.
+
+`UserVisibility` holds one (viewer, visible_user, via_team) row per member of
+each team with a lead. Team saves and membership changes rebuild the rows of
+the affected teams (see `projects.signals`); deleting a team or user cascades.
+Leave lists and approvals are then scoped with one indexed semi-join instead
+of walking the viewer's teams on every request. The ACL only makes these
+existing rules cheaper: attendance stays own-only for non-admins, and team
+leads see the time entries of their teams' projects (`lead_team_ids`).
+"""
+from django.db import models, transaction
+
+from config.enums import UserRole
+from .models import Team, UserVisibility
+
+
+def rebuild_visibility(team_ids=None):
+    """
+    Recompute the ACL rows of `team_ids` (every team when None).
+    Returns the number of rows written.
+    """
+    memberships = Team.members.through.objects.filter(team__team_lead__isnull=False)
+    stale = UserVisibility.objects.all()
+    if team_ids is not None:
+        team_ids = list(team_ids)
+        memberships = memberships.filter(team_id__in=team_ids)
+        stale = stale.filter(via_team_id__in=team_ids)
+
+    rows = [
+        UserVisibility(viewer_id=lead_id, visible_user_id=user_id, via_team_id=team_id)
+        for team_id, user_id, lead_id in memberships.values_list('team_id', 'user_id', 'team__team_lead_id')
+        if user_id != lead_id
+    ]
+    with transaction.atomic():
+        stale.delete()
+        UserVisibility.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def lead_team_ids(user):
+    """
+    Subquery of the teams `user` leads or belongs to. Team leads see the time
+    entries of these teams' projects, whoever logged them.
+    """
+    return Team.objects.filter(models.Q(team_lead=user) | models.Q(members=user)).values('id')
+
+
+def sees_team_members(user):
+    """Only team leads get their members' records; admins see everything anyway."""
+    return user.role == UserRole.TEAM_LEAD
+
+
+def visible_user_ids(user):
+    """
+    IDs of users whose records `user` may see, themselves included.
+    Returns None for admins (no restriction).
+    """
+    if user.role == UserRole.ADMIN:
+        return None
+    user_ids = {user.id}
+    if sees_team_members(user):
+        user_ids.update(
+            UserVisibility.objects.filter(viewer_id=user.id).values_list('visible_user_id', flat=True)
+        )
+    return sorted(user_ids)
+
+
+def scope_to_visible_users(queryset, user, field='user'):
+    """Limit `queryset` to records whose `field` is a user `user` may see."""
+    if user.role == UserRole.ADMIN:
+        return queryset
+    condition = models.Q(**{field: user.id})
+    if sees_team_members(user):
+        condition |= models.Q(**{
+            f'{field}__in': UserVisibility.objects.filter(viewer_id=user.id).values('visible_user_id'),
+        })
+    return queryset.filter(condition)
@@ -1,11 +1,14 @@
 from django.contrib import admin
+
+from config.admin import AutocompleteFilter, HighVolumeAdmin
 from .models import TimeEntry
 
 
 @admin.register(TimeEntry)
-class TimeEntryAdmin(admin.ModelAdmin):
+class TimeEntryAdmin(HighVolumeAdmin):
     list_display = ['user', 'task', 'project', 'start_time', 'end_time', 'duration', 'is_running', 'status']
-    list_filter = ['is_running', 'status', 'date', 'project']
+    list_filter = ['is_running', 'status', 'date', ('project', AutocompleteFilter), ('user', AutocompleteFilter)]
+    list_select_related = ['user', 'project']
     search_fields = ['user__email', 'user__full_name', 'task']
     date_hierarchy = 'date'
     readonly_fields = ['duration', 'date']
@@ -0,0 +1,139 @@
+"""
+Archival of closed time-entry months.
+
+Finished entries older than the cutoff are folded into one `TimeEntryArchive`
+row per user, project and month and removed from the hot table. Entry counts
+and durations are stored on the archive row, so project statistics union
+them with a small aggregate instead of scanning history.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from config.archive import archive_in_batches, month_start
+from .models import TimeEntry, TimeEntryArchive
+
+
+def _entry(entry):
+    return {
+        'id': entry.id,
+        'task': entry.task,
+        'date': entry.date.isoformat(),
+        'start_time': entry.start_time.isoformat(),
+        'end_time': entry.end_time.isoformat() if entry.end_time else None,
+        'duration': entry.duration.total_seconds() if entry.duration else None,
+        'status': entry.status,
+    }
+
+
+ARCHIVE_FIELDS = ['entries', 'entry_count', 'completed_count', 'total_duration', 'archived_at']
+
+
+def _merge_entries(archive, entries):
+    """Add `entries` to `archive`, replacing any with the same id, and recompute its totals."""
+    by_id = {entry['id']: entry for entry in archive.entries}
+    by_id.update((entry['id'], entry) for entry in entries)
+    archive.entries = sorted(by_id.values(), key=lambda entry: entry['start_time'])
+    archive.entry_count = len(archive.entries)
+    archive.completed_count = sum(1 for entry in archive.entries if entry['status'] == 'completed')
+    archive.total_duration = timedelta(seconds=sum(entry['duration'] or 0 for entry in archive.entries))
+
+
+def _archive_batch(ids):
+    grouped = defaultdict(list)
+    for entry in TimeEntry.objects.filter(id__in=ids):
+        grouped[(entry.user_id, entry.project_id, month_start(entry.date))].append(_entry(entry))
+
+    existing = {
+        (archive.user_id, archive.project_id, archive.month): archive
+        for archive in TimeEntryArchive.objects.select_for_update().filter(
+            user_id__in={key[0] for key in grouped},
+            month__in={key[2] for key in grouped},
+        )
+    }
+    created, updated = [], []
+    for (user_id, project_id, month), entries in grouped.items():
+        archive = existing.get((user_id, project_id, month))
+        if archive is None:
+            archive = TimeEntryArchive(user_id=user_id, project_id=project_id, month=month)
+            created.append(archive)
+        else:
+            updated.append(archive)
+        _merge_entries(archive, entries)
+
+    TimeEntryArchive.objects.bulk_create(created)
+    TimeEntryArchive.objects.bulk_update(updated, ARCHIVE_FIELDS)
+
+
+def archive_time_entries(before, batch_size=500):
+    """
+    Archive stopped time entries dated before `before` (a month start).
+    Running entries stay in the hot table. Returns entries archived.
+    """
+    queryset = TimeEntry.objects.filter(date__lt=month_start(before), is_running=False)
+    return archive_in_batches(queryset, _archive_batch, batch_size)
+
+
+def detach_project_archives(project_id):
+    """
+    Fold a project's archives into each user's no-project archive of the same
+    month, the way its live entries lose their project when it is deleted.
+    Setting the rows' project to NULL directly would clash with an existing
+    no-project row for that user and month.
+    """
+    archives = list(TimeEntryArchive.objects.select_for_update().filter(project_id=project_id))
+    if not archives:
+        return
+    targets = {
+        (archive.user_id, archive.month): archive
+        for archive in TimeEntryArchive.objects.select_for_update().filter(
+            project__isnull=True,
+            user_id__in={archive.user_id for archive in archives},
+            month__in={archive.month for archive in archives},
+        )
+    }
+    moved, merged, folded_ids = [], [], []
+    for archive in archives:
+        target = targets.get((archive.user_id, archive.month))
+        if target is None:
+            archive.project = None
+            moved.append(archive)
+        else:
+            _merge_entries(target, archive.entries)
+            merged.append(target)
+            folded_ids.append(archive.id)
+
+    TimeEntryArchive.objects.filter(id__in=folded_ids).delete()
+    TimeEntryArchive.objects.bulk_update(moved, ['project'])
+    TimeEntryArchive.objects.bulk_update(merged, ARCHIVE_FIELDS)
+
+
+def archive_totals_queryset():
+    """Archive rows with their owner's name and email, without the entries."""
+    return TimeEntryArchive.objects.select_related('user').only(
+        'project', 'user__full_name', 'user__email', 'entry_count', 'completed_count', 'total_duration'
+    ).order_by()
+
+
+def summarize_archives(archives):
+    """Per-user totals of archive rows: entries, completed and duration."""
+    totals = {}
+    for archive in archives:
+        row = totals.get(archive.user_id)
+        if row is None:
+            row = totals[archive.user_id] = {
+                'user_id': archive.user_id,
+                'user__full_name': archive.user.full_name,
+                'user__email': archive.user.email,
+                'entries': 0,
+                'completed': 0,
+                'duration': timedelta(0),
+            }
+        row['entries'] += archive.entry_count
+        row['completed'] += archive.completed_count
+        row['duration'] += archive.total_duration
+    return list(totals.values())
+
+
+def archived_project_totals(project_id):
+    """Per-user archived totals for a project: entries, completed and duration."""
+    return summarize_archives(archive_totals_queryset().filter(project_id=project_id))
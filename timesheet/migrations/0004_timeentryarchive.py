@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-19 01:15
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from config.postgres import RunPostgresSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0007_remove_task_assigned_to'),
+        ('timesheet', '0003_remove_timeentry_related_task_timeentry_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeEntryArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the archived month')),
+                ('entries', models.JSONField(default=list)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('completed_count', models.PositiveIntegerField(default=0)),
+                ('total_duration', models.DurationField(default=datetime.timedelta(0))),
+                ('archived_at', models.DateTimeField(auto_now=True)),
+                ('project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='time_entry_archives', to='projects.project')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entry_archives', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-month'],
+                'indexes': [models.Index(fields=['project', 'user'], name='timesheet_t_project_1b2230_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'project', 'month'), name='unique_time_entry_archive'), models.UniqueConstraint(condition=models.Q(('project__isnull', True)), fields=('user', 'month'), name='unique_time_entry_archive_no_project')],
+            },
+        ),
+        # Time entries are inserted roughly in date order, so a BRIN index
+        # serves date-range scans over history at a fraction of a btree's size
+        RunPostgresSQL(
+            sql="CREATE INDEX IF NOT EXISTS timeentry_date_brin_idx ON timesheet_timeentry USING brin (date)",
+            reverse_sql="DROP INDEX IF EXISTS timeentry_date_brin_idx",
+        ),
+    ]
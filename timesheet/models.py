@@ -54,3 +54,39 @@ class TimeEntry(models.Model):
             self.calculate_duration()
         
         super().save(*args, **kwargs)
+
+
+class TimeEntryArchive(models.Model):
+    """
+    A user's finished time entries on one project for a closed month, moved
+    out of the hot table by `manage.py archive_time_data`. Totals are kept
+    alongside so project statistics never need to read `entries`.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='time_entry_archives')
+    project = models.ForeignKey('projects.Project', on_delete=models.SET_NULL, null=True, blank=True, related_name='time_entry_archives')
+    month = models.DateField(help_text='First day of the archived month')
+    entries = models.JSONField(default=list)
+    entry_count = models.PositiveIntegerField(default=0)
+    completed_count = models.PositiveIntegerField(default=0)
+    total_duration = models.DurationField(default=timedelta(0))
+    archived_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'project', 'month'],
+                name='unique_time_entry_archive',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'month'],
+                condition=models.Q(project__isnull=True),
+                name='unique_time_entry_archive_no_project',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['project', 'user']),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.project_id} - {self.month:%Y-%m} (archived)"
@@ -1,17 +1,35 @@
 from rest_framework import serializers
 from django.utils import timezone
 from datetime import datetime
+from config.rows import RowReader
+from config.sparse import FieldSelection, SparseFieldsMixin
 from .models import TimeEntry
 
 
-class TimeEntrySerializer(serializers.ModelSerializer):
+def with_project_details(queryset, request):
+    """Join the project only if the (possibly sparse) response shows its name."""
+    if FieldSelection(request).wants('project_name', 'project_details'):
+        return queryset.select_related('project')
+    return queryset
+
+
+def format_minutes(total_minutes):
+    """Format minutes as 'Xh Ym', or 'Ym' under an hour"""
+    hours = total_minutes // 60
+    minutes = total_minutes % 60
+    if hours > 0:
+        return f"{hours}h {minutes}m"
+    return f"{minutes}m"
+
+
+class TimeEntrySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for TimeEntry model with camelCase transformation.
     """
     # Additional read-only fields for response
-    user_id = serializers.IntegerField(source='user.id', read_only=True)
+    user_id = serializers.IntegerField(read_only=True)
     task_description = serializers.CharField(source='task', read_only=True)
-    project_id = serializers.IntegerField(source='project.id', read_only=True, allow_null=True)
+    project_id = serializers.IntegerField(read_only=True, allow_null=True)
     project_name = serializers.CharField(source='project.name', read_only=True, allow_null=True)
     project_details = serializers.SerializerMethodField(read_only=True)
     duration_formatted = serializers.SerializerMethodField(read_only=True)
@@ -67,20 +85,10 @@ class TimeEntrySerializer(serializers.ModelSerializer):
     def get_duration_formatted(self, obj):
         """Format duration as 'Xh Ym' or minutes"""
         if obj.duration:
-            total_minutes = int(obj.duration.total_seconds() / 60)
-            hours = total_minutes // 60
-            minutes = total_minutes % 60
-            if hours > 0:
-                return f"{hours}h {minutes}m"
-            return f"{minutes}m"
+            return format_minutes(int(obj.duration.total_seconds() / 60))
         elif obj.is_running:
             # Calculate elapsed time for running timer
-            elapsed = obj.elapsed_minutes
-            hours = elapsed // 60
-            minutes = elapsed % 60
-            if hours > 0:
-                return f"{hours}h {minutes}m"
-            return f"{minutes}m"
+            return format_minutes(obj.elapsed_minutes)
         return "0m"
     
     def validate(self, data):
@@ -109,6 +117,52 @@ class TimeEntrySerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class TimeEntryRowReader(RowReader):
+    """values()-based TimeEntrySerializer output for list endpoints."""
+    columns = (
+        'id', 'user_id', 'task', 'project_id', 'project__name',
+        'start_time', 'end_time', 'duration', 'date', 'is_running', 'status',
+    )
+
+    def compile(self):
+        to_datetime = self.datetime_formatter()
+        to_date = self.date_formatter()
+        to_duration = self.duration_formatter()
+        now = timezone.now
+
+        def to_dict(row):
+            (pk, user_id, task, project_id, project_name,
+             start_time, end_time, duration, date, is_running, status) = row
+            if duration:
+                duration_formatted = format_minutes(int(duration.total_seconds() / 60))
+            elif is_running:
+                # TimeEntry.elapsed_minutes
+                duration_formatted = format_minutes(int((now() - start_time).total_seconds() / 60))
+            else:
+                duration_formatted = "0m"
+            return {
+                'id': pk,
+                'user': user_id,
+                'user_id': user_id,
+                'task': task,
+                'task_description': task,
+                'project': project_id,
+                'project_id': project_id,
+                'project_name': project_name,
+                'project_details': (
+                    {'name': project_name, 'color': 'orange'} if project_id is not None else None
+                ),
+                'start_time': to_datetime(start_time),
+                'end_time': to_datetime(end_time),
+                'duration': to_duration(duration),
+                'duration_formatted': duration_formatted,
+                'date': to_date(date),
+                'is_running': is_running,
+                'status': status,
+            }
+        return to_dict
+
+
 class StartTimerSerializer(serializers.Serializer):
     """Serializer for starting a timer"""
     task = serializers.CharField(max_length=255)
@@ -145,6 +199,20 @@ class StopTimerSerializer(serializers.Serializer):
         return value
 
 
+def timer_state(task=None, project_id=None, start_time=None):
+    """Payload of `timesheet/current`: the running timer, or the idle state without `start_time`"""
+    if start_time is None:
+        return {'isRunning': False, 'task': None, 'projectId': None, 'startTime': None, 'elapsed': 0}
+    return {
+        'isRunning': True,
+        'task': task,
+        'projectId': project_id,
+        'startTime': start_time.isoformat(),
+        # TimeEntry.elapsed_minutes
+        'elapsed': int((timezone.now() - start_time).total_seconds() / 60),
+    }
+
+
 class TimerStateSerializer(serializers.Serializer):
     """Serializer for timer state response"""
     isRunning = serializers.BooleanField()
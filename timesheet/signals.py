@@ -0,0 +1,28 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from config.etags import invalidate
+from .archive import detach_project_archives
+from .models import TimeEntry
+
+
+@receiver(pre_save, sender=TimeEntry)
+def remember_previous_project(sender, instance, update_fields=None, raw=False, **kwargs):
+    # A moved entry also changes the totals of the project it left
+    instance._previous_project_id = None
+    if raw or instance.pk is None or (update_fields is not None and 'project' not in update_fields):
+        return
+    instance._previous_project_id = (
+        TimeEntry.objects.filter(pk=instance.pk).values_list('project_id', flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=TimeEntry)
+def invalidate_time_entry_etags(sender, instance, **kwargs):
+    project_ids = [instance.project_id, getattr(instance, '_previous_project_id', None)]
+    invalidate(user_ids=[instance.user_id], project_ids=project_ids)
+
+
+@receiver(pre_delete, sender='projects.Project')
+def detach_deleted_project_archives(sender, instance, **kwargs):
+    detach_project_archives(instance.pk)
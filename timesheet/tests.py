@@ -1,3 +1,109 @@
+from datetime import timedelta
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from config.testing import RowReaderContractTestCase
+from projects.models import Project, Team
+from projects.views import TaskViewSet
+from .archive import archive_time_entries
+from .models import TimeEntry, TimeEntryArchive
+from .views import TimeEntryViewSet
+
+
+class TimeEntryRowReaderContractTests(RowReaderContractTestCase):
+    """The values() list path renders exactly what TimeEntrySerializer does."""
+    viewset = TimeEntryViewSet
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        team = Team.objects.create(name='Core', team_lead=cls.admin)
+        team.members.add(cls.user)
+        project = Project.objects.create(name='Apollo', team=team)
+
+        now = timezone.now()
+        TimeEntry.objects.create(
+            user=cls.user, task='Review', project=project, start_time=now - timedelta(hours=5),
+            end_time=now - timedelta(hours=2, minutes=47, seconds=13), status='completed')
+        TimeEntry.objects.create(
+            user=cls.user, task='No project', start_time=now - timedelta(hours=9),
+            end_time=now - timedelta(hours=8, minutes=59, seconds=30), status='completed')
+        TimeEntry.objects.create(
+            user=cls.user, task='Zero', project=project, start_time=now - timedelta(days=2),
+            end_time=now - timedelta(days=2))
+        # Running timer, well away from a minute boundary
+        TimeEntry.objects.create(
+            user=cls.user, task='Running   ünïcode', project=project,
+            start_time=now - timedelta(minutes=95, seconds=30), is_running=True)
+
+    def assertSameList(self, user, url, viewset=None):
+        fast = super().assertSameList(user, url, viewset)
+        self.assertIn(b'"duration_formatted"', fast)
+        return fast
+
+    def test_time_entry_list(self):
+        self.assertSameList(self.user, '/api/v1/timesheet/')
+
+    def test_task_list(self):
+        self.assertSameList(self.admin, '/api/v1/projects/tasks/', TaskViewSet)
+
+    def test_filtered_and_ordered_list(self):
+        self.assertSameList(self.admin, '/api/v1/projects/tasks/?search=apollo&ordering=date', TaskViewSet)
+
+    def test_sparse_request_uses_serializer(self):
+        content = self.render_list(self.user, '/api/v1/timesheet/?fields=id,task')
+        self.assertNotIn(b'"duration_formatted"', content)
+
+
+class TimeEntryETagTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        self.project = Project.objects.create(name='Apollo', team=Team.objects.create(name='Core', team_lead=self.user))
+        end = timezone.now() - timedelta(hours=1)
+        TimeEntry.objects.create(
+            user=self.user, task='Review', project=self.project, start_time=end - timedelta(hours=1),
+            end_time=end, status='completed')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_project_rename_changes_time_entry_list(self):
+        etag = self.client.get('/api/v1/timesheet/')['ETag']
+        self.assertEqual(self.client.get('/api/v1/timesheet/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.name = 'Artemis'
+            self.project.save()
+
+        response = self.client.get('/api/v1/timesheet/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['project_name'], 'Artemis')
+
+
+class TimeEntryArchiveProjectDeleteTests(TestCase):
+
+    def test_deleting_projects_folds_archives_into_one_row(self):
+        user = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pw', full_name='Employee', role='employee')
+        team = Team.objects.create(name='Core', team_lead=user)
+        projects = [Project.objects.create(name=name, team=team) for name in ('Apollo', 'Gemini', 'Mercury')]
+        start = timezone.now().replace(year=2024, month=3, day=4, hour=9)
+        for hours, project in enumerate(projects, start=1):
+            TimeEntry.objects.create(
+                user=user, task=project.name, project=project, start_time=start,
+                end_time=start + timedelta(hours=hours), status='completed')
+        archive_time_entries(before=timezone.localdate())
+
+        for project in projects[:2]:
+            project.delete()
 
-# Create your tests here.
+        orphan = TimeEntryArchive.objects.get(user=user, project=None)
+        self.assertEqual(orphan.entry_count, 2)
+        self.assertEqual(orphan.total_duration, timedelta(hours=3))
+        self.assertEqual(TimeEntryArchive.objects.filter(user=user).count(), 2)
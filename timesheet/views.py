@@ -4,17 +4,22 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
+from config.etags import ConditionalGetMixin, user_scope
+from config.rows import FastListMixin
 from .models import TimeEntry
 from .serializers import (
+    with_project_details,
     TimeEntrySerializer,
+    TimeEntryRowReader,
     StartTimerSerializer,
     StopTimerSerializer,
-    TimerStateSerializer
+    TimerStateSerializer,
+    timer_state,
 )
 from .permissions import IsOwner
 
 
-class TimeEntryViewSet(viewsets.ModelViewSet):
+class TimeEntryViewSet(ConditionalGetMixin, FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for TimeEntry management.
     
@@ -22,16 +27,22 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
     """
     queryset = TimeEntry.objects.all()
     serializer_class = TimeEntrySerializer
+    row_reader_class = TimeEntryRowReader
     permission_classes = [IsAuthenticated, IsOwner]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['date', 'project', 'is_running']
     search_fields = ['task']
     ordering_fields = ['start_time', 'date']
     ordering = ['-start_time']
+    # Running timers report elapsed minutes
+    etag_time_bucket = 60
+    
+    def get_etag_scopes(self):
+        return [user_scope(self.request.user.id)]
     
     def get_queryset(self):
         """Users see only their own time entries"""
-        return TimeEntry.objects.filter(user=self.request.user)
+        return with_project_details(TimeEntry.objects.filter(user=self.request.user), self.request)
     
     def perform_create(self, serializer):
         """Set user from request"""
@@ -116,30 +127,8 @@ class TimeEntryViewSet(viewsets.ModelViewSet):
         Get current timer state.
         Returns null if no timer is running.
         """
-        try:
-            time_entry = TimeEntry.objects.get(user=request.user, is_running=True)
-            return Response({
-                'isRunning': True,
-                'task': time_entry.task,
-                'projectId': time_entry.project.id if time_entry.project else None,
-                'startTime': time_entry.start_time.isoformat(),
-                'elapsed': time_entry.elapsed_minutes
-            })
-        except TimeEntry.DoesNotExist:
-            return Response({
-                'isRunning': False,
-                'task': None,
-                'projectId': None,
-                'startTime': None,
-                'elapsed': 0
-            })
-        except TimeEntry.MultipleObjectsReturned:
-            # Handle edge case
-            time_entry = TimeEntry.objects.filter(user=request.user, is_running=True).first()
-            return Response({
-                'isRunning': True,
-                'task': time_entry.task,
-                'projectId': time_entry.project.id if time_entry.project else None,
-                'startTime': time_entry.start_time.isoformat(),
-                'elapsed': time_entry.elapsed_minutes
-            })
+        # first() also covers the edge case of several running timers
+        time_entry = TimeEntry.objects.filter(user=request.user, is_running=True).first()
+        if time_entry is None:
+            return Response(timer_state())
+        return Response(timer_state(time_entry.task, time_entry.project_id, time_entry.start_time))